@@ -0,0 +1,137 @@
+# benchmarks/crawler_benchmark.py
+# 기록된(또는 합성한) 여러 날짜의 검색 결과 페이지를 재생하여
+# 크롤링 → 파싱 → DB 저장 전체 경로의 처리량과 페이지별 지연 시간을 측정합니다. 네트워크가 필요 없습니다.
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m benchmarks.crawler_benchmark                       # fixtures로 합성 코퍼스를 만들어 측정
+#   python -m benchmarks.crawler_benchmark --corpus replay_corpus # 기록된 코퍼스 재생
+#   python -m benchmarks.crawler_benchmark --corpus replay_corpus --record  # 실제 요청으로 코퍼스를 기록한 뒤 측정
+#
+# 기록된 코퍼스로 측정할 때는 기록할 때와 같은 --keyword/--start-date/--days/--pages를 사용해야 합니다.
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from modules import database_manager, news_crawler, replay_store
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_FIXTURE = "naver_news_search_sample.html"
+ARTICLE_LINK_PREFIX = "https://n.news.naver.com/mnews/article/"
+
+
+def build_synthetic_corpus(corpus_dir: Path, keyword: str, search_dates: list[datetime], pages_per_day: int,
+                           fixtures_dir: Path = DEFAULT_FIXTURES_DIR):
+    """
+    샘플 검색 결과 HTML로 (날짜, 페이지)마다 한 장씩 코퍼스를 만듭니다.
+    DB 저장 경로가 실제와 같게 동작하도록 페이지마다 기사 링크를 다르게 바꿉니다.
+    """
+    sample_html = (fixtures_dir / SAMPLE_FIXTURE).read_text(encoding="utf-8")
+    for search_date in search_dates:
+        for page in range(pages_per_day):
+            unique_prefix = f"{ARTICLE_LINK_PREFIX}{search_date:%Y%m%d}p{page}/"
+            html = sample_html.replace(ARTICLE_LINK_PREFIX, unique_prefix)
+            replay_store.save_page(news_crawler._build_search_url(keyword, search_date, page), html, directory=str(corpus_dir))
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """정렬된 값 목록의 q 백분위수 (nearest-rank)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_crawl(keyword: str, start_date: datetime, days: int, pages_per_day: int, max_workers: int, db_file: str) -> dict:
+    """빈 DB에서 증분 크롤링 한 번을 실행하고 처리량/지연 시간을 측정합니다."""
+    database_manager.DB_FILE = db_file
+    database_manager.init_db()
+
+    page_latencies = []
+    latencies_lock = threading.Lock()
+    fetch_search_page = news_crawler._fetch_search_page
+
+    def timed_fetch_search_page(*args, **kwargs):
+        page_start = time.perf_counter()
+        try:
+            return fetch_search_page(*args, **kwargs)
+        finally:
+            with latencies_lock:
+                page_latencies.append(time.perf_counter() - page_start)
+
+    news_crawler._fetch_search_page = timed_fetch_search_page
+    try:
+        start = time.perf_counter()
+        articles = news_crawler.crawl_naver_news_incremental(keyword, start_date, days, pages_per_day, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+    finally:
+        news_crawler._fetch_search_page = fetch_search_page
+
+    page_latencies.sort()
+    return {
+        "pages": len(page_latencies),
+        "articles": len(articles),
+        "elapsed": elapsed,
+        "pages_per_sec": len(page_latencies) / elapsed,
+        "articles_per_sec": len(articles) / elapsed,
+        "p50_ms": percentile(page_latencies, 50) * 1000,
+        "p95_ms": percentile(page_latencies, 95) * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="네이버 뉴스 크롤러 재생 벤치마크 (크롤링 → 파싱 → DB 저장)")
+    parser.add_argument("--corpus", help="기록된 코퍼스 디렉터리. 생략하면 fixtures로 합성 코퍼스를 만들어 사용")
+    parser.add_argument("--record", action="store_true", help="측정 전에 실제 요청으로 --corpus에 페이지를 기록")
+    parser.add_argument("--keyword", default="자동차 보험")
+    parser.add_argument("--start-date", default="2025-01-01", help="검색 시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--pages", type=int, default=3, help="날짜별 최대 페이지 수")
+    parser.add_argument("--workers", type=int, default=news_crawler.DEFAULT_MAX_WORKERS)
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (매번 빈 DB에서 시작)")
+    args = parser.parse_args(argv)
+
+    if args.record and not args.corpus:
+        parser.error("--record에는 --corpus가 필요합니다.")
+
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+    search_dates = [start_date + timedelta(days=i) for i in range(args.days)]
+    original_db_file = database_manager.DB_FILE
+    original_mode = replay_store.get_mode()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir = Path(args.corpus) if args.corpus else Path(work_dir) / "corpus"
+        try:
+            if args.record:
+                print(f"실제 요청으로 코퍼스를 기록합니다: {corpus_dir}")
+                replay_store.configure(mode="record", directory=str(corpus_dir))
+                run_crawl(args.keyword, start_date, args.days, args.pages, args.workers, str(Path(work_dir) / "record.db"))
+            elif not args.corpus:
+                build_synthetic_corpus(corpus_dir, args.keyword, search_dates, args.pages)
+
+            replay_store.configure(mode="replay", directory=str(corpus_dir))
+            print(f"코퍼스: {corpus_dir} / 키워드 '{args.keyword}', {args.days}일 x 최대 {args.pages}페이지, 워커 {args.workers}개")
+            results = []
+            for run_index in range(args.repeat):
+                result = run_crawl(args.keyword, start_date, args.days, args.pages, args.workers,
+                                   str(Path(work_dir) / f"run_{run_index}.db"))
+                results.append(result)
+                print(f"- 실행 {run_index + 1}: {result['pages']}페이지, {result['articles']}건, {result['elapsed']:.2f}s | "
+                      f"{result['pages_per_sec']:.1f} pages/s, {result['articles_per_sec']:.1f} articles/s | "
+                      f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+        finally:
+            database_manager.DB_FILE = original_db_file
+            replay_store.configure(mode=original_mode)
+
+    best = max(results, key=lambda r: r["pages_per_sec"])
+    print(f"최고 기록: {best['pages_per_sec']:.1f} pages/s, {best['articles_per_sec']:.1f} articles/s, "
+          f"p50 {best['p50_ms']:.2f} ms, p95 {best['p95_ms']:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# benchmarks/parser_benchmark.py
+# 저장된 네이버 뉴스 검색 결과 HTML로 파서별 속도를 측정하고,
+# 빠른 파싱 경로(lxml)가 기존 경로(html.parser)와 같은 결과를 내는지 확인합니다.
+#
+# 사용법 (프로젝트 루트에서):
+#   python -m benchmarks.parser_benchmark [HTML 디렉터리 또는 replay_store 코퍼스] [--repeat N]
+
+import argparse
+import gzip
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from modules import news_crawler
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "fixtures"
+PARSER_MODES = ["html.parser", "lxml"]
+
+
+def load_fixtures(fixtures_dir: Path) -> dict[str, str]:
+    """디렉터리의 *.html 파일과 기록된 코퍼스(*.html.gz)를 {파일명: HTML} 형태로 읽어옵니다."""
+    fixtures = {path.name: path.read_text(encoding="utf-8") for path in sorted(fixtures_dir.glob("*.html"))}
+    for path in sorted(fixtures_dir.glob("*.html.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            f.readline() # 원본 URL
+            fixtures[path.name] = f.read()
+    return fixtures
+
+
+def check_parser_outputs(fixtures: dict[str, str], search_date: datetime) -> list[str]:
+    """모든 파서의 결과를 기존 경로(html.parser)와 비교하여 불일치 목록을 반환합니다."""
+    mismatches = []
+    for name, html in fixtures.items():
+        expected = news_crawler._parse_search_results(html, search_date, parser_mode="html.parser")
+        for mode in PARSER_MODES[1:]:
+            actual = news_crawler._parse_search_results(html, search_date, parser_mode=mode)
+            if actual != expected:
+                mismatches.append(f"{name}: {mode} 결과({len(actual)}건)가 html.parser 결과({len(expected)}건)와 다릅니다.")
+    return mismatches
+
+
+def benchmark_parser(mode: str, fixtures: dict[str, str], search_date: datetime, repeat: int) -> dict:
+    """파서 하나로 모든 HTML을 repeat번 파싱하여 페이지당 평균 시간과 처리량을 측정합니다."""
+    pages = list(fixtures.values())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            news_crawler._parse_search_results(html, search_date, parser_mode=mode)
+    elapsed = time.perf_counter() - start
+    parsed_pages = repeat * len(pages)
+    return {
+        "mode": mode,
+        "pages": parsed_pages,
+        "ms_per_page": elapsed / parsed_pages * 1000,
+        "pages_per_sec": parsed_pages / elapsed if elapsed else float("inf"),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="네이버 뉴스 검색 결과 파서 벤치마크")
+    parser.add_argument("fixtures_dir", nargs="?", default=str(DEFAULT_FIXTURES_DIR), help="검색 결과 HTML(*.html)이 있는 디렉터리")
+    parser.add_argument("--repeat", type=int, default=20, help="HTML 전체를 반복 파싱할 횟수")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(Path(args.fixtures_dir))
+    if not fixtures:
+        print(f"오류: {args.fixtures_dir}에 HTML 파일이 없습니다.")
+        return 1
+
+    modes = PARSER_MODES if news_crawler.LXML_AVAILABLE else PARSER_MODES[:1]
+    if not news_crawler.LXML_AVAILABLE:
+        print("경고: lxml이 설치되어 있지 않아 html.parser만 측정합니다.")
+
+    search_date = datetime(2025, 1, 1)
+    mismatches = check_parser_outputs(fixtures, search_date) if news_crawler.LXML_AVAILABLE else []
+    for mismatch in mismatches:
+        print(f"불일치: {mismatch}")
+
+    print(f"HTML {len(fixtures)}개, 반복 {args.repeat}회")
+    results = [benchmark_parser(mode, fixtures, search_date, args.repeat) for mode in modes]
+    baseline_ms = results[0]["ms_per_page"]
+    for result in results:
+        print(f"- {result['mode']:<12} {result['ms_per_page']:8.2f} ms/page  {result['pages_per_sec']:8.1f} pages/s  "
+              f"(x{baseline_ms / result['ms_per_page']:.1f})")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
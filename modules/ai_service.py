@@ -1,24 +1,95 @@
 # modules/ai_service.py
 
+import os
 import requests
 import json
 import re
 import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st # Streamlit의 st.error, st.warning 등을 사용하기 위해 임시로 import.
                         # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
 from modules import database_manager # database_manager 모듈 임포트
-from datetime import datetime # datetime 모듈 임포트 (중간 요약 배치 ID 생성에 사용)
-
-def call_potens_api_raw(prompt_message: str, api_key: str, response_schema=None) -> dict:
+from modules import http_client # 연결 풀을 공유하는 HTTP 전송 계층
+from modules import rate_limiter # Potens 요청 속도(분당 요청 수) 제한
+from datetime import datetime, timedelta # datetime 모듈 임포트 (중간 요약 보관 기간, 응답 캐시 만료 계산에 사용)
+
+POTENS_API_HOST = "ai.potens.ai"
+POTENS_API_ENDPOINT = f"https://{POTENS_API_HOST}/api/chat"
+# Potens API 분당 요청 예산. 이 프로세스의 모든 Potens 호출(요약, 키워드 선별 등)이 하나의 토큰 버킷을 함께 사용
+POTENS_REQUESTS_PER_MINUTE = float(os.getenv("POTENS_REQUESTS_PER_MINUTE", "60"))
+# 기사 요약을 동시에 진행할 최대 요청 수 (http_client의 ai.potens.ai 연결 수 상한과 맞춤)
+DEFAULT_SUMMARY_MAX_IN_FLIGHT = int(os.getenv("POTENS_MAX_IN_FLIGHT", "8"))
+# 버킷 크기만큼은 한꺼번에 보낼 수 있고, 이후에는 분당 예산에 맞춰 일정한 간격으로 보냄 (응답과 관계없이 속도 고정)
+POTENS_RATE_LIMIT = {
+    "rate": POTENS_REQUESTS_PER_MINUTE / 60,
+    "capacity": max(1, min(DEFAULT_SUMMARY_MAX_IN_FLIGHT, int(POTENS_REQUESTS_PER_MINUTE))),
+    "min_rate": POTENS_REQUESTS_PER_MINUTE / 60,
+    "max_rate": POTENS_REQUESTS_PER_MINUTE / 60,
+}
+
+# AI 응답 캐시: 같은 요청(엔드포인트, 프롬프트, 응답 스키마 등 요청 내용 전체)의 성공 응답을 DB(llm_response_cache)에 저장하여 재사용
+# 같은 날 같은 기사로 보고서를 다시 만들면 이미 요약한 기사는 API를 호출하지 않음
+POTENS_RESPONSE_CACHE_ENABLED = os.getenv("POTENS_RESPONSE_CACHE", "1") != "0" # 0이면 캐시를 사용하지 않음
+POTENS_RESPONSE_CACHE_TTL = timedelta(hours=float(os.getenv("POTENS_RESPONSE_CACHE_TTL_HOURS", "168"))) # 저장 후 이 시간이 지나면 만료
+POTENS_RESPONSE_CACHE_MAX_BYTES = int(float(os.getenv("POTENS_RESPONSE_CACHE_MAX_MB", "100")) * 1024 * 1024) # 압축 크기 합계 상한 (넘으면 LRU로 삭제)
+POTENS_RESPONSE_CACHE_VERSION = 1 # 응답 처리 방식을 바꾸면 올려서 기존 캐시를 무효화
+# 저장할 때마다 캐시 전체를 정리하지 않고, 크기 합계가 상한을 넘거나 이 횟수만큼 저장했을 때만 정리 (만료 응답 및 다른 프로세스의 저장분 반영)
+POTENS_RESPONSE_CACHE_EVICT_EVERY = int(os.getenv("POTENS_RESPONSE_CACHE_EVICT_EVERY", "200"))
+POTENS_RESPONSE_CACHE_EVICT_TO_RATIO = 0.9 # 상한을 넘으면 상한의 이 비율까지 줄여, 정리 직후 저장마다 다시 정리하지 않도록 함
+_response_cache_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bypassed": 0}
+_response_cache_stats_lock = threading.Lock()
+# 캐시 크기 합계 추정치 (None이면 다음 저장 때 DB에서 다시 읽음)와 마지막 정리 이후 저장 횟수
+_response_cache_usage = {"bytes": None, "stores_since_eviction": 0}
+_response_cache_usage_lock = threading.Lock()
+
+def _count_response_cache_event(event: str, count: int = 1):
+    with _response_cache_stats_lock:
+        _response_cache_stats[event] += count
+
+def get_response_cache_stats() -> dict:
     """
-    주어진 프롬프트 메시지로 Potens.dev API를 호출하고 원본 응답을 반환합니다.
-    response_schema: JSON 응답을 위한 스키마 (선택 사항)
+    이 프로세스의 AI 응답 캐시 통계를 반환합니다.
+    반환 값: {"hits", "misses", "stores", "evictions", "bypassed", "hit_rate", "entries", "bytes"} (entries/bytes는 DB에 저장된 현황)
     """
-    if not api_key:
-        return {"error": "Potens.dev API 키가 누락되었습니다."}
-
-    potens_api_endpoint = "https://ai.potens.ai/api/chat"
-    
+    with _response_cache_stats_lock:
+        stats = dict(_response_cache_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats.update(database_manager.get_llm_response_cache_usage())
+    return stats
+
+def clear_response_cache():
+    """저장된 AI 응답 캐시를 모두 지웁니다."""
+    database_manager.clear_llm_response_cache()
+    with _response_cache_usage_lock:
+        _response_cache_usage["bytes"] = None
+
+def _record_response_cache_store(size_bytes: int):
+    """
+    저장한 응답 크기를 캐시 크기 합계 추정치에 더하고, 상한을 넘었거나 POTENS_RESPONSE_CACHE_EVICT_EVERY번 저장했으면 캐시를 정리합니다.
+    (정리는 한 스레드만 실행하며, 정리한 뒤에는 다음 저장 때 DB에서 크기 합계를 다시 읽음)
+    """
+    with _response_cache_usage_lock:
+        if _response_cache_usage["bytes"] is None:
+            _response_cache_usage["bytes"] = database_manager.get_llm_response_cache_usage()["bytes"]
+        else:
+            _response_cache_usage["bytes"] += size_bytes
+        _response_cache_usage["stores_since_eviction"] += 1
+        should_evict = _response_cache_usage["bytes"] > POTENS_RESPONSE_CACHE_MAX_BYTES or \
+            _response_cache_usage["stores_since_eviction"] >= POTENS_RESPONSE_CACHE_EVICT_EVERY
+        if should_evict:
+            _response_cache_usage["bytes"] = None
+            _response_cache_usage["stores_since_eviction"] = 0
+    if should_evict:
+        evicted_count = database_manager.evict_llm_response_cache(
+            int(POTENS_RESPONSE_CACHE_MAX_BYTES * POTENS_RESPONSE_CACHE_EVICT_TO_RATIO), (datetime.now() - POTENS_RESPONSE_CACHE_TTL).strftime('%Y-%m-%d %H:%M:%S')
+        )
+        if evicted_count:
+            _count_response_cache_event("evictions", evicted_count)
+
+def _build_potens_payload(prompt_message: str, response_schema=None) -> dict:
     payload = {
         "prompt": prompt_message
     }
@@ -27,7 +98,52 @@ def call_potens_api_raw(prompt_message: str, api_key: str, response_schema=None)
             "responseMimeType": "application/json",
             "responseSchema": response_schema
         }
+    return payload
+
+def _response_cache_key(payload: dict) -> str:
+    """요청 내용(캐시 버전, 엔드포인트, 페이로드 전체)의 SHA-256 해시."""
+    request_identity = json.dumps({"version": POTENS_RESPONSE_CACHE_VERSION, "endpoint": POTENS_API_ENDPOINT, "payload": payload},
+                                  ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(request_identity.encode("utf-8")).hexdigest()
+
+def call_potens_api_raw(prompt_message: str, api_key: str, response_schema=None, use_cache: bool = True) -> dict:
+    """
+    주어진 프롬프트 메시지로 Potens.dev API를 호출하고 원본 응답을 반환합니다.
+    같은 요청의 성공 응답이 캐시에 있으면 API를 호출하지 않고 캐시된 응답을 반환합니다. (반환 값에 "cached": True)
+    response_schema: JSON 응답을 위한 스키마 (선택 사항)
+    use_cache: False이면 캐시를 읽지도 저장하지도 않고 항상 API를 호출합니다. (POTENS_RESPONSE_CACHE=0이면 항상 False)
+    """
+    if not api_key:
+        return {"error": "Potens.dev API 키가 누락되었습니다."}
 
+    payload = _build_potens_payload(prompt_message, response_schema)
+    if not (use_cache and POTENS_RESPONSE_CACHE_ENABLED):
+        _count_response_cache_event("bypassed")
+        return _request_potens_api(payload, api_key, response_schema)
+
+    cache_key = _response_cache_key(payload)
+    try:
+        cached_response = database_manager.get_llm_cached_response(
+            cache_key, (datetime.now() - POTENS_RESPONSE_CACHE_TTL).strftime('%Y-%m-%d %H:%M:%S')
+        )
+    except Exception as e:
+        print(f"경고: AI 응답 캐시 조회 실패 - {e}")
+        cached_response = None
+    if cached_response is not None:
+        _count_response_cache_event("hits")
+        return {**json.loads(cached_response), "cached": True}
+    _count_response_cache_event("misses")
+
+    response_dict = _request_potens_api(payload, api_key, response_schema)
+    if "error" not in response_dict:
+        stored_bytes = database_manager.save_llm_cached_response(cache_key, json.dumps(response_dict, ensure_ascii=False))
+        if stored_bytes:
+            _count_response_cache_event("stores")
+            _record_response_cache_store(stored_bytes)
+    return response_dict
+
+def _request_potens_api(payload: dict, api_key: str, response_schema=None) -> dict:
+    """Potens.dev API에 요청을 보내고 응답을 반환합니다. (캐시 없이 항상 호출)"""
     # --- 변경된 부분: 페이로드를 명시적으로 UTF-8로 인코딩 ---
     # Python 딕셔너리를 JSON 문자열로 변환하고, non-ASCII 문자를 이스케이프하지 않도록 설정
     json_payload_str = json.dumps(payload, ensure_ascii=False)
@@ -39,9 +155,13 @@ def call_potens_api_raw(prompt_message: str, api_key: str, response_schema=None)
         "Content-Type": "application/json; charset=utf-8" # Content-Type 헤더에 charset 명시
     }
 
+    # 분당 요청 예산을 넘지 않도록 차례를 기다림
+    rate_limiter.get_bucket(POTENS_API_HOST, default_rate_limit=POTENS_RATE_LIMIT).acquire()
+
     try:
         # 'json' 파라미터 대신 'data' 파라미터를 사용하여 미리 인코딩된 바이트 전송
-        response = requests.post(potens_api_endpoint, headers=headers, data=encoded_payload, timeout=300)
+        # 공유 Session을 통해 keep-alive 연결을 재사용
+        response = http_client.post(POTENS_API_ENDPOINT, headers=headers, data=encoded_payload, timeout=300)
         response.raise_for_status()
         response_json = response.json()
 
@@ -72,13 +192,13 @@ def call_potens_api_raw(prompt_message: str, api_key: str, response_schema=None)
     except Exception as e:
         return {"error": f"알 수 없는 오류 발생: {e}"}
 
-def retry_ai_call(prompt: str, api_key: str, response_schema=None, max_retries: int = 2, delay_seconds: int = 15) -> dict:
+def retry_ai_call(prompt: str, api_key: str, response_schema=None, max_retries: int = 2, delay_seconds: int = 15, use_cache: bool = True) -> dict:
     """
     Potens.dev API 호출에 대한 재시도 로직을 포함한 래퍼 함수.
-    call_potens_api_raw를 호출하고 실패 시 재시도합니다.
+    call_potens_api_raw를 호출하고 실패 시 재시도합니다. (use_cache=False이면 응답 캐시를 사용하지 않음)
     """
     for attempt in range(max_retries):
-        response_dict = call_potens_api_raw(prompt, api_key=api_key, response_schema=response_schema)
+        response_dict = call_potens_api_raw(prompt, api_key=api_key, response_schema=response_schema, use_cache=use_cache)
 
         if "error" not in response_dict:
             return response_dict
@@ -91,21 +211,35 @@ def retry_ai_call(prompt: str, api_key: str, response_schema=None, max_retries:
     return {"error": "AI 응답을 가져오는 데 최종 실패했습니다. 나중에 다시 시도해주세요."}
 
 
-def get_article_summary(title: str, link: str, date_str: str, summary_snippet: str, api_key: str, max_attempts: int = 2, delay_seconds: int = 15) -> str:
+# 기사 요약 프롬프트에 넣을 본문의 최대 길이 (문자 수)
+MAX_ARTICLE_BODY_LENGTH_FOR_SUMMARY = 4000
+
+def get_article_summary(title: str, link: str, date_str: str, summary_snippet: str, api_key: str, max_attempts: int = 2, delay_seconds: int = 15,
+                        article_body: str = None) -> str:
     """
     Potens.dev AI를 호출하여 제공된 제목, 링크, 날짜, 미리보기 요약을 바탕으로
     뉴스 기사 내용을 요약합니다. (단일 호출)
-    링크 접근이 불가능할 경우에도 제공된 정보만으로 요약을 시도합니다.
+    article_body(article_fetcher로 수집한 본문)가 주어지면 본문을 바탕으로 요약하며,
+    없으면 링크 접근이 불가능할 경우에도 제공된 정보만으로 요약을 시도합니다.
     """
-    initial_prompt = (
-        f"다음은 뉴스 기사에 대한 정보입니다. 이 정보를 바탕으로 뉴스 기사 내용을 요약해 주세요.\n"
-        f"**제공된 링크에 접근할 수 없거나 기사를 찾을 수 없는 경우, 아래 제공된 제목, 날짜, 미리보기 요약만을 사용하여 기사 내용을 파악하고 요약해 주세요.**\n"
-        f"광고나 불필요한 정보 없이 핵심 내용만 간결하게 제공해 주세요.\n\n"
-        f"제목: {title}\n"
-        f"링크: {link}\n"
-        f"날짜: {date_str}\n"
-        f"미리보기 요약: {summary_snippet}"
-    )
+    if article_body:
+        initial_prompt = (
+            f"다음은 뉴스 기사의 제목, 날짜와 본문입니다. 본문을 바탕으로 뉴스 기사 내용을 요약해 주세요.\n"
+            f"광고나 불필요한 정보 없이 핵심 내용만 간결하게 제공해 주세요.\n\n"
+            f"제목: {title}\n"
+            f"날짜: {date_str}\n"
+            f"본문:\n{article_body[:MAX_ARTICLE_BODY_LENGTH_FOR_SUMMARY]}"
+        )
+    else:
+        initial_prompt = (
+            f"다음은 뉴스 기사에 대한 정보입니다. 이 정보를 바탕으로 뉴스 기사 내용을 요약해 주세요.\n"
+            f"**제공된 링크에 접근할 수 없거나 기사를 찾을 수 없는 경우, 아래 제공된 제목, 날짜, 미리보기 요약만을 사용하여 기사 내용을 파악하고 요약해 주세요.**\n"
+            f"광고나 불필요한 정보 없이 핵심 내용만 간결하게 제공해 주세요.\n\n"
+            f"제목: {title}\n"
+            f"링크: {link}\n"
+            f"날짜: {date_str}\n"
+            f"미리보기 요약: {summary_snippet}"
+        )
 
     response_dict = retry_ai_call(initial_prompt, api_key=api_key, max_retries=max_attempts, delay_seconds=delay_seconds)
     if "text" in response_dict:
@@ -114,6 +248,50 @@ def get_article_summary(title: str, link: str, date_str: str, summary_snippet: s
         return response_dict.get("error", "알 수 없는 오류")
 
 
+def summarize_articles(articles: list[dict], api_key: str, article_bodies: dict = None, max_in_flight: int = DEFAULT_SUMMARY_MAX_IN_FLIGHT,
+                       progress_callback=None, max_attempts: int = 2, delay_seconds: int = 15) -> list[str]:
+    """
+    여러 기사를 동시에 요약합니다. (기사마다 get_article_summary 호출)
+    동시에 진행 중인 요청은 max_in_flight개 이하이며, 전체 요청 속도는 POTENS_REQUESTS_PER_MINUTE를 넘지 않습니다.
+    전체 소요 시간은 기사 수만큼의 왕복 시간이 아니라, 대략 가장 느린 몇 개의 호출 시간이 됩니다.
+
+    Args:
+        articles (list[dict]): '제목', '링크', '날짜'(datetime 또는 문자열), '내용'(미리보기)을 가진 기사 목록.
+        article_bodies (dict, optional): {링크: 본문}. 본문이 있는 기사는 본문을 바탕으로 요약합니다.
+        max_in_flight (int): 동시에 진행할 최대 요약 요청 수.
+        progress_callback (callable, optional): 요약 하나가 끝날 때마다 (완료 수, 전체 수, 기사, 요약)으로 호출됩니다. 호출 스레드에서 실행됩니다.
+    Returns:
+        list[str]: 기사 순서대로의 요약 (실패한 기사는 get_article_summary와 같이 오류 메시지)
+    """
+    article_bodies = article_bodies or {}
+    summaries = [None] * len(articles)
+    if not articles:
+        return summaries
+
+    def summarize(article: dict) -> str:
+        article_date = article["날짜"]
+        date_str = article_date.strftime('%Y-%m-%d') if isinstance(article_date, datetime) else str(article_date)
+        return get_article_summary(
+            article["제목"], article["링크"], date_str, article["내용"], api_key,
+            max_attempts=max_attempts, delay_seconds=delay_seconds, article_body=article_bodies.get(article["링크"])
+        )
+
+    completed_count = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+        future_to_index = {executor.submit(summarize, article): index for index, article in enumerate(articles)}
+        for future in as_completed(future_to_index):
+            index = future_to_index[future]
+            try:
+                summaries[index] = future.result()
+            except Exception as e:
+                summaries[index] = f"알 수 없는 오류 발생: {e}"
+
+            completed_count += 1
+            if progress_callback:
+                progress_callback(completed_count, len(articles), articles[index], summaries[index])
+    return summaries
+
+
 def get_relevant_keywords(trending_keywords_data: list[dict], perspective: str, api_key: str, max_attempts: int = 2, delay_seconds: int = 15) -> list[str]:
     """
     Potens.dev AI를 호출하여 트렌드 키워드 중 특정 관점에서 유의미한 키워드를 선별합니다.
@@ -139,64 +317,208 @@ def get_relevant_keywords(trending_keywords_data: list[dict], perspective: str,
     else:
         return [] # 오류 발생 시 빈 리스트 반환
 
-def _summarize_text_batch(texts: list[str], api_key: str, batch_size: int = 3, level: int = 1, current_batch_prefix: str = "") -> list[str]:
+# 계층적 요약(map-reduce) 설정
+# 한 번의 AI 호출(프롬프트 전체)에 넣을 최대 토큰 수. 묶음은 글자 수가 아니라 토큰 수로 채움 (한국어는 글자 수와 토큰 수가 크게 다름)
+SUMMARY_BATCH_TOKEN_BUDGET = int(os.getenv("SUMMARY_BATCH_TOKEN_BUDGET", "6000"))
+SUMMARY_TREE_FAN_IN = int(os.getenv("SUMMARY_TREE_FAN_IN", "0")) # 한 묶음의 최대 텍스트 수 (0이면 토큰 예산만 적용)
+SUMMARY_BATCH_PACKING_MODES = ("greedy", "first_fit")
+# greedy: 순서대로 채우다 넘치면 새 묶음 (원래 순서 유지), first_fit: 긴 텍스트부터 들어갈 수 있는 첫 묶음에 넣음 (묶음 수 최소화)
+DEFAULT_SUMMARY_BATCH_PACKING = os.getenv("SUMMARY_BATCH_PACKING", "greedy")
+SUMMARY_TOKENIZER_ENCODING = "cl100k_base" # document_processor.tiktoken_len과 같은 인코딩
+BATCH_SUMMARY_PROMPT_PREFIX = "다음 텍스트들을 종합하여 간결하게 요약해 주세요. 주요 내용만 포함해 주세요.\n\n텍스트:\n"
+BATCH_SUMMARY_SEPARATOR = "\n\n---\n\n"
+SUMMARY_TREE_MAX_LEVELS = int(os.getenv("SUMMARY_TREE_MAX_LEVELS", "8")) # 요약 트리의 최대 계층 수 (API 호출 수 상한)
+# 완료된 중간 요약을 보관하는 기간 (이 기간 안에 같은 요약을 다시 실행하면 완료된 묶음은 다시 요약하지 않음)
+INTERMEDIATE_SUMMARY_RETENTION = timedelta(days=float(os.getenv("INTERMEDIATE_SUMMARY_RETENTION_DAYS", "7")))
+
+_summary_tokenizer = None
+_summary_tokenizer_loaded = False
+_summary_tokenizer_lock = threading.Lock()
+
+def _get_summary_tokenizer():
+    """tiktoken 인코딩을 한 번만 불러와 재사용합니다. 불러오지 못하면(미설치, 오프라인 등) None."""
+    global _summary_tokenizer, _summary_tokenizer_loaded
+    with _summary_tokenizer_lock:
+        if not _summary_tokenizer_loaded:
+            try:
+                import tiktoken
+                _summary_tokenizer = tiktoken.get_encoding(SUMMARY_TOKENIZER_ENCODING)
+            except Exception as e:
+                print(f"경고: tiktoken 인코딩을 불러오지 못해 글자 수로 토큰 수를 추정합니다. ({e})")
+            _summary_tokenizer_loaded = True
+        return _summary_tokenizer
+
+def count_summary_tokens(text: str) -> int:
+    """텍스트의 토큰 수. tiktoken을 사용할 수 없으면 글자 수(한국어에서는 토큰 수보다 크거나 비슷함)로 추정합니다."""
+    tokenizer = _get_summary_tokenizer()
+    return len(tokenizer.encode(text)) if tokenizer else len(text)
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
     """
-    텍스트 리스트를 배치 단위로 나누어 요약하고, 그 요약문들을 반환합니다.
-    필요시 재귀적으로 요약을 수행하여 최종적으로 하나의 요약문 리스트를 만듭니다.
+    텍스트를 앞에서부터 max_tokens 토큰 이하로 자릅니다. (count_summary_tokens 기준)
+    토큰 앞부분을 디코딩하면 글자 중간에서 잘린 바이트가 U+FFFD가 되거나 다시 인코딩할 때 토큰이 다르게 합쳐져
+    max_tokens를 넘을 수 있으므로, 다시 세어 넘치는 만큼 더 잘라냅니다.
     """
-    if not texts:
-        return []
-
-    # 텍스트를 합쳐서 AI에 전달할 최대 길이 (이 함수 내에서만 적용되는 임시 제약)
-    # 너무 길면 AI가 처리하지 못하므로 적절히 조절
-    MAX_INPUT_LENGTH_FOR_BATCH_SUMMARIZATION = 1000 # 한 번의 AI 호출에 들어갈 텍스트의 최대 길이
-
-    summarized_batches = []
-    batch_counter = 0
-
-    # 텍스트를 배치 크기 또는 최대 입력 길이에 맞춰 그룹화
-    current_batch_texts = []
-    current_batch_length = 0
-
-    for i, text in enumerate(texts):
-        # 현재 텍스트를 추가했을 때 배치 길이가 너무 길어지면 새 배치 시작
-        if current_batch_length + len(text) > MAX_INPUT_LENGTH_FOR_BATCH_SUMMARIZATION or len(current_batch_texts) >= batch_size:
-            if current_batch_texts:
-                batch_counter += 1
-                batch_id = f"{current_batch_prefix}level{level}_batch{batch_counter}"
-                combined_batch_text = "\n\n---\n\n".join(current_batch_texts)
-
-                prompt = f"다음 텍스트들을 종합하여 간결하게 요약해 주세요. 주요 내용만 포함해 주세요.\n\n텍스트:\n{combined_batch_text}"
-                response_dict = retry_ai_call(prompt, api_key=api_key, max_retries=2, delay_seconds=10)
-                batch_summary = clean_ai_response_text(response_dict.get("text", f"배치 요약 실패 (레벨 {level}, 배치 {batch_counter})"))
-                summarized_batches.append(batch_summary)
-                database_manager.save_intermediate_summary(batch_summary, batch_id, level) # 중간 요약 저장
-
-                current_batch_texts = []
-                current_batch_length = 0
-                time.sleep(1) # AI 호출 간 딜레이
-
-        current_batch_texts.append(text)
-        current_batch_length += len(text)
-
-    # 마지막 남은 배치 처리
-    if current_batch_texts:
-        batch_counter += 1
-        batch_id = f"{current_batch_prefix}level{level}_batch{batch_counter}"
-        combined_batch_text = "\n\n---\n\n".join(current_batch_texts)
-        prompt = f"다음 텍스트들을 종합하여 간결하게 요약해 주세요. 주요 내용만 포함해 주세요.\n\n텍스트:\n{combined_batch_text}"
-        response_dict = retry_ai_call(prompt, api_key=api_key, max_retries=2, delay_seconds=10)
-        batch_summary = clean_ai_response_text(response_dict.get("text", f"배치 요약 실패 (레벨 {level}, 배치 {batch_counter})"))
-        summarized_batches.append(batch_summary)
-        database_manager.save_intermediate_summary(batch_summary, batch_id, level) # 중간 요약 저장
-
-    # 요약된 배치가 여전히 많으면 다음 계층으로 재귀 호출
-    # 최종 요약은 하나의 텍스트로 나와야 하므로, 1개 초과 시 재귀
-    if len(summarized_batches) > 1:
-        st.info(f"⏳ {level}차 요약 완료. {len(summarized_batches)}개의 요약문이 생성되었습니다. 다음 계층 요약 시작...")
-        return _summarize_text_batch(summarized_batches, api_key, batch_size, level + 1, current_batch_prefix)
+    tokenizer = _get_summary_tokenizer()
+    if tokenizer is None:
+        return text[:max_tokens]
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    limit = max_tokens
+    while limit > 0:
+        truncated_text = tokenizer.decode(tokens[:limit]).rstrip("\ufffd")
+        excess_tokens = count_summary_tokens(truncated_text) - max_tokens
+        if excess_tokens <= 0:
+            return truncated_text
+        limit -= excess_tokens
+    return ""
+
+def _group_texts_into_batches(texts: list[str], token_budget: int = SUMMARY_BATCH_TOKEN_BUDGET,
+                              fan_in: int = SUMMARY_TREE_FAN_IN, packing: str = DEFAULT_SUMMARY_BATCH_PACKING) -> list[list[str]]:
+    """
+    텍스트를 프롬프트 토큰 수가 token_budget 이하가 되도록 묶습니다. (fan_in이 0보다 크면 묶음당 텍스트 수도 제한)
+    텍스트 하나의 토큰 수는 예산의 절반 이하로 잘라, 텍스트가 2개 이상이면 묶음마다 최소 2개가 들어가고
+    계층마다 요약문 수가 반드시 줄어들도록 합니다.
+    token_budget이 프롬프트 앞부분과 텍스트 2개를 담을 수 없을 만큼 작으면 ValueError를 발생시킵니다.
+    """
+    if packing not in SUMMARY_BATCH_PACKING_MODES:
+        raise ValueError(f"지원하지 않는 묶음 방식입니다: {packing} (사용 가능: {', '.join(SUMMARY_BATCH_PACKING_MODES)})")
+    separator_tokens = count_summary_tokens(BATCH_SUMMARY_SEPARATOR)
+    prefix_tokens = count_summary_tokens(BATCH_SUMMARY_PROMPT_PREFIX)
+    # 프롬프트 앞부분과, 구분자를 포함해 1토큰 이상인 텍스트 2개가 들어가야 묶음마다 최소 2개를 넣을 수 있음
+    min_token_budget = prefix_tokens + 2 * (separator_tokens + 1)
+    if token_budget < min_token_budget:
+        raise ValueError(f"요약 묶음 토큰 예산이 너무 작습니다: {token_budget} (최소 {min_token_budget}, SUMMARY_BATCH_TOKEN_BUDGET 확인)")
+    max_texts = fan_in if fan_in > 0 else len(texts)
+    max_texts = max(max_texts, 2)
+    available_tokens = token_budget - prefix_tokens
+    max_text_tokens = available_tokens // 2 - separator_tokens # 1 이상 (위의 최소 예산 조건)
+
+    items = [] # (텍스트, 구분자를 포함한 토큰 수)
+    for text in texts:
+        text_tokens = count_summary_tokens(text)
+        if text_tokens > max_text_tokens:
+            text = _truncate_to_tokens(text, max_text_tokens)
+            text_tokens = count_summary_tokens(text)
+        items.append((text, text_tokens + separator_tokens))
+
+    if packing == "first_fit":
+        items.sort(key=lambda item: item[1], reverse=True) # 긴 텍스트부터 배치 (first-fit decreasing)
+        batches, batch_tokens = [], []
+        for text, tokens in items:
+            for index, batch in enumerate(batches):
+                if len(batch) < max_texts and batch_tokens[index] + tokens <= available_tokens:
+                    batch.append(text)
+                    batch_tokens[index] += tokens
+                    break
+            else:
+                batches.append([text])
+                batch_tokens.append(tokens)
     else:
-        return summarized_batches # 최종 요약문 리스트 (1개)
+        batches = []
+        current_batch_texts = []
+        current_batch_tokens = 0
+        for text, tokens in items:
+            # 현재 텍스트를 추가했을 때 토큰 예산이나 텍스트 수를 넘으면 새 배치 시작
+            if current_batch_texts and (len(current_batch_texts) >= max_texts or current_batch_tokens + tokens > available_tokens):
+                batches.append(current_batch_texts)
+                current_batch_texts = []
+                current_batch_tokens = 0
+            current_batch_texts.append(text)
+            current_batch_tokens += tokens
+        if current_batch_texts:
+            batches.append(current_batch_texts)
+    if len(texts) > 1 and len(batches) >= len(texts):
+        raise RuntimeError(f"요약 묶음 수({len(batches)})가 입력 수({len(texts)})보다 줄지 않았습니다. (토큰 예산 {token_budget})")
+    return batches
+
+def get_summary_job_id(texts: list[str]) -> str:
+    """요약할 텍스트 목록으로 정해지는 요약 작업 ID. 같은 텍스트를 다시 요약하면 같은 ID가 됩니다."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\x00") # 텍스트 경계 구분
+    return digest.hexdigest()[:16]
+
+def _summarize_batch(prompt: str, api_key: str) -> str | None:
+    """묶음 하나를 요약합니다. 실패하면 None."""
+    response_dict = retry_ai_call(prompt, api_key=api_key, max_retries=2, delay_seconds=10)
+    if "text" not in response_dict:
+        return None
+    return clean_ai_response_text(response_dict["text"])
+
+def summarize_texts_hierarchically(texts: list[str], api_key: str, token_budget: int = SUMMARY_BATCH_TOKEN_BUDGET,
+                                   fan_in: int = SUMMARY_TREE_FAN_IN, packing: str = DEFAULT_SUMMARY_BATCH_PACKING,
+                                   max_in_flight: int = DEFAULT_SUMMARY_MAX_IN_FLIGHT, job_id: str = None,
+                                   max_levels: int = SUMMARY_TREE_MAX_LEVELS, progress_callback=None) -> str | None:
+    """
+    텍스트들을 계층적으로(map-reduce) 요약하여 하나의 요약문을 반환합니다.
+    텍스트가 없거나, 한 계층에서 요약에 실패한 묶음이 있거나, max_levels 계층 안에 끝나지 않으면 None을 반환합니다.
+    계층마다 텍스트를 토큰 예산에 맞춰 묶어 요약하고, 요약문이 하나가 될 때까지 다음 계층에서 다시 묶어 요약합니다.
+    한 계층의 묶음들은 서로 독립이므로 동시에(최대 max_in_flight개) 요약하며,
+    끝난 묶음의 요약은 입력(프롬프트) 해시와 함께 바로 intermediate_summaries에 저장합니다. (batch_id: {job_id}_level{계층}_batch{묶음 번호})
+    입력 해시가 같은 요약이 이미 저장되어 있으면 API를 호출하지 않고 재사용하므로,
+    중간에 실패하거나 중단된 요약을 다시 실행하면 트리에서 빠진 묶음만 새로 요약합니다. (실패한 묶음은 저장하지 않음)
+
+    Args:
+        token_budget (int): 한 번의 AI 호출에 넣을 프롬프트의 최대 토큰 수. 클수록 호출 수와 계층 수가 줄어듭니다.
+        fan_in (int): 한 묶음의 최대 텍스트 수. 0이면 토큰 예산만 적용합니다. (묶음에는 최소 2개의 텍스트가 들어감)
+        packing (str): 묶음 방식. "greedy"(순서 유지) 또는 "first_fit"(묶음 수 최소화).
+        job_id (str, optional): 요약 작업 ID. 없으면 get_summary_job_id(texts)를 사용합니다.
+        max_levels (int): 최대 계층 수. 묶음이 줄지 않는 등의 문제로 API 호출이 끝없이 이어지지 않도록 제한합니다.
+        progress_callback (callable, optional): 묶음 하나가 끝날 때마다 (계층, 완료 수, 계층의 묶음 수)로 호출됩니다. 호출 스레드에서 실행됩니다.
+    """
+    if not texts:
+        return None
+    job_id = job_id or get_summary_job_id(texts)
+
+    current_texts = list(texts)
+    for level in range(1, max_levels + 1):
+        batches = _group_texts_into_batches(current_texts, token_budget, fan_in, packing)
+        prompts = [BATCH_SUMMARY_PROMPT_PREFIX + BATCH_SUMMARY_SEPARATOR.join(batch_texts) for batch_texts in batches]
+        input_hashes = [hashlib.sha256(prompt.encode("utf-8")).hexdigest() for prompt in prompts]
+
+        # 이전 실행에서 이미 요약한 묶음은 재사용
+        completed_summaries = database_manager.get_intermediate_summaries_by_input_hash(input_hashes)
+        summaries = [completed_summaries.get(input_hash) for input_hash in input_hashes]
+        pending_indices = [index for index, summary in enumerate(summaries) if summary is None]
+        print(f"DEBUG: 계층적 요약 (작업 {job_id}) {level}차 - 묶음 {len(batches)}개 중 {len(batches) - len(pending_indices)}개 재사용")
+
+        completed_count = len(batches) - len(pending_indices)
+        if progress_callback and completed_count:
+            progress_callback(level, completed_count, len(batches))
+        if pending_indices:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(pending_indices)))) as executor:
+                future_to_index = {executor.submit(_summarize_batch, prompts[index], api_key): index for index in pending_indices}
+                for future in as_completed(future_to_index):
+                    index = future_to_index[future]
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        print(f"경고: 배치 요약 실패 (레벨 {level}, 배치 {index + 1}): {e}")
+                        summary = None
+                    if summary is not None:
+                        summaries[index] = summary
+                        database_manager.save_intermediate_summary(
+                            summary, f"{job_id}_level{level}_batch{index + 1}", level, job_id=job_id, input_hash=input_hashes[index]
+                        ) # 중간 요약 저장
+                    completed_count += 1
+                    if progress_callback:
+                        progress_callback(level, completed_count, len(batches))
+
+        # 실패한 묶음이 있으면 다음 계층으로 올리지 않고 중단 (성공한 묶음은 저장되어 있으므로 다시 실행하면 이어서 요약)
+        failed_batch_numbers = [index + 1 for index, summary in enumerate(summaries) if summary is None]
+        if failed_batch_numbers:
+            print(f"경고: 계층적 요약 (작업 {job_id}) {level}차 묶음 {failed_batch_numbers} 요약 실패. 요약을 중단합니다.")
+            return None
+        # 최종 요약은 하나의 텍스트로 나와야 하므로, 1개 초과 시 다음 계층에서 다시 요약
+        if len(summaries) == 1:
+            return summaries[0]
+        current_texts = summaries
+
+    print(f"경고: 계층적 요약 (작업 {job_id})이 {max_levels}단계 안에 끝나지 않아 중단합니다. (남은 요약문 {len(current_texts)}개)")
+    return None
 
 def get_overall_trend_summary(summarized_articles: list[dict], api_key: str, max_attempts: int = 2, delay_seconds: int = 15) -> str:
     """
@@ -212,20 +534,26 @@ def get_overall_trend_summary(summarized_articles: list[dict], api_key: str, max
         for art in summarized_articles
     ]
 
-    # 임시 DB 테이블 초기화 (새로운 전체 요약 시작 시)
-    database_manager.clear_intermediate_summaries()
+    # 보관 기간이 지난 중간 요약만 정리 (같은 기사로 다시 요약하면 남아 있는 중간 요약을 재사용)
+    database_manager.clear_intermediate_summaries(
+        older_than=(datetime.now() - INTERMEDIATE_SUMMARY_RETENTION).strftime('%Y-%m-%d %H:%M:%S')
+    )
 
     st.info("⏳ 뉴스 트렌드 계층적 요약 시작...")
-    # 계층적 요약 실행 (배치 크기 3개로 시작)
-    final_summaries_list = _summarize_text_batch(initial_summaries, api_key, batch_size=3, level=1, current_batch_prefix=datetime.now().strftime('%Y%m%d%H%M%S_'))
+
+    def report_level_progress(level, completed_count, batch_count):
+        if completed_count == batch_count and batch_count > 1:
+            st.info(f"⏳ {level}차 요약 완료. {batch_count}개의 요약문이 생성되었습니다. 다음 계층 요약 시작...")
+
+    # 계층적 요약 실행 (계층마다 묶음들을 동시에 요약)
+    final_trend_summary = summarize_texts_hierarchically(initial_summaries, api_key, progress_callback=report_level_progress)
 
     # 최종 요약문이 하나로 나와야 함
-    if final_summaries_list and len(final_summaries_list) == 1:
-        final_trend_summary = final_summaries_list[0]
+    if final_trend_summary:
         st.success("✅ 뉴스 트렌드 계층적 요약 완료!")
         return final_trend_summary
     else:
-        return "뉴스 트렌드 요약에 실패했습니다. 최종 요약문이 생성되지 않았습니다."
+        return "뉴스 트렌드 요약에 실패했습니다. 최종 요약문이 생성되지 않았습니다. (다시 실행하면 완료된 부분부터 이어서 요약합니다.)"
 
 
 def get_insurance_implications_from_ai(trend_summary_text: str, api_key: str, max_attempts: int = 2, delay_seconds: int = 15) -> str:
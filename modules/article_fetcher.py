@@ -0,0 +1,216 @@
+# modules/article_fetcher.py
+# 기사 원문 페이지를 동시에 내려받아 본문을 추출하고, 링크별로 압축 저장(article_bodies)하는 선택적 수집 단계입니다.
+# 네이버 검색 결과에는 미리보기 스니펫만 있으므로, AI 요약이 실제 본문을 바탕으로 이루어지도록 사용합니다.
+# 한 번 내려받은 링크는 캐시에서 읽으므로 같은 URL을 다시 요청하지 않습니다.
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from modules import database_manager # 본문 캐시 저장/조회
+from modules import rate_limiter # 도메인별 속도 제한 및 재시도
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 본문 수집 사용 여부 (1로 설정하면 사용). 언론사 사이트에 직접 요청하므로, 도메인별 속도 제한을 확인하기 전까지는
+# 기본값을 사용 안 함으로 두어 기존처럼 제목/미리보기만으로 요약
+FETCH_ARTICLE_BODIES = os.getenv("FETCH_ARTICLE_BODIES", "0") == "1"
+
+ARTICLE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0'
+
+# 동시 수집 기본 설정
+DEFAULT_MAX_WORKERS = 8 # 전체 워커 스레드 수
+MAX_CONCURRENT_REQUESTS_PER_DOMAIN = 2 # 같은 언론사 도메인으로 동시에 보낼 수 있는 최대 요청 수
+# 언론사 도메인별 기본 속도 제한 (rate_limiter.HOST_RATE_LIMITS에 따로 정한 호스트는 그 설정을 따름)
+ARTICLE_DOMAIN_RATE_LIMIT = {"rate": 1.0, "capacity": 2, "min_rate": 0.2, "max_rate": 3.0}
+ARTICLE_MAX_RETRIES = 2
+ARTICLE_REQUEST_TIMEOUT = (5, 15) # (연결, 읽기) 초
+
+MIN_ARTICLE_BODY_LENGTH = 200 # 이보다 짧으면 본문 추출 실패로 간주
+RETRY_FAILED_AFTER = timedelta(hours=24) # 요청에 실패한 링크를 다시 시도하기까지의 시간
+
+# 알려진 본문 영역 (네이버 뉴스 및 주요 언론사 CMS). 없으면 텍스트 밀도로 본문 블록을 고름
+ARTICLE_BODY_XPATHS = [
+    '//*[@id="dic_area"]',
+    '//*[@id="newsct_article"]',
+    '//*[@id="articleBodyContents"]',
+    '//*[@itemprop="articleBody"]',
+    '//*[@id="article-view-content-div"]',
+    '//*[@id="articleBody"]',
+    '//*[@id="article_body"]',
+    '//article',
+]
+ARTICLE_BODY_CSS_SELECTORS = [
+    "#dic_area", "#newsct_article", "#articleBodyContents", "[itemprop=articleBody]",
+    "#article-view-content-div", "#articleBody", "#article_body", "article",
+]
+NOISE_TAGS = ["script", "style", "noscript", "iframe", "nav", "header", "footer", "aside", "form", "figcaption", "button"]
+
+# 도메인별 동시 요청 수 제한용 세마포어 (도메인, 제한값) -> BoundedSemaphore
+_domain_semaphores = {}
+_domain_semaphores_lock = threading.Lock()
+
+
+def _get_domain_semaphore(domain: str, limit: int) -> threading.BoundedSemaphore:
+    """도메인별 동시 요청 수를 제한하는 세마포어를 반환합니다. (프로세스 전역에서 공유)"""
+    with _domain_semaphores_lock:
+        key = (domain, limit)
+        if key not in _domain_semaphores:
+            _domain_semaphores[key] = threading.BoundedSemaphore(limit)
+        return _domain_semaphores[key]
+
+
+def _normalize_body_text(text: str) -> str:
+    """줄마다 공백을 정리하고 빈 줄을 제거합니다."""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _extract_article_body_lxml(html) -> str:
+    document = lxml.html.fromstring(html)
+    for noise in document.xpath("|".join(f"//{tag}" for tag in NOISE_TAGS)):
+        noise.drop_tree()
+    for br in document.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    for paragraph in document.iter("p"):
+        paragraph.tail = "\n" + (paragraph.tail or "")
+
+    for xpath in ARTICLE_BODY_XPATHS:
+        nodes = document.xpath(xpath)
+        if nodes:
+            body = _normalize_body_text(nodes[0].text_content())
+            if len(body) >= MIN_ARTICLE_BODY_LENGTH:
+                return body
+
+    # 알려진 본문 영역이 없으면, 직접 포함한 텍스트(<p> 및 <br>로 나뉜 문단)가 가장 많은 블록을 본문으로 간주
+    best_node, best_score = None, 0
+    for node in document.iter("div", "section", "td"):
+        score = len((node.text or "").strip())
+        for child in node:
+            score += len((child.tail or "").strip())
+            if child.tag == "p":
+                score += len(child.text_content().strip())
+        if score > best_score:
+            best_node, best_score = node, score
+    return _normalize_body_text(best_node.text_content()) if best_node is not None else ""
+
+
+def _extract_article_body_bs4(html) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for noise in soup.find_all(NOISE_TAGS):
+        noise.decompose()
+
+    for selector in ARTICLE_BODY_CSS_SELECTORS:
+        node = soup.select_one(selector)
+        if node:
+            body = _normalize_body_text(node.get_text("\n"))
+            if len(body) >= MIN_ARTICLE_BODY_LENGTH:
+                return body
+
+    best_node, best_score = None, 0
+    for node in soup.find_all(["div", "section", "td"]):
+        score = sum(len(text.strip()) for text in node.find_all(string=True, recursive=False))
+        score += sum(len(p.get_text().strip()) for p in node.find_all("p", recursive=False))
+        if score > best_score:
+            best_node, best_score = node, score
+    return _normalize_body_text(best_node.get_text("\n")) if best_node is not None else ""
+
+
+def extract_article_body(html) -> str:
+    """
+    기사 페이지 HTML(문자열 또는 바이트)에서 본문 텍스트를 추출합니다.
+    알려진 본문 영역을 먼저 찾고, 없으면 텍스트 밀도가 가장 높은 블록을 사용합니다. 추출하지 못하면 빈 문자열을 반환합니다.
+    """
+    if not html:
+        return ""
+    if LXML_AVAILABLE:
+        try:
+            return _extract_article_body_lxml(html)
+        except Exception as e:
+            print(f"경고: lxml 본문 추출 실패, html.parser로 다시 시도합니다. ({e})")
+    return _extract_article_body_bs4(html)
+
+
+def _fetch_article_body(link: str, max_requests_per_domain: int) -> str:
+    """기사 페이지를 요청하여 본문을 추출합니다. 요청 오류는 호출자가 처리하도록 전파합니다."""
+    domain = urlparse(link).netloc
+    with _get_domain_semaphore(domain, max_requests_per_domain):
+        response = rate_limiter.request_with_backoff(
+            "GET", link, max_retries=ARTICLE_MAX_RETRIES, default_rate_limit=ARTICLE_DOMAIN_RATE_LIMIT,
+            headers={'User-Agent': ARTICLE_USER_AGENT}, timeout=ARTICLE_REQUEST_TIMEOUT
+        )
+    response.raise_for_status()
+    content_type = response.headers.get("Content-Type", "")
+    if "html" not in content_type:
+        return ""
+    # 헤더에 문자셋이 없으면(EUC-KR 언론사 등) 바이트를 넘겨 파서가 <meta charset>으로 판단하도록 함
+    html = response.text if "charset" in content_type.lower() else response.content
+    return extract_article_body(html)
+
+
+def _needs_fetch(cached: dict | None) -> bool:
+    if cached is None:
+        return True
+    if cached["status"] != "failed":
+        return False
+    return datetime.now() - datetime.strptime(cached["fetched_at"], '%Y-%m-%d %H:%M:%S') >= RETRY_FAILED_AFTER
+
+
+def fetch_article_bodies(links: list[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                         max_requests_per_domain: int = MAX_CONCURRENT_REQUESTS_PER_DOMAIN, progress_callback=None) -> dict:
+    """
+    기사 링크들의 본문을 가져옵니다. 캐시(article_bodies)에 있는 링크는 요청하지 않고,
+    나머지는 워커 풀에서 동시에 내려받아 본문을 추출한 뒤 압축하여 캐시에 저장합니다.
+    도메인별로 동시 요청 수(max_requests_per_domain)와 요청 속도(rate_limiter)를 제한합니다.
+
+    Args:
+        links (list[str]): 기사 링크 목록.
+        max_workers (int): 워커 스레드 수.
+        max_requests_per_domain (int): 도메인별 최대 동시 요청 수.
+        progress_callback (callable, optional): 링크 하나가 끝날 때마다 (완료 수, 전체 수, 링크)로 호출됩니다. 호출 스레드에서 실행됩니다.
+    Returns:
+        dict: {링크: 본문 또는 None(요청/추출 실패)}
+    """
+    links = list(dict.fromkeys(link for link in links if link))
+    cached_bodies = database_manager.get_article_bodies(links)
+    bodies = {link: cached_bodies[link]["body"] for link in links if not _needs_fetch(cached_bodies.get(link))}
+    links_to_fetch = [link for link in links if link not in bodies]
+    print(f"DEBUG: 기사 본문 수집 - 전체 {len(links)}건 중 {len(links_to_fetch)}건 요청, {len(bodies)}건은 캐시 사용")
+
+    completed_count = len(bodies)
+    if progress_callback and completed_count:
+        progress_callback(completed_count, len(links), None)
+    if not links_to_fetch:
+        return bodies
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_link = {executor.submit(_fetch_article_body, link, max_requests_per_domain): link for link in links_to_fetch}
+        for future in as_completed(future_to_link):
+            link = future_to_link[future]
+            try:
+                body = future.result()
+                status = "ok" if len(body) >= MIN_ARTICLE_BODY_LENGTH else "empty"
+            except requests.exceptions.RequestException as e:
+                print(f"경고: 기사 본문 요청 실패 ({link}): {e}")
+                body, status = None, "failed"
+            except Exception as e:
+                print(f"경고: 기사 본문 추출 실패 ({link}): {e}")
+                body, status = None, "empty"
+
+            body = body if status == "ok" else None
+            database_manager.save_article_body(link, body, status)
+            bodies[link] = body
+
+            completed_count += 1
+            if progress_callback:
+                progress_callback(completed_count, len(links), link)
+    return bodies
@@ -1,12 +1,17 @@
 # modules/database_manager.py
 
 import sqlite3
-from datetime import datetime
+import json
+import zlib
+from datetime import datetime, timedelta
 import streamlit as st # Streamlit의 st.session_state, st.success, st.error 등을 사용하기 위해 임시로 import.
                         # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
 
 DB_FILE = 'news_data.db'
 
+# 크롤링 후 이 일수가 지나야 해당 날짜의 기사 수집이 '확정'된 것으로 간주 (늦게 색인되는 기사 대비)
+CRAWL_COVERAGE_SETTLE_DAYS = 1
+
 def init_db():
     """데이터베이스를 초기화하고 테이블을 생성합니다."""
     conn = sqlite3.connect(DB_FILE)
@@ -67,26 +72,514 @@ def init_db():
             summary_text TEXT NOT NULL,
             batch_id TEXT NOT NULL, -- 어떤 배치에서 생성된 요약인지 식별
             level INTEGER NOT NULL, -- 요약 계층 (예: 1차 요약, 2차 요약)
-            timestamp TEXT NOT NULL
+            timestamp TEXT NOT NULL,
+            job_id TEXT, -- 요약 작업 ID (같은 입력으로 다시 요약하면 같은 ID)
+            input_hash TEXT -- 이 요약을 만든 입력(프롬프트)의 해시. 같은 입력은 다시 요약하지 않고 재사용
+        )
+    ''')
+    # 이전 버전 DB의 intermediate_summaries에는 job_id, input_hash 열이 없으므로 추가
+    intermediate_summary_columns = {row[1] for row in c.execute("PRAGMA table_info(intermediate_summaries)")}
+    for column in ("job_id", "input_hash"):
+        if column not in intermediate_summary_columns:
+            c.execute(f"ALTER TABLE intermediate_summaries ADD COLUMN {column} TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_intermediate_summaries_input_hash ON intermediate_summaries (input_hash)")
+    # 새로 추가: 기사를 수집한 검색 키워드 (한 기사가 여러 키워드로 수집될 수 있음)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS article_search_keywords (
+            link TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            PRIMARY KEY (link, keyword)
+        )
+    ''')
+    # 새로 추가: 크롤링 커버리지 기록 (키워드/날짜별로 몇 페이지까지 언제 수집을 마쳤는지)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_coverage (
+            keyword TEXT NOT NULL,
+            date TEXT NOT NULL, -- YYYY-MM-DD
+            pages_crawled INTEGER NOT NULL,
+            completed_at TEXT NOT NULL, -- YYYY-MM-DD HH:MM:SS
+            PRIMARY KEY (keyword, date)
+        )
+    ''')
+    # 새로 추가: 크롤링 작업 및 (날짜, 페이지)별 체크포인트 (중단된 크롤링 재개용)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            start_date TEXT NOT NULL, -- YYYY-MM-DD
+            total_days INTEGER NOT NULL,
+            max_pages INTEGER NOT NULL,
+            status TEXT NOT NULL, -- "running", "completed", "cancelled"
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            job_id INTEGER NOT NULL,
+            date TEXT NOT NULL, -- YYYY-MM-DD
+            page INTEGER NOT NULL, -- 0부터 시작
+            articles_json TEXT NOT NULL, -- 해당 페이지에서 수집한 기사 목록 (빈 페이지는 "[]")
+            completed_at TEXT NOT NULL,
+            PRIMARY KEY (job_id, date, page),
+            FOREIGN KEY (job_id) REFERENCES crawl_jobs(id) ON DELETE CASCADE
+        )
+    ''')
+    # 중복 기사 제거용 영구 URL 집합 (정규화된 기사 URL의 64비트 해시 -> 실제로 저장한 원본 링크)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS seen_article_urls (
+            url_hash INTEGER PRIMARY KEY,
+            first_seen_at TEXT NOT NULL,
+            link TEXT -- articles 테이블에 저장된 원본 링크
+        )
+    ''')
+    # 이전 버전 DB의 seen_article_urls에는 link 열이 없으므로 추가 (기존 행은 NULL)
+    if "link" not in {row[1] for row in c.execute("PRAGMA table_info(seen_article_urls)")}:
+        c.execute("ALTER TABLE seen_article_urls ADD COLUMN link TEXT")
+    # 기사 본문 캐시 (링크별로 한 번만 내려받도록 본문을 zlib으로 압축하여 저장)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            link TEXT PRIMARY KEY,
+            body_compressed BLOB, -- zlib 압축된 UTF-8 본문 (실패 시 NULL)
+            status TEXT NOT NULL, -- "ok", "empty"(본문 추출 실패), "failed"(요청 실패)
+            fetched_at TEXT NOT NULL
+        )
+    ''')
+    # AI(Potens) 응답 캐시: 요청 내용 해시 -> zlib 압축된 응답 JSON (만료 및 LRU 방식 용량 제한은 ai_service에서 관리)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            response_compressed BLOB NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            last_accessed_at TEXT NOT NULL
+        )
+    ''')
+    # 형태소 분석 결과 캐시: (텍스트 해시, 분석기 버전) -> 키워드 토큰 목록
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS keyword_token_cache (
+            text_hash TEXT NOT NULL,
+            analyzer_version TEXT NOT NULL,
+            tokens_json TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (text_hash, analyzer_version)
+        )
+    ''')
+    # 검색 키워드별 날짜별 키워드 빈도 (트렌드 분석 기간 합계용 집계 테이블)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS daily_keyword_counts (
+            search_keyword TEXT NOT NULL,
+            analyzer_version TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            date TEXT NOT NULL, -- YYYY-MM-DD
+            count INTEGER NOT NULL,
+            PRIMARY KEY (search_keyword, analyzer_version, date, keyword)
+        )
+    ''')
+    # 키워드 -> 기사 역색인 (트렌드 키워드를 포함한 기사를 다시 형태소 분석하지 않고 찾기 위함)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS keyword_article_index (
+            search_keyword TEXT NOT NULL,
+            analyzer_version TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            date TEXT NOT NULL, -- YYYY-MM-DD
+            link TEXT NOT NULL,
+            PRIMARY KEY (search_keyword, analyzer_version, keyword, date, link)
+        )
+    ''')
+    # daily_keyword_counts와 keyword_article_index에 이미 반영한 기사 (중복 집계 방지)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS daily_keyword_count_articles (
+            search_keyword TEXT NOT NULL,
+            analyzer_version TEXT NOT NULL,
+            link TEXT NOT NULL,
+            PRIMARY KEY (search_keyword, analyzer_version, link)
         )
     ''')
     conn.commit()
     conn.close()
 
-def insert_article(article: dict):
+def insert_article(article: dict, search_keyword: str = None):
     """기사 데이터를 데이터베이스에 삽입합니다. 중복 링크는 건너뛰거나 업데이트합니다."""
+    insert_articles([article], search_keyword)
+
+def insert_articles(articles: list[dict], search_keyword: str = None):
+    """
+    여러 기사를 하나의 트랜잭션으로 삽입합니다. 중복 링크는 업데이트합니다.
+    search_keyword가 주어지면 해당 키워드로 수집된 기사임을 함께 기록합니다.
+    """
+    if not articles:
+        return
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    crawl_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for article in articles:
+        try:
+            # 링크가 이미 존재하면 업데이트, 없으면 삽입
+            c.execute("INSERT OR REPLACE INTO articles (link, title, date, content, crawl_timestamp) VALUES (?, ?, ?, ?, ?)",
+                      (article['링크'], article['제목'], article['날짜'], article['내용'], crawl_timestamp))
+            if search_keyword:
+                c.execute("INSERT OR IGNORE INTO article_search_keywords (link, keyword) VALUES (?, ?)",
+                          (article['링크'], search_keyword))
+        except Exception as e:
+            print(f"오류: 데이터베이스 삽입/업데이트 실패 - {e} (링크: {article['링크']})")
+    try:
+        conn.commit()
+    finally:
+        conn.close()
+
+def get_articles_by_keyword_and_dates(keyword: str, dates: list[str]) -> list[tuple]:
+    """
+    지정된 검색 키워드로 수집된 기사 중 해당 날짜(YYYY-MM-DD 목록)의 기사를 가져옵니다.
+    반환 값: [(title, link, date, content), ...] 날짜 및 저장 순서대로 정렬
+    """
+    if not dates:
+        return []
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    placeholders = ",".join("?" for _ in dates)
+    c.execute(f"""
+        SELECT a.title, a.link, a.date, a.content
+        FROM articles a JOIN article_search_keywords k ON a.link = k.link
+        WHERE k.keyword = ? AND a.date IN ({placeholders})
+        ORDER BY a.date, a.id
+    """, (keyword, *dates))
+    articles = c.fetchall()
+    conn.close()
+    return articles
+
+def tag_articles_with_keyword(links: list[str], keyword: str):
+    """이미 저장된 기사(링크 목록)가 해당 검색 키워드로도 수집되었음을 기록합니다."""
+    if not links:
+        return
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        c.executemany("INSERT OR IGNORE INTO article_search_keywords (link, keyword) VALUES (?, ?)",
+                      [(link, keyword) for link in links])
+        conn.commit()
+    except Exception as e:
+        print(f"오류: 기사 검색 키워드 기록 실패 - {e}")
+    finally:
+        conn.close()
+
+def get_seen_url_links(url_hashes: list[int]) -> dict:
+    """
+    주어진 URL 해시 중 이미 저장된 기사의 해시와 저장된 원본 링크를 반환합니다.
+    {URL 해시: 원본 링크} (링크를 기록하기 전에 저장된 기사는 None)
+    """
+    if not url_hashes:
+        return {}
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    seen_links = {}
+    # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나누어 조회
+    for i in range(0, len(url_hashes), 500):
+        chunk = url_hashes[i:i + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        c.execute(f"SELECT url_hash, link FROM seen_article_urls WHERE url_hash IN ({placeholders})", chunk)
+        seen_links.update(c.fetchall())
+    conn.close()
+    return seen_links
+
+def add_seen_urls(links_by_hash: dict):
+    """저장한 기사의 {URL 해시: 원본 링크}를 영구 URL 집합에 추가합니다."""
+    if not links_by_hash:
+        return
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        first_seen_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.executemany("INSERT OR IGNORE INTO seen_article_urls (url_hash, first_seen_at, link) VALUES (?, ?, ?)",
+                      [(url_hash, first_seen_at, link) for url_hash, link in links_by_hash.items()])
+        conn.commit()
+    except Exception as e:
+        print(f"오류: 수집한 기사 URL 기록 실패 - {e}")
+    finally:
+        conn.close()
+
+def get_article_bodies(links: list[str]) -> dict:
+    """
+    캐시된 기사 본문을 가져옵니다.
+    반환 값: {link: {"body": str | None, "status": str, "fetched_at": str}} (캐시에 없는 링크는 포함되지 않음)
+    """
+    if not links:
+        return {}
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    bodies = {}
+    for i in range(0, len(links), 500):
+        chunk = links[i:i + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        c.execute(f"SELECT link, body_compressed, status, fetched_at FROM article_bodies WHERE link IN ({placeholders})", chunk)
+        for link, body_compressed, status, fetched_at in c.fetchall():
+            body = zlib.decompress(body_compressed).decode('utf-8') if body_compressed else None
+            bodies[link] = {"body": body, "status": status, "fetched_at": fetched_at}
+    conn.close()
+    return bodies
+
+def save_article_body(link: str, body: str | None, status: str):
+    """기사 본문을 압축하여 캐시에 저장합니다. (같은 링크는 덮어씀)"""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        body_compressed = zlib.compress(body.encode('utf-8')) if body else None
+        c.execute("INSERT OR REPLACE INTO article_bodies (link, body_compressed, status, fetched_at) VALUES (?, ?, ?, ?)",
+                  (link, body_compressed, status, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+    except Exception as e:
+        print(f"오류: 기사 본문 저장 실패 - {e} (링크: {link})")
+    finally:
+        conn.close()
+
+def get_llm_cached_response(cache_key: str, created_after: str) -> str | None:
+    """
+    캐시된 AI 응답(JSON 문자열)을 가져오고 마지막 사용 시각을 갱신합니다.
+    created_after(YYYY-MM-DD HH:MM:SS) 이전에 저장된(만료된) 응답이나 캐시에 없는 키는 None을 반환합니다.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        c.execute("SELECT response_compressed FROM llm_response_cache WHERE cache_key = ? AND created_at >= ?", (cache_key, created_after))
+        row = c.fetchone()
+        if row is None:
+            return None
+        c.execute("UPDATE llm_response_cache SET last_accessed_at = ? WHERE cache_key = ?",
+                  (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), cache_key))
+        conn.commit()
+        return zlib.decompress(row[0]).decode('utf-8')
+    finally:
+        conn.close()
+
+def save_llm_cached_response(cache_key: str, response_json: str) -> int:
+    """AI 응답(JSON 문자열)을 압축하여 캐시에 저장합니다. (같은 키는 덮어씀) 반환 값: 저장한 압축 크기 (실패하면 0)"""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        response_compressed = zlib.compress(response_json.encode('utf-8'))
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.execute("INSERT OR REPLACE INTO llm_response_cache (cache_key, response_compressed, size_bytes, created_at, last_accessed_at) VALUES (?, ?, ?, ?, ?)",
+                  (cache_key, response_compressed, len(response_compressed), now, now))
+        conn.commit()
+        return len(response_compressed)
+    except Exception as e:
+        print(f"오류: AI 응답 캐시 저장 실패 - {e}")
+        return 0
+    finally:
+        conn.close()
+
+def evict_llm_response_cache(max_bytes: int, expired_before: str) -> int:
+    """
+    AI 응답 캐시에서 만료된(expired_before 이전에 저장된) 응답을 지우고,
+    남은 응답의 압축 크기 합계가 max_bytes 이하가 되도록 가장 오래 사용하지 않은 응답부터 지웁니다. (LRU)
+    반환 값: 지운 응답 수
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        c.execute("DELETE FROM llm_response_cache WHERE created_at < ?", (expired_before,))
+        evicted_count = c.rowcount
+        c.execute('''
+            DELETE FROM llm_response_cache WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key, SUM(size_bytes) OVER (ORDER BY last_accessed_at DESC, created_at DESC, cache_key) AS cumulative_bytes
+                    FROM llm_response_cache
+                ) WHERE cumulative_bytes > ?
+            )
+        ''', (max_bytes,))
+        evicted_count += c.rowcount
+        conn.commit()
+        return evicted_count
+    except Exception as e:
+        print(f"오류: AI 응답 캐시 정리 실패 - {e}")
+        return 0
+    finally:
+        conn.close()
+
+def get_llm_response_cache_usage() -> dict:
+    """AI 응답 캐시의 저장 현황 {"entries": 응답 수, "bytes": 압축 크기 합계}를 반환합니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_response_cache")
+    entries, total_bytes = c.fetchone()
+    conn.close()
+    return {"entries": entries, "bytes": total_bytes}
+
+def clear_llm_response_cache():
+    """AI 응답 캐시를 모두 지웁니다."""
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
     try:
-        # 링크가 이미 존재하면 업데이트, 없으면 삽입
-        c.execute("INSERT OR REPLACE INTO articles (link, title, date, content, crawl_timestamp) VALUES (?, ?, ?, ?, ?)",
-                  (article['링크'], article['제목'], article['날짜'], article['내용'], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        c.execute("DELETE FROM llm_response_cache")
         conn.commit()
     except Exception as e:
-        print(f"오류: 데이터베이스 삽입/업데이트 실패 - {e} (링크: {article['링크']})")
+        print(f"오류: AI 응답 캐시 삭제 실패 - {e}")
     finally:
         conn.close()
 
+def get_cached_tokens(text_hashes: list[str], analyzer_version: str) -> dict:
+    """캐시된 형태소 분석 결과를 가져옵니다. 반환 값: {텍스트 해시: 키워드 토큰 목록} (캐시에 없는 해시는 포함되지 않음)"""
+    if not text_hashes:
+        return {}
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    tokens_by_hash = {}
+    for i in range(0, len(text_hashes), 500):
+        chunk = text_hashes[i:i + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        c.execute(f"SELECT text_hash, tokens_json FROM keyword_token_cache WHERE analyzer_version = ? AND text_hash IN ({placeholders})",
+                  (analyzer_version, *chunk))
+        tokens_by_hash.update((text_hash, json.loads(tokens_json)) for text_hash, tokens_json in c.fetchall())
+    conn.close()
+    return tokens_by_hash
+
+def save_cached_tokens(rows: list[tuple[str, list[str]]], analyzer_version: str):
+    """형태소 분석 결과 [(텍스트 해시, 키워드 토큰 목록)]를 캐시에 저장합니다."""
+    if not rows:
+        return
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.executemany("INSERT OR REPLACE INTO keyword_token_cache (text_hash, analyzer_version, tokens_json, created_at) VALUES (?, ?, ?, ?)",
+                      [(text_hash, analyzer_version, json.dumps(tokens, ensure_ascii=False), created_at) for text_hash, tokens in rows])
+        conn.commit()
+    except Exception as e:
+        print(f"오류: 형태소 분석 캐시 저장 실패 - {e}")
+    finally:
+        conn.close()
+
+def get_counted_article_links(search_keyword: str, analyzer_version: str, links: list[str]) -> set[str]:
+    """주어진 링크 중 날짜별 키워드 집계에 이미 반영된 기사의 링크를 반환합니다."""
+    if not links:
+        return set()
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    counted_links = set()
+    for i in range(0, len(links), 500):
+        chunk = links[i:i + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        c.execute(f"SELECT link FROM daily_keyword_count_articles WHERE search_keyword = ? AND analyzer_version = ? AND link IN ({placeholders})",
+                  (search_keyword, analyzer_version, *chunk))
+        counted_links.update(row[0] for row in c.fetchall())
+    conn.close()
+    return counted_links
+
+def add_daily_keyword_counts(search_keyword: str, analyzer_version: str, article_counts: list[tuple]):
+    """
+    기사별 키워드 빈도 [(링크, 날짜, {키워드: 빈도})]를 날짜별 집계에 더하고 키워드 -> 기사 역색인에 추가합니다. (하나의 트랜잭션)
+    이미 반영된 기사는 건너뛰므로 같은 기사를 여러 번 넘겨도 한 번만 집계됩니다.
+    """
+    if not article_counts:
+        return
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        for link, date_str, keyword_counts in article_counts:
+            c.execute("INSERT OR IGNORE INTO daily_keyword_count_articles (search_keyword, analyzer_version, link) VALUES (?, ?, ?)",
+                      (search_keyword, analyzer_version, link))
+            if c.rowcount == 0:
+                continue
+            c.executemany('''
+                INSERT INTO daily_keyword_counts (search_keyword, analyzer_version, keyword, date, count) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (search_keyword, analyzer_version, date, keyword) DO UPDATE SET count = count + excluded.count
+            ''', [(search_keyword, analyzer_version, keyword, date_str, count) for keyword, count in keyword_counts.items()])
+            c.executemany("INSERT OR IGNORE INTO keyword_article_index (search_keyword, analyzer_version, keyword, date, link) VALUES (?, ?, ?, ?, ?)",
+                          [(search_keyword, analyzer_version, keyword, date_str, link) for keyword in keyword_counts])
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 날짜별 키워드 집계 실패 - {e}")
+    finally:
+        conn.close()
+
+def get_keyword_window_counts(search_keyword: str, analyzer_version: str, total_start_date: str, recent_start_date: str,
+                              min_recent_freq: int = 1) -> list[tuple]:
+    """
+    날짜별 키워드 집계를 기간별로 합산합니다.
+    최근 기간: recent_start_date 이후, 과거 기간: total_start_date 이상 recent_start_date 미만 (날짜는 YYYY-MM-DD)
+    반환 값: [(키워드, 최근 기간 빈도, 과거 기간 빈도, 과거 기간 일별 빈도 제곱합)] 최근 기간 빈도가 min_recent_freq 이상인 키워드만
+    (제곱합은 과거 기간 일별 빈도의 분산 계산용. 집계가 없는 날은 0으로 간주)
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute('''
+        SELECT keyword,
+               SUM(CASE WHEN date >= :recent_start THEN count ELSE 0 END) AS recent_freq,
+               SUM(CASE WHEN date < :recent_start THEN count ELSE 0 END) AS past_freq,
+               SUM(CASE WHEN date < :recent_start THEN count * count ELSE 0 END) AS past_sq_freq
+        FROM daily_keyword_counts
+        WHERE search_keyword = :search_keyword AND analyzer_version = :analyzer_version AND date >= :total_start
+        GROUP BY keyword
+        HAVING recent_freq >= :min_recent_freq
+    ''', {"search_keyword": search_keyword, "analyzer_version": analyzer_version, "total_start": total_start_date,
+          "recent_start": recent_start_date, "min_recent_freq": min_recent_freq})
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+def get_keyword_window_total(search_keyword: str, analyzer_version: str, total_start_date: str) -> int:
+    """total_start_date(YYYY-MM-DD) 이후 날짜별 키워드 집계에서 단어(공백 없는 키워드) 빈도의 총합을 반환합니다. (구 빈도 제외)"""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute('''
+        SELECT COALESCE(SUM(count), 0) FROM daily_keyword_counts
+        WHERE search_keyword = ? AND analyzer_version = ? AND date >= ? AND instr(keyword, ' ') = 0
+    ''', (search_keyword, analyzer_version, total_start_date))
+    total = c.fetchone()[0]
+    conn.close()
+    return total
+
+def get_links_by_keywords(search_keyword: str, analyzer_version: str, keywords: list[str], start_date: str = None) -> dict:
+    """
+    키워드 -> 기사 역색인에서 주어진 키워드 중 하나 이상을 포함한 기사를 찾습니다.
+    Args:
+        start_date (str, optional): 이 날짜(YYYY-MM-DD) 이후의 기사만 찾습니다.
+    Returns:
+        dict: {링크: 포함한 키워드 수}
+    """
+    if not keywords:
+        return {}
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    placeholders = ",".join("?" for _ in keywords)
+    c.execute(f'''
+        SELECT link, COUNT(*) FROM keyword_article_index
+        WHERE search_keyword = ? AND analyzer_version = ? AND keyword IN ({placeholders}) AND date >= ?
+        GROUP BY link
+    ''', (search_keyword, analyzer_version, *keywords, start_date or ""))
+    matched_links = dict(c.fetchall())
+    conn.close()
+    return matched_links
+
+def iter_articles(search_keyword: str = None, start_date: str = None, batch_size: int = 1000):
+    """
+    기사를 날짜 순서로 batch_size개씩 나누어 차례로 반환하는 제너레이터입니다. (전체 기사를 한 번에 메모리에 올리지 않음)
+    search_keyword가 주어지면 해당 키워드로 수집된 기사만, start_date(YYYY-MM-DD)가 주어지면 그 날짜 이후의 기사만 반환합니다.
+    묶음마다 (날짜, id) 다음부터 새로 조회하므로, 순회하는 동안 DB를 잠그지 않아 다른 쓰기(토큰 캐시 저장 등)와 함께 사용할 수 있습니다.
+    반환 값: [(title, link, date, content), ...] 묶음
+    """
+    last_position = (start_date or "", 0) # 마지막으로 반환한 (날짜, id). 첫 묶음은 start_date의 처음부터
+    while True:
+        conn = sqlite3.connect(DB_FILE)
+        c = conn.cursor()
+        if search_keyword:
+            c.execute("""
+                SELECT a.title, a.link, a.date, a.content, a.id
+                FROM articles a JOIN article_search_keywords k ON a.link = k.link
+                WHERE k.keyword = ? AND (a.date, a.id) > (?, ?)
+                ORDER BY a.date, a.id LIMIT ?
+            """, (search_keyword, *last_position, batch_size))
+        else:
+            c.execute("SELECT title, link, date, content, id FROM articles WHERE (date, id) > (?, ?) ORDER BY date, id LIMIT ?",
+                      (*last_position, batch_size))
+        rows = c.fetchall()
+        conn.close()
+        if not rows:
+            break
+        last_position = (rows[-1][2], rows[-1][4])
+        yield [row[:4] for row in rows]
+
 def get_all_articles():
     """데이터베이스의 모든 기사 데이터를 가져옵니다."""
     conn = sqlite3.connect(DB_FILE)
@@ -108,6 +601,17 @@ def clear_db_content():
         c.execute("DELETE FROM generated_endorsements")
         c.execute("DELETE FROM document_texts")
         c.execute("DELETE FROM intermediate_summaries") # 새로 추가
+        c.execute("DELETE FROM article_search_keywords")
+        c.execute("DELETE FROM crawl_coverage")
+        c.execute("DELETE FROM crawl_checkpoints")
+        c.execute("DELETE FROM crawl_jobs")
+        c.execute("DELETE FROM seen_article_urls")
+        c.execute("DELETE FROM article_bodies")
+        c.execute("DELETE FROM keyword_token_cache")
+        c.execute("DELETE FROM llm_response_cache")
+        c.execute("DELETE FROM daily_keyword_counts")
+        c.execute("DELETE FROM daily_keyword_count_articles")
+        c.execute("DELETE FROM keyword_article_index")
         conn.commit()
         st.session_state['db_status_message'] = "데이터베이스의 모든 기록이 성공적으로 삭제되었습니다."
         st.session_state['db_status_type'] = "success"
@@ -303,13 +807,13 @@ def get_latest_document_text() -> str | None:
     return None
 
 # --- 중간 요약문 저장 및 로드 함수 (새로 추가) ---
-def save_intermediate_summary(summary_text: str, batch_id: str, level: int):
+def save_intermediate_summary(summary_text: str, batch_id: str, level: int, job_id: str = None, input_hash: str = None):
     """중간 요약 텍스트를 데이터베이스에 저장합니다."""
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
     try:
-        c.execute("INSERT INTO intermediate_summaries (summary_text, batch_id, level, timestamp) VALUES (?, ?, ?, ?)",
-                  (summary_text, batch_id, level, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        c.execute("INSERT INTO intermediate_summaries (summary_text, batch_id, level, timestamp, job_id, input_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                  (summary_text, batch_id, level, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), job_id, input_hash))
         conn.commit()
         return True
     except Exception as e:
@@ -331,17 +835,205 @@ def get_intermediate_summaries(level: int, batch_id_prefix: str = "") -> list[st
     conn.close()
     return summaries
 
-def clear_intermediate_summaries():
-    """중간 요약 테이블의 모든 내용을 삭제합니다."""
+def get_intermediate_summaries_by_input_hash(input_hashes: list[str]) -> dict:
+    """입력 해시별로 이미 완료된 중간 요약문을 가져옵니다. {입력 해시: 요약문} (같은 해시가 여러 개면 가장 최근 것)"""
+    input_hashes = list(dict.fromkeys(input_hashes))
+    if not input_hashes:
+        return {}
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    summaries = {}
+    for i in range(0, len(input_hashes), 500): # SQLite 변수 개수 제한 대비
+        chunk = input_hashes[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        c.execute(f"SELECT input_hash, summary_text FROM intermediate_summaries WHERE input_hash IN ({placeholders}) ORDER BY id", chunk)
+        summaries.update(c.fetchall())
+    conn.close()
+    return summaries
+
+def clear_intermediate_summaries(job_id: str = None, older_than: str = None):
+    """
+    중간 요약을 삭제합니다. 인자가 없으면 테이블의 모든 내용을 삭제합니다.
+    Args:
+        job_id (str, optional): 이 요약 작업의 중간 요약만 삭제.
+        older_than (str, optional): 이 시각('%Y-%m-%d %H:%M:%S')보다 먼저 저장된 중간 요약만 삭제.
+    """
+    conditions, params = [], []
+    if job_id is not None:
+        conditions.append("job_id = ?")
+        params.append(job_id)
+    if older_than is not None:
+        conditions.append("timestamp < ?")
+        params.append(older_than)
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
     try:
-        c.execute("DELETE FROM intermediate_summaries")
+        c.execute("DELETE FROM intermediate_summaries" + (" WHERE " + " AND ".join(conditions) if conditions else ""), params)
         conn.commit()
-        print("중간 요약 테이블이 성공적으로 초기화되었습니다.")
+        if not conditions:
+            print("중간 요약 테이블이 성공적으로 초기화되었습니다.")
         return True
     except Exception as e:
         print(f"오류: 중간 요약 테이블 초기화 실패 - {e}")
         return False
     finally:
         conn.close()
+
+# --- 크롤링 커버리지 관련 함수 (증분 크롤링용) ---
+def record_crawl_coverage(keyword: str, dates: list[str], pages_crawled: int):
+    """키워드/날짜별로 수집을 마친 페이지 수와 완료 시각을 기록합니다."""
+    if not dates:
+        return True
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        completed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.executemany("INSERT OR REPLACE INTO crawl_coverage (keyword, date, pages_crawled, completed_at) VALUES (?, ?, ?, ?)",
+                      [(keyword, date_str, pages_crawled, completed_at) for date_str in dates])
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"오류: 크롤링 커버리지 기록 실패 - {e}")
+        return False
+    finally:
+        conn.close()
+
+def get_crawl_coverage(keyword: str, start_date: str, end_date: str) -> dict:
+    """
+    키워드의 크롤링 커버리지를 날짜 범위(YYYY-MM-DD, 양 끝 포함)로 가져옵니다.
+    반환 값: {date: {"pages_crawled": int, "completed_at": str}}
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute("SELECT date, pages_crawled, completed_at FROM crawl_coverage WHERE keyword = ? AND date BETWEEN ? AND ?",
+              (keyword, start_date, end_date))
+    rows = c.fetchall()
+    conn.close()
+    return {row[0]: {"pages_crawled": row[1], "completed_at": row[2]} for row in rows}
+
+def is_crawl_coverage_fresh(coverage: dict | None, date_str: str, required_pages: int) -> bool:
+    """
+    커버리지 기록만으로 해당 날짜를 다시 크롤링하지 않아도 되는지 판단합니다.
+    요청 페이지 수 이상을 수집했고, 해당 날짜가 끝나고 CRAWL_COVERAGE_SETTLE_DAYS가 지난 뒤에 수집했다면 최신으로 봅니다.
+    (오늘, 어제처럼 기사가 계속 추가될 수 있는 날짜는 항상 다시 크롤링 대상)
+    """
+    if not coverage or coverage["pages_crawled"] < required_pages:
+        return False
+    settled_at = datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=1 + CRAWL_COVERAGE_SETTLE_DAYS)
+    return datetime.strptime(coverage["completed_at"], '%Y-%m-%d %H:%M:%S') >= settled_at
+
+# --- 크롤링 작업 및 체크포인트 관련 함수 (중단된 크롤링 재개용) ---
+def _crawl_job_row_to_dict(row) -> dict:
+    return {
+        "id": row[0],
+        "keyword": row[1],
+        "start_date": row[2],
+        "total_days": row[3],
+        "max_pages": row[4],
+        "status": row[5],
+        "created_at": row[6],
+        "updated_at": row[7]
+    }
+
+def create_crawl_job(keyword: str, start_date: str, total_days: int, max_pages: int) -> int | None:
+    """새 크롤링 작업을 'running' 상태로 등록하고 작업 ID를 반환합니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.execute("INSERT INTO crawl_jobs (keyword, start_date, total_days, max_pages, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                  (keyword, start_date, total_days, max_pages, "running", now, now))
+        conn.commit()
+        return c.lastrowid
+    except Exception as e:
+        print(f"오류: 크롤링 작업 등록 실패 - {e}")
+        return None
+    finally:
+        conn.close()
+
+def get_crawl_job(job_id: int) -> dict | None:
+    """지정된 ID의 크롤링 작업을 가져옵니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute("SELECT id, keyword, start_date, total_days, max_pages, status, created_at, updated_at FROM crawl_jobs WHERE id = ?", (job_id,))
+    row = c.fetchone()
+    conn.close()
+    return _crawl_job_row_to_dict(row) if row else None
+
+def get_crawl_jobs(status: str = None) -> list[dict]:
+    """크롤링 작업 목록을 최신순으로 가져옵니다. status가 주어지면 해당 상태의 작업만 가져옵니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    query = "SELECT id, keyword, start_date, total_days, max_pages, status, created_at, updated_at FROM crawl_jobs"
+    if status:
+        c.execute(query + " WHERE status = ? ORDER BY id DESC", (status,))
+    else:
+        c.execute(query + " ORDER BY id DESC")
+    rows = c.fetchall()
+    conn.close()
+    return [_crawl_job_row_to_dict(row) for row in rows]
+
+def find_running_crawl_job(keyword: str, start_date: str, total_days: int, max_pages: int) -> dict | None:
+    """같은 조건으로 실행 중(또는 중단된) 크롤링 작업이 있으면 가장 최근 작업을 반환합니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute("""
+        SELECT id, keyword, start_date, total_days, max_pages, status, created_at, updated_at FROM crawl_jobs
+        WHERE keyword = ? AND start_date = ? AND total_days = ? AND max_pages = ? AND status = 'running'
+        ORDER BY id DESC LIMIT 1
+    """, (keyword, start_date, total_days, max_pages))
+    row = c.fetchone()
+    conn.close()
+    return _crawl_job_row_to_dict(row) if row else None
+
+def update_crawl_job_status(job_id: int, status: str):
+    """크롤링 작업의 상태를 변경합니다. 완료/취소된 작업의 체크포인트는 삭제합니다."""
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        c.execute("UPDATE crawl_jobs SET status = ?, updated_at = ? WHERE id = ?",
+                  (status, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), job_id))
+        if status != "running":
+            c.execute("DELETE FROM crawl_checkpoints WHERE job_id = ?", (job_id,))
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"오류: 크롤링 작업 상태 변경 실패 - {e}")
+        return False
+    finally:
+        conn.close()
+
+def save_crawl_checkpoint(job_id: int, date_str: str, page: int, articles: list[dict]):
+    """
+    크롤링 작업의 (날짜, 페이지) 완료 체크포인트를 저장합니다.
+    articles의 '날짜' 값은 YYYY-MM-DD 문자열이어야 합니다.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    try:
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 취소/완료된 작업에는 체크포인트를 남기지 않음
+        c.execute("""
+            INSERT OR REPLACE INTO crawl_checkpoints (job_id, date, page, articles_json, completed_at)
+            SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM crawl_jobs WHERE id = ? AND status = 'running')
+        """, (job_id, date_str, page, json.dumps(articles, ensure_ascii=False), now, job_id))
+        c.execute("UPDATE crawl_jobs SET updated_at = ? WHERE id = ?", (now, job_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"오류: 크롤링 체크포인트 저장 실패 - {e}")
+        return False
+    finally:
+        conn.close()
+
+def get_crawl_checkpoints(job_id: int) -> dict:
+    """
+    크롤링 작업의 체크포인트를 가져옵니다.
+    반환 값: {(date, page): [기사 dict, ...]} ('날짜'는 YYYY-MM-DD 문자열)
+    """
+    conn = sqlite3.connect(DB_FILE)
+    c = conn.cursor()
+    c.execute("SELECT date, page, articles_json FROM crawl_checkpoints WHERE job_id = ?", (job_id,))
+    rows = c.fetchall()
+    conn.close()
+    return {(row[0], row[1]): json.loads(row[2]) for row in rows}
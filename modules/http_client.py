@@ -0,0 +1,102 @@
+# modules/http_client.py
+# 크롤러(news_crawler)와 AI 클라이언트(ai_service)가 함께 사용하는 HTTP 전송 계층입니다.
+# 프로세스 전역에서 하나의 requests.Session을 공유하여 keep-alive 연결을 재사용합니다.
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- 연결 풀 기본 설정 ---
+DEFAULT_POOL_CONNECTIONS = 10 # 캐시할 호스트별 연결 풀 개수
+DEFAULT_POOL_MAXSIZE = 10 # 호스트 하나당 유지할 최대 연결 수
+DEFAULT_TIMEOUT = (5, 30) # (연결 타임아웃, 읽기 타임아웃) 초. 호출 시 timeout 인자로 덮어쓸 수 있음
+
+# 호스트별 최대 연결 수. 풀이 가득 차면 요청은 연결이 반환될 때까지 대기하므로
+# 이 값이 곧 해당 호스트로의 최대 동시 요청 수가 됩니다.
+HOST_POOL_MAXSIZE = {
+    "search.naver.com": 8,
+    "ai.potens.ai": 8,
+}
+
+_session = None
+_session_lock = threading.Lock()
+_pool_config = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "host_pool_maxsize": dict(HOST_POOL_MAXSIZE),
+    "timeout": DEFAULT_TIMEOUT,
+}
+
+
+def _create_session() -> requests.Session:
+    """설정값에 맞춰 연결 풀이 구성된 Session을 생성합니다."""
+    session = requests.Session()
+    default_adapter = HTTPAdapter(pool_connections=_pool_config["pool_connections"], pool_maxsize=_pool_config["pool_maxsize"])
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    # 호스트별 어댑터: pool_block=True로 설정하여 호스트별 연결 수 상한을 강제
+    for host, maxsize in _pool_config["host_pool_maxsize"].items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=maxsize, pool_block=True)
+        session.mount(f"https://{host}/", host_adapter)
+        session.mount(f"http://{host}/", host_adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """프로세스 전역에서 공유하는 Session을 반환합니다. (최초 호출 시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def configure(pool_connections: int = None, pool_maxsize: int = None, host_pool_maxsize: dict = None, timeout=None):
+    """
+    연결 풀 설정을 변경합니다. 기존 Session은 닫고 다음 요청부터 새 설정이 적용됩니다.
+    Args:
+        pool_connections (int, optional): 캐시할 호스트별 연결 풀 개수.
+        pool_maxsize (int, optional): 호스트 하나당 최대 연결 수 (기본 어댑터).
+        host_pool_maxsize (dict, optional): {호스트: 최대 연결 수}. 기존 값에 병합됩니다.
+        timeout (float | tuple, optional): 기본 타임아웃. (연결, 읽기) 튜플 또는 초 단위 숫자.
+    """
+    global _session
+    with _session_lock:
+        if pool_connections is not None:
+            _pool_config["pool_connections"] = pool_connections
+        if pool_maxsize is not None:
+            _pool_config["pool_maxsize"] = pool_maxsize
+        if host_pool_maxsize:
+            _pool_config["host_pool_maxsize"].update(host_pool_maxsize)
+        if timeout is not None:
+            _pool_config["timeout"] = timeout
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def close_session():
+    """공유 Session을 닫고 모든 keep-alive 연결을 정리합니다."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def request(method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    """공유 Session으로 HTTP 요청을 보냅니다. timeout을 생략하면 기본 타임아웃이 적용됩니다."""
+    if timeout is None:
+        timeout = _pool_config["timeout"]
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """공유 Session으로 GET 요청을 보냅니다."""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """공유 Session으로 POST 요청을 보냅니다."""
+    return request("POST", url, **kwargs)
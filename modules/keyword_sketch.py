@@ -0,0 +1,110 @@
+# modules/keyword_sketch.py
+# 메모리를 일정하게 유지하면서 대량의 키워드 스트림 빈도를 근사하는 스케치 자료구조.
+# 정확한 Counter 대신 Count-Min Sketch로 모든 키워드의 빈도를 (과대) 추정하고,
+# 추정 빈도가 높은 후보만 따로 보관하여 상위 키워드(heavy hitters)를 찾습니다.
+# 추정 빈도는 항상 실제 빈도 이상이며, 확률 1 - delta로 실제 빈도 + epsilon * 전체 빈도 이하입니다.
+
+import hashlib
+import math
+
+import numpy as np
+
+DEFAULT_SKETCH_EPSILON = 2e-5 # 빈도 오차 한계 비율 (전체 빈도 대비)
+DEFAULT_SKETCH_DELTA = 0.01 # 오차 한계를 넘을 확률
+HEAVY_HITTER_PRUNE_FACTOR = 2 # 후보가 capacity의 이 배수를 넘으면 추정 빈도 상위 capacity개만 남김
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _token_hash_pair(token: str) -> tuple[int, int]:
+    """토큰 하나의 64비트 해시 두 개 (double hashing으로 행마다 다른 열 위치를 만듦)."""
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch. 너비 ceil(e / epsilon), 깊이 ceil(ln(1 / delta))의 고정 크기 카운터 표로 토큰 빈도를 추정합니다.
+    메모리 사용량은 넣은 토큰 종류 수와 관계없이 너비 x 깊이 x 8바이트입니다.
+    """
+
+    def __init__(self, epsilon: float = DEFAULT_SKETCH_EPSILON, delta: float = DEFAULT_SKETCH_DELTA):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0 # 지금까지 더한 전체 빈도
+
+    def _columns(self, tokens: list[str]) -> np.ndarray:
+        """토큰별로 각 행에서 더할 열 위치 (깊이 x 토큰 수)."""
+        hash_pairs = np.array([_token_hash_pair(token) for token in tokens], dtype=np.uint64).reshape(-1, 2)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((hash_pairs[:, 0] + rows * hash_pairs[:, 1]) % np.uint64(self.width)).astype(np.intp) # uint64 덧셈은 2^64에서 순환
+
+    def add(self, tokens: list[str], counts) -> np.ndarray:
+        """
+        토큰들의 빈도를 더하고, 더한 뒤의 토큰별 추정 빈도를 반환합니다.
+        Args:
+            tokens (list[str]): 중복 없는 토큰 목록.
+            counts: 토큰별로 더할 빈도.
+        """
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        columns = self._columns(tokens)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts) # 같은 배치 안에서 열이 겹쳐도 모두 더해짐
+        self.total += int(counts.sum())
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def estimate(self, tokens: list[str]) -> np.ndarray:
+        """토큰별 추정 빈도 (실제 빈도 이상, 확률 1 - delta로 실제 빈도 + error_bound() 이하)."""
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(tokens)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def error_bound(self) -> int:
+        """추정 빈도의 최대 과대 추정량 (확률 1 - delta로 보장)."""
+        return math.ceil(self.epsilon * self.total)
+
+
+class HeavyHitters:
+    """
+    Count-Min Sketch와 추정 빈도 상위 후보 목록으로 스트림의 상위 키워드를 찾습니다.
+    후보는 최대 capacity x HEAVY_HITTER_PRUNE_FACTOR개만 보관하므로 메모리 사용량이 일정합니다.
+    후보의 추정 빈도는 마지막으로 나온 시점의 값이지만, 그 뒤로 실제 빈도는 변하지 않으므로 여전히 실제 빈도 이상입니다.
+    """
+
+    def __init__(self, capacity: int, epsilon: float = DEFAULT_SKETCH_EPSILON, delta: float = DEFAULT_SKETCH_DELTA):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(epsilon, delta)
+        self.candidates = {} # 토큰 -> 추정 빈도
+
+    def update(self, token_counts: dict):
+        """한 배치의 {토큰: 빈도}를 더하고 후보 목록을 갱신합니다."""
+        if not token_counts:
+            return
+        tokens = list(token_counts)
+        estimates = self.sketch.add(tokens, list(token_counts.values()))
+        threshold = self._candidate_threshold()
+        for token, estimate in zip(tokens, estimates.tolist()):
+            if estimate >= threshold or token in self.candidates:
+                self.candidates[token] = estimate
+        if len(self.candidates) > self.capacity * HEAVY_HITTER_PRUNE_FACTOR:
+            self.candidates = dict(self.top(self.capacity))
+
+    def _candidate_threshold(self) -> int:
+        """후보 목록이 찼으면 상위 capacity번째 추정 빈도, 아니면 0."""
+        if len(self.candidates) < self.capacity:
+            return 0
+        estimates = np.fromiter(self.candidates.values(), dtype=np.int64, count=len(self.candidates))
+        return int(np.partition(estimates, len(estimates) - self.capacity)[len(estimates) - self.capacity])
+
+    def top(self, k: int = None) -> list[tuple[str, int]]:
+        """추정 빈도 상위 k개(None이면 capacity개) 후보 [(토큰, 추정 빈도)] (높은 순)."""
+        return sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)[:self.capacity if k is None else k]
+
+    def error_bound(self) -> int:
+        return self.sketch.error_bound()
@@ -2,13 +2,176 @@
 
 import requests
 from bs4 import BeautifulSoup
-import time
-from datetime import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from urllib.parse import urlparse
 
 # Streamlit의 st.error, st.warning 등을 사용하기 위해 임시로 import.
 # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
 import streamlit as st
 
+from modules import rate_limiter # 호스트별 속도 제한 및 재시도
+from modules import database_manager # 증분 크롤링을 위한 커버리지 기록 및 저장된 기사 조회
+from modules import replay_store # 검색 결과 페이지 기록/재생 (오프라인 벤치마크용)
+from modules import url_dedup # 기사 URL 정규화 및 중복 기사 제거
+
+# lxml이 있으면 필요한 노드만 XPath로 찾는 빠른 파싱 경로를 사용
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 검색 결과 HTML 파서 선택: "auto"(lxml 사용 가능 시 lxml), "lxml"(빠른 XPath 경로), "html.parser"(기존 BeautifulSoup 경로)
+HTML_PARSER_MODE = os.getenv("NAVER_HTML_PARSER", "auto")
+
+NAVER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0'
+
+# 동시 크롤링 기본 설정
+DEFAULT_MAX_WORKERS = 8 # 전체 워커 스레드 수
+MAX_CONCURRENT_REQUESTS_PER_HOST = 4 # 같은 호스트로 동시에 보낼 수 있는 최대 요청 수
+
+# 호스트별 동시 요청 수 제한용 세마포어 (호스트, 제한값) -> BoundedSemaphore
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _get_host_semaphore(host: str, limit: int) -> threading.BoundedSemaphore:
+    """호스트별 동시 요청 수를 제한하는 세마포어를 반환합니다. (프로세스 전역에서 공유)"""
+    with _host_semaphores_lock:
+        key = (host, limit)
+        if key not in _host_semaphores:
+            _host_semaphores[key] = threading.BoundedSemaphore(limit)
+        return _host_semaphores[key]
+
+
+def _build_search_url(keyword: str, current_search_date: datetime, page: int) -> str:
+    """네이버 뉴스 검색 결과 페이지 URL을 생성합니다. (page는 0부터 시작)"""
+    formatted_search_date = current_search_date.strftime('%Y.%m.%d')
+    start_num = page * 10 + 1
+    return (
+        f"https://search.naver.com/search.naver?where=news&query={keyword}"
+        f"&sm=tab_opt&sort=0&photo=0&field=0&pd=3"
+        f"&ds={formatted_search_date}"
+        f"&de={formatted_search_date}"
+        f"&start={start_num}"
+    )
+
+
+def _parse_search_results(html: str, current_search_date: datetime, parser_mode: str = None) -> list[dict]:
+    """
+    네이버 뉴스 검색 결과 HTML에서 기사 메타데이터를 추출합니다.
+    기사가 없는 페이지이면 빈 리스트를 반환합니다.
+    parser_mode: "auto", "lxml", "html.parser" 중 하나 (생략 시 HTML_PARSER_MODE 사용)
+    lxml 경로가 실패하거나 lxml이 없으면 기존 BeautifulSoup 경로로 대체합니다.
+    """
+    parser_mode = parser_mode or HTML_PARSER_MODE
+    if parser_mode in ("auto", "lxml") and LXML_AVAILABLE:
+        try:
+            return _parse_search_results_lxml(html, current_search_date)
+        except Exception as e:
+            print(f"경고: lxml 파싱 실패, html.parser로 대체합니다 - {e}")
+    return _parse_search_results_bs4(html, current_search_date)
+
+
+# 클래스 속성에 해당 클래스 토큰이 포함된 요소를 찾는 XPath 조건 (BeautifulSoup의 class_ 검색과 동일)
+_XPATH_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_XPATH_TITLE_SPANS = "//span[" + _XPATH_HAS_CLASS.format("sds-comps-text-type-headline1") + "]"
+_XPATH_SNIPPET_SPAN = ".//span[" + _XPATH_HAS_CLASS.format("sds-comps-text-type-body1") + "][1]"
+# script/style 내부 텍스트는 제외 (BeautifulSoup의 get_text와 동일)
+_XPATH_VISIBLE_TEXT = ".//text()[not(ancestor::script) and not(ancestor::style)]"
+
+
+def _parse_search_results_lxml(html: str, current_search_date: datetime) -> list[dict]:
+    """
+    lxml로 파싱한 뒤 XPath로 제목 span과 그 주변 링크/미리보기 노드만 찾아 추출합니다.
+    추출 규칙과 결과는 _parse_search_results_bs4와 동일합니다.
+    """
+    if not html or not html.strip():
+        return []
+    document = lxml.html.fromstring(html)
+
+    articles_on_this_page = []
+    for title_span in document.xpath(_XPATH_TITLE_SPANS):
+        link_tags = title_span.xpath("ancestor::a[1]")
+        if not link_tags or link_tags[0].get("href") is None:
+            continue
+        link_tag = link_tags[0]
+        title = "".join(title_span.xpath(_XPATH_VISIBLE_TEXT)).strip()
+        link = link_tag.get("href")
+
+        summary_snippet_text = ""
+        next_sibling_a_tags = link_tag.xpath("following-sibling::a[1]")
+        if next_sibling_a_tags:
+            snippet_spans = next_sibling_a_tags[0].xpath(_XPATH_SNIPPET_SPAN)
+            snippet_node = snippet_spans[0] if snippet_spans else next_sibling_a_tags[0]
+            summary_snippet_text = "".join(text.strip() for text in snippet_node.xpath(_XPATH_VISIBLE_TEXT))
+
+        if not (link.startswith('javascript:') or 'ad.naver.com' in link):
+            articles_on_this_page.append({
+                "제목": title,
+                "링크": link,
+                "날짜": current_search_date, # datetime 객체 유지
+                "내용": summary_snippet_text # 빈 문자열이면 "" (None 방지)
+            })
+    return articles_on_this_page
+
+
+def _parse_search_results_bs4(html: str, current_search_date: datetime) -> list[dict]:
+    """BeautifulSoup(html.parser)로 전체 페이지를 파싱하여 기사 메타데이터를 추출합니다. (기존 경로)"""
+    soup = BeautifulSoup(html, "html.parser")
+    title_spans = soup.find_all("span", class_="sds-comps-text-type-headline1")
+
+    articles_on_this_page = []
+    for title_span in title_spans:
+        link_tag = title_span.find_parent('a')
+
+        if link_tag and 'href' in link_tag.attrs:
+            title = title_span.text.strip()
+            link = link_tag['href']
+
+            summary_snippet_text = ""
+            next_sibling_a_tag = link_tag.find_next_sibling('a')
+            if next_sibling_a_tag:
+                snippet_span = next_sibling_a_tag.find('span', class_='sds-comps-text-type-body1')
+                if snippet_span:
+                    summary_snippet_text = snippet_span.get_text(strip=True)
+                else:
+                    summary_snippet_text = next_sibling_a_tag.get_text(strip=True)
+
+            if not (link.startswith('javascript:') or 'ad.naver.com' in link):
+                articles_on_this_page.append({
+                    "제목": title,
+                    "링크": link,
+                    "날짜": current_search_date, # datetime 객체 유지
+                    "내용": summary_snippet_text if summary_snippet_text else "" # None 방지
+                })
+    return articles_on_this_page
+
+
+def _fetch_search_page(keyword: str, current_search_date: datetime, page: int) -> list[dict]:
+    """
+    검색 결과 한 페이지를 요청하고 파싱합니다.
+    일시적인 오류(네트워크, 429, 5xx)는 rate_limiter가 백오프 후 재시도하며,
+    재시도 후에도 남은 요청/파싱 오류는 호출자가 처리하도록 그대로 전파합니다. (워커 스레드에서 st 호출 방지)
+    replay_store가 재생 모드이면 네트워크 대신 기록된 페이지를 사용합니다.
+    """
+    search_url = _build_search_url(keyword, current_search_date, page)
+    html = replay_store.fetch_page(search_url, _request_search_page)
+    return _parse_search_results(html, current_search_date)
+
+
+def _request_search_page(search_url: str) -> str:
+    """검색 결과 페이지를 실제로 요청하여 HTML을 반환합니다."""
+    headers = {'User-Agent': NAVER_USER_AGENT}
+    response = rate_limiter.request_with_backoff("GET", search_url, headers=headers)
+    response.raise_for_status()
+    return response.text
+
+
 def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_naver_search_pages_per_day: int):
     """
     지정된 키워드와 날짜로 네이버 뉴스 메타데이터를 크롤링합니다.
@@ -23,58 +186,14 @@ def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_n
     formatted_search_date = current_search_date.strftime('%Y.%m.%d')
 
     for page in range(max_naver_search_pages_per_day):
-        start_num = page * 10 + 1
-        search_url = (
-            f"https://search.naver.com/search.naver?where=news&query={keyword}"
-            f"&sm=tab_opt&sort=0&photo=0&field=0&pd=3"
-            f"&ds={formatted_search_date}"
-            f"&de={formatted_search_date}"
-            f"&start={start_num}"
-        )
-
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0'}
-            response = requests.get(search_url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            articles_on_this_page = _fetch_search_page(keyword, current_search_date, page)
 
-            title_spans = soup.find_all("span", class_="sds-comps-text-type-headline1")
-
-            if not title_spans:
-                # 해당 페이지에 기사가 없으면 다음 페이지 크롤링 중단
+            # 현재 페이지에 기사가 없으면 다음 페이지 크롤링 중단
+            if not articles_on_this_page:
                 break
-            else:
-                articles_on_this_page_count = 0
-                for title_span in title_spans:
-                    link_tag = title_span.find_parent('a')
-
-                    if link_tag and 'href' in link_tag.attrs:
-                        title = title_span.text.strip()
-                        link = link_tag['href']
-
-                        summary_snippet_text = ""
-                        next_sibling_a_tag = link_tag.find_next_sibling('a')
-                        if next_sibling_a_tag:
-                            snippet_span = next_sibling_a_tag.find('span', class_='sds-comps-text-type-body1')
-                            if snippet_span:
-                                summary_snippet_text = snippet_span.get_text(strip=True)
-                            else:
-                                summary_snippet_text = next_sibling_a_tag.get_text(strip=True)
-
-                        if not (link.startswith('javascript:') or 'ad.naver.com' in link):
-                            articles_on_this_day.append({
-                                "제목": title,
-                                "링크": link,
-                                "날짜": current_search_date, # datetime 객체 유지
-                                "내용": summary_snippet_text if summary_snippet_text else "" # None 방지
-                            })
-                            articles_on_this_page_count += 1
-                
-                # 현재 페이지에 기사가 없으면 다음 페이지 크롤링 중단
-                if articles_on_this_page_count == 0:
-                    break
-
-            time.sleep(0.5) # 서버 부하를 줄이기 위한 딜레이
+            articles_on_this_day.extend(articles_on_this_page)
+            # 요청 간격은 rate_limiter의 호스트별 토큰 버킷이 조절
 
         except requests.exceptions.RequestException as e:
             st.error(f"웹 페이지 요청 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
@@ -83,3 +202,440 @@ def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_n
             st.error(f"스크립트 실행 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
             break # 오류 발생 시 해당 날짜의 크롤링 중단
     return articles_on_this_day
+
+
+def _iter_crawled_pages(keyword: str, search_dates: list[datetime], max_naver_search_pages_per_day: int,
+                        max_workers: int, max_requests_per_host: int, progress_callback=None,
+                        prefetched_pages: dict = None, on_page_done=None, should_cancel=None, failed_day_indices: set = None):
+    """키워드 하나의 날짜 목록을 크롤링합니다. (_iter_crawled_day_pages 참고, 날짜 인덱스는 search_dates의 인덱스)"""
+    day_specs = [(keyword, search_date, max_naver_search_pages_per_day) for search_date in search_dates]
+    yield from _iter_crawled_day_pages(
+        day_specs, max_workers, max_requests_per_host, progress_callback,
+        prefetched_pages=prefetched_pages, on_page_done=on_page_done, should_cancel=should_cancel,
+        failed_day_indices=failed_day_indices
+    )
+
+
+def _iter_crawled_day_pages(day_specs: list[tuple[str, datetime, int]], max_workers: int, max_requests_per_host: int,
+                            progress_callback=None, prefetched_pages: dict = None, on_page_done=None, should_cancel=None,
+                            failed_day_indices: set = None):
+    """
+    (키워드, 날짜, 최대 페이지 수) 목록의 (날짜, 페이지) 작업을 워커 풀에서 동시에 크롤링하며, 확정된 페이지를 바로 내보내는 제너레이터입니다.
+    여러 키워드의 작업을 한 워커 풀에서 처리하므로, 모든 요청이 같은 호스트별 동시 요청 제한과 속도 제한을 공유합니다.
+    작업은 페이지 번호 순으로(모든 날짜의 첫 페이지부터) 제출하여 여러 날짜/키워드의 요청이 고르게 섞이도록 합니다.
+    (날짜 인덱스, 페이지, 기사 목록)을 날짜별 페이지 순서대로 yield하며, 날짜끼리는 먼저 확정된 순서로 섞여 나옵니다.
+    순차 크롤링과 같은 규칙으로 날짜별로 빈 페이지나 실패한 페이지를 만나면 그 이후 페이지는 버립니다.
+    소비하는 쪽이 기사를 처리하는 동안에도 워커는 다음 페이지를 계속 요청합니다.
+
+    prefetched_pages: {(날짜 인덱스, 페이지): 기사 목록} 이미 수집된 페이지는 요청하지 않고 이 결과를 사용
+    on_page_done: 페이지 요청이 성공할 때마다 (날짜 인덱스, 페이지, 기사 목록)으로 호출 (호출 스레드에서 실행)
+    should_cancel: 페이지가 끝날 때마다 확인하며, True를 반환하면 남은 작업을 취소
+    failed_day_indices: 주어지면 요청 실패 또는 취소로 수집이 끊긴 날짜 인덱스를 여기에 추가
+    """
+    if failed_day_indices is None:
+        failed_day_indices = set()
+    if not day_specs:
+        return
+
+    all_tasks = [
+        (day_index, page)
+        for page in range(max(max_pages for _, _, max_pages in day_specs))
+        for day_index, (_, _, max_pages) in enumerate(day_specs) if page < max_pages
+    ]
+    # (날짜 인덱스, 페이지) -> 기사 목록. 실패한 페이지는 None
+    page_results = dict(prefetched_pages or {})
+    tasks = [task for task in all_tasks if task not in page_results]
+    next_page_by_day = [0] * len(day_specs) # 날짜별로 아직 내보내지 않은 첫 페이지
+    closed_days = set() # 더 내보낼 페이지가 없는 날짜
+
+    def _release_pages(day_index: int):
+        """해당 날짜에서 앞 페이지가 모두 확정된 페이지를 순서대로 내보냅니다."""
+        while day_index not in closed_days and (day_index, next_page_by_day[day_index]) in page_results:
+            page = next_page_by_day[day_index]
+            articles_on_this_page = page_results[(day_index, page)]
+            if articles_on_this_page is None:
+                failed_day_indices.add(day_index)
+                closed_days.add(day_index)
+                break
+            if not articles_on_this_page:
+                closed_days.add(day_index)
+                break
+            yield day_index, page, articles_on_this_page
+            next_page_by_day[day_index] = page + 1
+            if next_page_by_day[day_index] >= day_specs[day_index][2]:
+                closed_days.add(day_index)
+
+    first_keyword, first_date, _ = day_specs[0]
+    host_semaphore = _get_host_semaphore(urlparse(_build_search_url(first_keyword, first_date, 0)).netloc, max_requests_per_host)
+
+    def _worker(day_index: int, page: int) -> list[dict]:
+        keyword, search_date, _ = day_specs[day_index]
+        with host_semaphore:
+            return _fetch_search_page(keyword, search_date, page)
+
+    completed_count = len(all_tasks) - len(tasks)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            future_to_task = {executor.submit(_worker, day_index, page): (day_index, page) for day_index, page in tasks}
+
+            # 체크포인트 등으로 이미 확보된 페이지는 요청을 보내 둔 뒤 먼저 내보냄
+            for day_index in range(len(day_specs)):
+                yield from _release_pages(day_index)
+
+            for future in as_completed(future_to_task):
+                day_index, page = future_to_task[future]
+                search_date = day_specs[day_index][1]
+                formatted_search_date = search_date.strftime('%Y.%m.%d')
+                try:
+                    page_results[(day_index, page)] = future.result()
+                    if on_page_done:
+                        on_page_done(day_index, page, page_results[(day_index, page)])
+                except requests.exceptions.RequestException as e:
+                    st.error(f"웹 페이지 요청 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+                    page_results[(day_index, page)] = None
+                except Exception as e:
+                    st.error(f"스크립트 실행 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+                    page_results[(day_index, page)] = None
+
+                completed_count += 1
+                if progress_callback:
+                    progress_callback(completed_count, len(all_tasks), search_date)
+
+                yield from _release_pages(day_index)
+
+                if should_cancel and should_cancel():
+                    break
+        finally:
+            # 취소되었거나 소비하는 쪽이 중간에 멈추면 아직 시작하지 않은 작업은 취소하고, 진행 중인 요청만 마무리
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # 취소로 끝까지 확정되지 못한 날짜는 수집이 끊긴 것으로 처리
+    for day_index in range(len(day_specs)):
+        if day_index not in closed_days:
+            failed_day_indices.add(day_index)
+
+
+def _crawl_dates_concurrently(keyword: str, search_dates: list[datetime], max_naver_search_pages_per_day: int,
+                             max_workers: int, max_requests_per_host: int, progress_callback=None,
+                             prefetched_pages: dict = None, on_page_done=None, should_cancel=None) -> tuple[list[list[dict]], set[int]]:
+    """
+    _iter_crawled_pages의 결과를 모두 모아 날짜별로 정렬합니다. (인자는 _iter_crawled_pages와 동일)
+    반환 값: (날짜별 기사 목록 리스트, 요청 실패 또는 취소로 수집이 끊긴 날짜 인덱스 집합)
+    """
+    failed_day_indices = set()
+    articles_by_day = [[] for _ in search_dates]
+    for day_index, _, articles_on_this_page in _iter_crawled_pages(
+        keyword, search_dates, max_naver_search_pages_per_day, max_workers, max_requests_per_host, progress_callback,
+        prefetched_pages=prefetched_pages, on_page_done=on_page_done, should_cancel=should_cancel,
+        failed_day_indices=failed_day_indices
+    ):
+        articles_by_day[day_index].extend(articles_on_this_page)
+    return articles_by_day, failed_day_indices
+
+
+def crawl_naver_news_range(keyword: str, search_start_date: datetime, total_search_days: int, max_naver_search_pages_per_day: int,
+                           max_workers: int = DEFAULT_MAX_WORKERS, max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                           progress_callback=None) -> list[dict]:
+    """
+    여러 날짜의 네이버 뉴스 메타데이터를 동시에 크롤링합니다.
+    (날짜, 페이지) 단위 작업을 제한된 워커 풀에서 병렬로 요청하며,
+    같은 호스트로 향하는 동시 요청 수는 max_requests_per_host 이하로 유지합니다.
+
+    Args:
+        keyword (str): 검색할 키워드.
+        search_start_date (datetime): 검색 시작 날짜.
+        total_search_days (int): 시작 날짜부터 검색할 일수.
+        max_naver_search_pages_per_day (int): 날짜별로 크롤링할 최대 페이지 수.
+        max_workers (int): 워커 스레드 수.
+        max_requests_per_host (int): 호스트별 최대 동시 요청 수.
+        progress_callback (callable, optional): 페이지 하나가 끝날 때마다
+            (완료 페이지 수, 전체 페이지 수, 해당 날짜)로 호출됩니다. 호출 스레드에서 실행됩니다.
+    Returns:
+        list[dict]: 날짜 → 페이지 → 페이지 내 순서로 정렬된 기사 메타데이터 목록.
+                    실행 순서와 관계없이 항상 같은 순서로 반환합니다.
+    """
+    search_dates = [search_start_date + timedelta(days=i) for i in range(total_search_days)]
+    articles_by_day, _ = _crawl_dates_concurrently(
+        keyword, search_dates, max_naver_search_pages_per_day, max_workers, max_requests_per_host, progress_callback
+    )
+    return [article for articles_on_this_day in articles_by_day for article in articles_on_this_day]
+
+
+def stream_naver_news_range(keyword: str, search_start_date: datetime, total_search_days: int, max_naver_search_pages_per_day: int,
+                            max_workers: int = DEFAULT_MAX_WORKERS, max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                            progress_callback=None):
+    """
+    crawl_naver_news_range의 스트리밍 버전입니다. 페이지가 파싱되는 대로 기사를 하나씩 yield하므로
+    소비하는 쪽에서 DB 저장, 키워드 추출 등을 크롤링과 겹쳐 실행할 수 있습니다.
+    같은 날짜의 기사는 페이지 순서대로 나오지만, 날짜끼리는 먼저 수집된 순서로 섞여 나옵니다.
+    반복을 중간에 멈추면 아직 보내지 않은 요청은 취소됩니다.
+    """
+    search_dates = [search_start_date + timedelta(days=i) for i in range(total_search_days)]
+    for _, _, articles_on_this_page in _iter_crawled_pages(
+        keyword, search_dates, max_naver_search_pages_per_day, max_workers, max_requests_per_host, progress_callback
+    ):
+        yield from articles_on_this_page
+
+
+def crawl_naver_news_incremental(keyword: str, search_start_date: datetime, total_search_days: int, max_naver_search_pages_per_day: int,
+                                 max_workers: int = DEFAULT_MAX_WORKERS, max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                                 progress_callback=None, job_id: int = None, dedup_stats: dict = None) -> list[dict]:
+    """
+    크롤링 커버리지 기록을 확인하여 누락되었거나 오래된 날짜(예: 오늘, 어제)만 크롤링하고,
+    나머지 날짜는 데이터베이스에 저장된 기사로 채워 반환합니다.
+    새로 수집한 기사는 페이지가 끝날 때마다 검색 키워드와 함께 DB에 저장하고 (날짜, 페이지) 체크포인트를 남기며,
+    오류 없이 끝난 날짜는 커버리지에 기록합니다.
+
+    같은 조건의 작업이 중단된 채 남아 있으면(브라우저 새로고침, Streamlit 재실행, 예외 등)
+    그 작업을 이어서 실행하여 체크포인트가 있는 페이지는 다시 요청하지 않습니다.
+
+    Args: crawl_naver_news_range와 동일하며, job_id를 주면 해당 크롤링 작업을 이어서 실행합니다.
+          dedup_stats(dict)를 주면 중복 제거 통계를 채웁니다. (stream_naver_news_incremental 참고)
+    Returns: 날짜 순서로 정렬된 기사 메타데이터 목록. (작업이 취소되면 그때까지 수집한 기사만 반환)
+    """
+    date_strs = [(search_start_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(total_search_days)]
+    date_order = {date_str: i for i, date_str in enumerate(date_strs)}
+    articles = stream_naver_news_incremental(
+        keyword, search_start_date, total_search_days, max_naver_search_pages_per_day,
+        max_workers=max_workers, max_requests_per_host=max_requests_per_host,
+        progress_callback=progress_callback, job_id=job_id, dedup_stats=dedup_stats
+    )
+    # 같은 날짜 안에서는 페이지 순서가 유지되므로 날짜 기준 안정 정렬만 하면 됨
+    return sorted(articles, key=lambda article: date_order[article["날짜"].strftime('%Y-%m-%d')])
+
+
+def stream_naver_news_incremental(keyword: str, search_start_date: datetime, total_search_days: int, max_naver_search_pages_per_day: int,
+                                  max_workers: int = DEFAULT_MAX_WORKERS, max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                                  progress_callback=None, job_id: int = None, dedup_stats: dict = None):
+    """
+    crawl_naver_news_incremental의 스트리밍 버전입니다.
+    새로 크롤링하는 날짜의 기사는 페이지가 파싱되어 DB에 저장되는 대로 yield하고,
+    크롤링이 끝나면 DB에 저장되어 있던 기사(크롤링하지 않은 날짜 및 이전 실행에서 저장된 기사)를 이어서 yield합니다.
+    같은 날짜의 기사는 페이지 순서대로 나오지만, 날짜끼리는 먼저 수집된 순서로 섞여 나옵니다.
+    반복을 중간에 멈추면 남은 요청은 취소되고, 작업은 '실행 중'으로 남아 다음 실행에서 이어집니다.
+
+    기사 링크는 원본 그대로 두고 정규 URL로 중복을 판정하며, 이번 실행에서 이미 나온 기사와 DB에 이미 저장된 기사는
+    파싱 직후 걸러내어 다시 저장하지 않습니다. (url_dedup 참고)
+    dedup_stats(dict)를 주면 반복이 끝난 뒤 중복 제거 통계(kept, in_run_duplicates, stored_duplicates, dropped)를 채웁니다.
+    """
+    search_dates = [search_start_date + timedelta(days=i) for i in range(total_search_days)]
+    if not search_dates:
+        return
+    date_strs = [d.strftime('%Y-%m-%d') for d in search_dates]
+
+    if job_id is None:
+        running_job = database_manager.find_running_crawl_job(keyword, date_strs[0], total_search_days, max_naver_search_pages_per_day)
+        if running_job:
+            job_id = running_job["id"]
+            print(f"DEBUG: 중단된 크롤링 작업 #{job_id}을(를) 이어서 실행합니다.")
+        else:
+            job_id = database_manager.create_crawl_job(keyword, date_strs[0], total_search_days, max_naver_search_pages_per_day)
+    checkpoints = database_manager.get_crawl_checkpoints(job_id) if job_id else {}
+
+    coverage = database_manager.get_crawl_coverage(keyword, date_strs[0], date_strs[-1])
+    dates_to_crawl = [
+        d for d, date_str in zip(search_dates, date_strs)
+        if not database_manager.is_crawl_coverage_fresh(coverage.get(date_str), date_str, max_naver_search_pages_per_day)
+    ]
+    print(f"DEBUG: 증분 크롤링 - 키워드 '{keyword}', 전체 {len(search_dates)}일 중 {len(dates_to_crawl)}일 크롤링, "
+          f"{len(search_dates) - len(dates_to_crawl)}일은 저장된 기사 사용, 체크포인트 {len(checkpoints)}페이지 재사용")
+
+    # 체크포인트가 있는 페이지는 요청하지 않고 저장된 결과를 사용
+    prefetched_pages = {}
+    for day_index, crawl_date in enumerate(dates_to_crawl):
+        date_str = crawl_date.strftime('%Y-%m-%d')
+        for page in range(max_naver_search_pages_per_day):
+            if (date_str, page) in checkpoints:
+                prefetched_pages[(day_index, page)] = [{**article, "날짜": crawl_date} for article in checkpoints[(date_str, page)]]
+
+    def save_checkpoint(day_index: int, page: int, articles_on_this_page: list[dict]):
+        # 체크포인트에는 중복 제거 전의 페이지 결과를 남겨야 재개 시 빈 페이지 판정이 같아짐
+        if job_id:
+            date_str = dates_to_crawl[day_index].strftime('%Y-%m-%d')
+            database_manager.save_crawl_checkpoint(job_id, date_str, page, [{**article, "날짜": date_str} for article in articles_on_this_page])
+
+    def is_cancelled() -> bool:
+        job = database_manager.get_crawl_job(job_id)
+        return job is None or job["status"] == "cancelled"
+
+    deduplicator = url_dedup.ArticleDeduplicator(keyword)
+    yielded_links = set()
+    if dates_to_crawl:
+        failed_day_indices = set()
+        for day_index, _, articles_on_this_page in _iter_crawled_pages(
+            keyword, dates_to_crawl, max_naver_search_pages_per_day, max_workers, max_requests_per_host, progress_callback,
+            prefetched_pages=prefetched_pages, on_page_done=save_checkpoint, should_cancel=is_cancelled if job_id else None,
+            failed_day_indices=failed_day_indices
+        ):
+            new_articles = deduplicator.filter_new(articles_on_this_page)
+            date_str = dates_to_crawl[day_index].strftime('%Y-%m-%d')
+            database_manager.insert_articles([{**article, "날짜": date_str} for article in new_articles], search_keyword=keyword)
+            deduplicator.mark_stored(new_articles)
+            for article in new_articles:
+                yielded_links.add(url_dedup.canonicalize_url(article["링크"]))
+                yield article
+        completed_date_strs = [
+            crawl_date.strftime('%Y-%m-%d') for day_index, crawl_date in enumerate(dates_to_crawl)
+            if day_index not in failed_day_indices
+        ]
+        database_manager.record_crawl_coverage(keyword, completed_date_strs, max_naver_search_pages_per_day)
+
+    # 실패한 날짜는 커버리지에 기록되지 않으므로 다음 실행에서 다시 크롤링됨
+    if job_id and not is_cancelled():
+        database_manager.update_crawl_job_status(job_id, "completed")
+
+    stats = deduplicator.stats()
+    print(f"DEBUG: 중복 제거 - 키워드 '{keyword}', 새 기사 {stats['kept']}건, 중복 {stats['dropped']}건 제외 "
+          f"(이번 실행 내 {stats['in_run_duplicates']}건, 이미 저장된 기사 {stats['stored_duplicates']}건)")
+    if dedup_stats is not None:
+        dedup_stats.update(stats)
+
+    # 크롤링하지 않은 날짜와, 이미 저장되어 있어 걸러낸 기사는 DB에서 채움
+    yield from _iter_stored_articles(keyword, date_strs, yielded_links)
+
+
+def _iter_stored_articles(keyword: str, date_strs: list[str], exclude_links: set):
+    """
+    검색 키워드로 DB에 저장된 해당 날짜들의 기사를 yield합니다.
+    정규 URL 기준으로 exclude_links(정규 URL 집합)에 있거나 이미 내보낸 기사는 건너뜁니다.
+    """
+    exclude_links = set(exclude_links)
+    for title, link, date_str, content in database_manager.get_articles_by_keyword_and_dates(keyword, date_strs):
+        canonical_link = url_dedup.canonicalize_url(link)
+        if canonical_link in exclude_links:
+            continue
+        exclude_links.add(canonical_link)
+        yield {
+            "제목": title,
+            "링크": link,
+            "날짜": datetime.strptime(date_str, '%Y-%m-%d'),
+            "내용": content if content else ""
+        }
+
+
+def crawl_naver_news_batch(crawl_requests: list[dict], max_workers: int = DEFAULT_MAX_WORKERS,
+                           max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST, progress_callback=None,
+                           dedup_stats: dict = None) -> list[list[dict]]:
+    """
+    여러 키워드의 크롤링 요청을 한 번에 처리합니다. (예: 여러 검색 프로필을 아침에 한꺼번에 수집)
+    - 같은 키워드의 요청끼리 겹치는 날짜는 한 번만 크롤링하며, 페이지 수는 가장 큰 값을 사용합니다.
+    - 커버리지 기록상 이미 수집이 끝난 날짜는 크롤링하지 않고 DB에 저장된 기사를 사용합니다.
+    - 모든 키워드의 (날짜, 페이지) 작업을 하나의 워커 풀에 키워드별로 번갈아 넣으므로,
+      전체 요청이 같은 호스트별 동시 요청 제한과 속도 제한(rate_limiter)을 공유합니다.
+    - 새로 수집한 기사는 페이지마다 해당 검색 키워드와 함께 저장하므로,
+      여러 키워드에서 같은 기사가 검색되면 그 기사에는 모든 키워드가 기록됩니다.
+    - 기사 링크는 원본 그대로 두고 정규 URL로 중복을 판정하며, 키워드별로 이번 실행에서 이미 나온 기사와 DB에 이미 저장된 기사는 다시 저장하지 않습니다.
+    체크포인트를 남기는 크롤링 작업(crawl_jobs)은 만들지 않으며, 오류 없이 끝난 날짜만 커버리지에 기록합니다.
+
+    Args:
+        crawl_requests (list[dict]): 크롤링 요청 목록. 각 요청은
+            {"keyword", "search_start_date"(datetime), "total_search_days", "max_naver_search_pages_per_day"}.
+        max_workers (int): 워커 스레드 수.
+        max_requests_per_host (int): 호스트별 최대 동시 요청 수.
+        progress_callback (callable, optional): (완료 페이지 수, 전체 페이지 수, 해당 날짜)로 호출됩니다.
+        dedup_stats (dict, optional): 주어지면 {키워드: 중복 제거 통계}를 채웁니다.
+    Returns:
+        list[list[dict]]: 요청 순서대로, 각 요청 기간의 기사를 날짜 순서로 정렬한 목록.
+    """
+    # 키워드 -> {날짜 문자열: 최대 페이지 수} (겹치는 요청 통합)
+    pages_by_keyword = {}
+    for crawl_request in crawl_requests:
+        pages_by_date = pages_by_keyword.setdefault(crawl_request["keyword"], {})
+        for i in range(crawl_request["total_search_days"]):
+            date_str = (crawl_request["search_start_date"] + timedelta(days=i)).strftime('%Y-%m-%d')
+            pages_by_date[date_str] = max(pages_by_date.get(date_str, 0), crawl_request["max_naver_search_pages_per_day"])
+
+    day_specs_by_keyword = []
+    for keyword, pages_by_date in pages_by_keyword.items():
+        date_strs = sorted(pages_by_date)
+        coverage = database_manager.get_crawl_coverage(keyword, date_strs[0], date_strs[-1])
+        day_specs_by_keyword.append([
+            (keyword, datetime.strptime(date_str, '%Y-%m-%d'), pages_by_date[date_str]) for date_str in date_strs
+            if not database_manager.is_crawl_coverage_fresh(coverage.get(date_str), date_str, pages_by_date[date_str])
+        ])
+    # 키워드별 날짜를 번갈아 배치하여 한 키워드의 요청이 앞쪽에 몰리지 않도록 함
+    day_specs = [day_spec for day_specs_at_i in zip_longest(*day_specs_by_keyword) for day_spec in day_specs_at_i if day_spec]
+    print(f"DEBUG: 일괄 크롤링 - 요청 {len(crawl_requests)}개, 키워드 {len(pages_by_keyword)}개, "
+          f"{sum(len(pages_by_date) for pages_by_date in pages_by_keyword.values())}일 중 {len(day_specs)}일 크롤링")
+
+    # (키워드, 날짜 문자열) -> 기사 목록
+    articles_by_keyword_date = {}
+    deduplicators = {keyword: url_dedup.ArticleDeduplicator(keyword) for keyword in pages_by_keyword}
+    yielded_links_by_keyword = {keyword: set() for keyword in pages_by_keyword}
+    failed_day_indices = set()
+    for day_index, _, articles_on_this_page in _iter_crawled_day_pages(
+        day_specs, max_workers, max_requests_per_host, progress_callback, failed_day_indices=failed_day_indices
+    ):
+        keyword, crawl_date, _ = day_specs[day_index]
+        date_str = crawl_date.strftime('%Y-%m-%d')
+        new_articles = deduplicators[keyword].filter_new(articles_on_this_page)
+        database_manager.insert_articles([{**article, "날짜": date_str} for article in new_articles], search_keyword=keyword)
+        deduplicators[keyword].mark_stored(new_articles)
+        yielded_links_by_keyword[keyword].update(url_dedup.canonicalize_url(article["링크"]) for article in new_articles)
+        articles_by_keyword_date.setdefault((keyword, date_str), []).extend(new_articles)
+
+    # 오류 없이 끝난 날짜를 (키워드, 페이지 수)별로 모아 커버리지에 기록
+    completed_date_strs = {}
+    for day_index, (keyword, crawl_date, max_pages) in enumerate(day_specs):
+        if day_index not in failed_day_indices:
+            completed_date_strs.setdefault((keyword, max_pages), []).append(crawl_date.strftime('%Y-%m-%d'))
+    for (keyword, max_pages), date_strs in completed_date_strs.items():
+        database_manager.record_crawl_coverage(keyword, date_strs, max_pages)
+
+    for keyword, deduplicator in deduplicators.items():
+        stats = deduplicator.stats()
+        print(f"DEBUG: 중복 제거 - 키워드 '{keyword}', 새 기사 {stats['kept']}건, 중복 {stats['dropped']}건 제외")
+        if dedup_stats is not None:
+            dedup_stats[keyword] = stats
+
+    # 크롤링하지 않은 날짜와, 이미 저장되어 있어 걸러낸 기사는 DB에서 채움
+    for keyword, pages_by_date in pages_by_keyword.items():
+        for article in _iter_stored_articles(keyword, sorted(pages_by_date), yielded_links_by_keyword[keyword]):
+            articles_by_keyword_date.setdefault((keyword, article["날짜"].strftime('%Y-%m-%d')), []).append(article)
+
+    results = []
+    for crawl_request in crawl_requests:
+        date_strs = [
+            (crawl_request["search_start_date"] + timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range(crawl_request["total_search_days"])
+        ]
+        results.append([
+            article for date_str in date_strs
+            for article in articles_by_keyword_date.get((crawl_request["keyword"], date_str), [])
+        ])
+    return results
+
+
+# --- 크롤링 작업 관리 API ---
+def list_crawl_jobs(status: str = "running") -> list[dict]:
+    """
+    크롤링 작업 목록을 반환합니다. 기본값은 실행 중이거나 중단된('running') 작업입니다.
+    status=None이면 모든 작업을 반환합니다. 각 작업에는 완료된 체크포인트 페이지 수(pages_done)가 포함됩니다.
+    """
+    jobs = database_manager.get_crawl_jobs(status)
+    for job in jobs:
+        job["pages_done"] = len(database_manager.get_crawl_checkpoints(job["id"])) if job["status"] == "running" else 0
+    return jobs
+
+
+def resume_crawl_job(job_id: int, progress_callback=None, max_workers: int = DEFAULT_MAX_WORKERS,
+                     max_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST) -> list[dict]:
+    """중단된 크롤링 작업을 마지막 체크포인트부터 이어서 실행하고, 수집된 기사 목록을 반환합니다."""
+    job = database_manager.get_crawl_job(job_id)
+    if not job or job["status"] != "running":
+        return []
+    return crawl_naver_news_incremental(
+        job["keyword"],
+        datetime.strptime(job["start_date"], '%Y-%m-%d'),
+        job["total_days"],
+        job["max_pages"],
+        max_workers=max_workers,
+        max_requests_per_host=max_requests_per_host,
+        progress_callback=progress_callback,
+        job_id=job_id
+    )
+
+
+def cancel_crawl_job(job_id: int) -> bool:
+    """크롤링 작업을 취소합니다. 실행 중인 작업은 다음 페이지가 끝나는 시점에 남은 요청을 중단합니다."""
+    return database_manager.update_crawl_job_status(job_id, "cancelled")
@@ -0,0 +1,150 @@
+# modules/rate_limiter.py
+# 호스트별 토큰 버킷 기반 요청 속도 제한기입니다.
+# 429/5xx 응답을 받으면 요청 속도를 줄이고(Retry-After 헤더 준수), 정상 응답이 이어지면 다시 천천히 늘립니다.
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from modules import http_client # 연결 풀을 공유하는 HTTP 전송 계층
+
+# 재시도 대상 HTTP 상태 코드 (요청 과다 및 일시적인 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 속도 조절 계수
+RATE_DECREASE_FACTOR = 0.5 # 429/5xx 응답 시 현재 속도에 곱하는 값
+RATE_INCREASE_STEP = 0.1 # 정상 응답 시 초당 요청 수에 더하는 값
+
+# 호스트별 속도 제한 설정 (rate: 초당 요청 수, capacity: 버킷 크기)
+DEFAULT_RATE_LIMIT = {"rate": 5.0, "capacity": 5, "min_rate": 0.5, "max_rate": 20.0}
+HOST_RATE_LIMITS = {
+    "search.naver.com": {"rate": 4.0, "capacity": 4, "min_rate": 0.5, "max_rate": 10.0},
+}
+
+# 재시도 기본 설정
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY_SECONDS = 1.0
+DEFAULT_MAX_DELAY_SECONDS = 30.0
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷.
+    초당 rate개의 토큰이 채워지며, 요청 하나당 토큰 하나를 소비합니다.
+    rate는 서버 응답에 따라 min_rate ~ max_rate 범위에서 자동 조절됩니다.
+    """
+
+    def __init__(self, rate: float, capacity: int, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0 # Retry-After 등으로 요청이 금지된 시점 (monotonic)
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """토큰을 하나 얻을 때까지 대기합니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait_seconds)
+
+    def penalize(self, retry_after: float = None):
+        """요청 과다/서버 오류 응답을 받았을 때 속도를 줄이고, Retry-After 동안 요청을 막습니다."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+            self._tokens = min(self._tokens, 1.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def reward(self):
+        """정상 응답을 받았을 때 속도를 조금씩 늘립니다."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE_STEP)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str, default_rate_limit: dict = None) -> TokenBucket:
+    """
+    호스트별 토큰 버킷을 반환합니다. (프로세스 전역에서 공유)
+    HOST_RATE_LIMITS에 없는 호스트는 default_rate_limit(생략 시 DEFAULT_RATE_LIMIT) 설정으로 처음 한 번 생성됩니다.
+    """
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(**HOST_RATE_LIMITS.get(host, default_rate_limit or DEFAULT_RATE_LIMIT))
+        return _buckets[host]
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def compute_backoff_delay(attempt: int, base_delay: float = DEFAULT_BASE_DELAY_SECONDS, max_delay: float = DEFAULT_MAX_DELAY_SECONDS) -> float:
+    """지터가 적용된 지수 백오프 대기 시간을 계산합니다. (full jitter, attempt는 0부터 시작)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def request_with_backoff(method: str, url: str, max_retries: int = DEFAULT_MAX_RETRIES,
+                         base_delay: float = DEFAULT_BASE_DELAY_SECONDS, max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+                         default_rate_limit: dict = None, **kwargs) -> requests.Response:
+    """
+    호스트별 속도 제한을 지키며 HTTP 요청을 보내고, 일시적인 오류는 재시도합니다.
+    - 네트워크 오류/타임아웃, 429, 5xx 응답은 지수 백오프(지터 포함)로 최대 max_retries번 재시도합니다.
+    - 429/5xx 응답 시 해당 호스트의 요청 속도를 줄이고 Retry-After 헤더를 따릅니다.
+    재시도를 모두 소진하면 마지막 응답을 반환하거나(상태 코드 확인은 호출자 몫) 마지막 예외를 전파합니다.
+    default_rate_limit: HOST_RATE_LIMITS에 없는 호스트에 처음 요청할 때 사용할 속도 제한 설정
+    """
+    bucket = get_bucket(urlparse(url).netloc, default_rate_limit)
+
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            response = http_client.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt >= max_retries:
+                raise
+            bucket.penalize()
+            time.sleep(compute_backoff_delay(attempt, base_delay, max_delay))
+            continue
+
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            bucket.reward()
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        bucket.penalize(retry_after)
+        if attempt >= max_retries:
+            return response
+        time.sleep(max(retry_after or 0.0, compute_backoff_delay(attempt, base_delay, max_delay)))
@@ -0,0 +1,99 @@
+# modules/replay_store.py
+# 크롤러가 받아온 검색 결과 페이지를 디스크에 기록하고 다시 재생하는 저장소입니다.
+# 네트워크 없이도 같은 페이지 묶음(코퍼스)으로 크롤러 처리량과 파싱 속도를 반복 측정할 수 있습니다.
+#
+# 모드 (환경 변수 NAVER_REPLAY_MODE 또는 configure()로 설정)
+#   "off"    : 기록/재생하지 않음 (기본값)
+#   "record" : 실제로 요청한 페이지를 저장
+#   "replay" : 네트워크 요청 없이 저장된 페이지만 사용 (없는 페이지는 ReplayMissError)
+
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import requests
+
+REPLAY_MODES = ("off", "record", "replay")
+DEFAULT_REPLAY_DIR = "replay_corpus"
+
+_replay_config = {
+    "mode": os.getenv("NAVER_REPLAY_MODE", "off"),
+    "directory": os.getenv("NAVER_REPLAY_DIR", DEFAULT_REPLAY_DIR),
+}
+
+
+class ReplayMissError(requests.exceptions.RequestException):
+    """재생 모드에서 요청한 URL이 코퍼스에 없을 때 발생합니다. (요청 오류와 같은 방식으로 처리됨)"""
+
+
+def configure(mode: str = None, directory: str = None):
+    """
+    기록/재생 모드와 코퍼스 디렉터리를 변경합니다.
+    Args:
+        mode (str, optional): "off", "record", "replay" 중 하나.
+        directory (str, optional): 페이지를 저장/재생할 디렉터리.
+    """
+    if mode is not None:
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"알 수 없는 재생 모드입니다: {mode} (가능한 값: {', '.join(REPLAY_MODES)})")
+        _replay_config["mode"] = mode
+    if directory is not None:
+        _replay_config["directory"] = directory
+
+
+def get_mode() -> str:
+    return _replay_config["mode"]
+
+
+def is_recording() -> bool:
+    return _replay_config["mode"] == "record"
+
+
+def is_replaying() -> bool:
+    return _replay_config["mode"] == "replay"
+
+
+def page_path(url: str, directory: str = None) -> Path:
+    """URL에 해당하는 코퍼스 파일 경로를 반환합니다. (URL의 SHA-256 해시를 파일명으로 사용)"""
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return Path(directory or _replay_config["directory"]) / f"{url_hash}.html.gz"
+
+
+def save_page(url: str, html: str, directory: str = None):
+    """페이지 HTML을 gzip으로 압축하여 저장합니다. 첫 줄에는 원본 URL을 기록합니다."""
+    path = page_path(url, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        f.write(url + "\n")
+        f.write(html)
+    os.replace(tmp_path, path) # 동시에 같은 URL을 기록해도 깨진 파일이 남지 않도록 원자적으로 교체
+
+
+def load_page(url: str, directory: str = None) -> str | None:
+    """저장된 페이지 HTML을 반환합니다. 코퍼스에 없으면 None을 반환합니다."""
+    path = page_path(url, directory)
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline() # 원본 URL
+        return f.read()
+
+
+def fetch_page(url: str, fetch_live) -> str:
+    """
+    현재 모드에 맞춰 페이지 HTML을 가져옵니다.
+    재생 모드에서는 코퍼스에서 읽고, 그 외에는 fetch_live(url)로 받아오며 기록 모드이면 저장합니다.
+    """
+    if is_replaying():
+        html = load_page(url)
+        if html is None:
+            raise ReplayMissError(f"재생 코퍼스에 없는 페이지입니다: {url}")
+        return html
+
+    html = fetch_live(url)
+    if is_recording():
+        save_page(url, html)
+    return html
@@ -15,6 +15,7 @@ import streamlit.components.v1 as components
 from modules import ai_service
 from modules import database_manager
 from modules import news_crawler
+from modules import article_fetcher
 from modules import trend_analyzer
 from modules import data_exporter
 from modules import email_sender
@@ -22,6 +23,10 @@ from modules import email_sender
 # KST와 UTC의 시차 (한국은 UTC+9)
 KST_OFFSET_HOURS = 9
 
+# 예약 보고서의 트렌드 판정 방식 (trend_analyzer.TREND_DETECTION_MODES 중 하나, 기본값은 TREND_DETECTION_MODE와 같음)
+# "zscore"로 설정하면 평소보다 실제로 급증한 키워드만 AI 선별/요약 단계로 넘겨, 드물게 새로 등장한 단어로 보고서가 채워지지 않도록 함
+REPORT_TREND_DETECTION_MODE = os.getenv("REPORT_TREND_DETECTION_MODE", trend_analyzer.DEFAULT_TREND_DETECTION_MODE)
+
 def report_automation_page():
     """
     보고서 자동 전송 및 예약 기능을 제공하는 페이지입니다.
@@ -33,6 +38,9 @@ def report_automation_page():
         st.error("🚨 오류: .env 파일에 'POTENS_API_KEY'가 설정되지 않았습니다. Potens.dev AI 기능을 사용할 수 없습니다.")
         return # API 키 없으면 페이지 기능 비활성화
 
+    # 예약 작업의 키워드 트렌드 분석에 쓸 형태소 분석기(JVM)를 백그라운드에서 미리 준비
+    trend_analyzer.warm_up_analyzer()
+
     SENDER_EMAIL = os.getenv("SENDER_EMAIL")
     SENDER_PASSWORD = os.getenv("SENDER_PASSWORD")
     SMTP_SERVER = os.getenv("SMTP_SERVER")
@@ -165,32 +173,29 @@ def report_automation_page():
                 try:
                     with st.spinner(f"예약된 작업 실행 중: '{profile_to_run['profile_name']}' 보고서 생성 및 전송..."):
                         # 1. 뉴스 메타데이터 수집
-                        all_collected_news_metadata = []
                         today_date_for_crawl = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
                         search_start_date = today_date_for_crawl - timedelta(days=profile_to_run['total_search_days'] - 1)
 
-                        for i in range(profile_to_run['total_search_days']):
-                            current_search_date = search_start_date + timedelta(days=i)
-                            daily_articles = news_crawler.crawl_naver_news_metadata(
-                                profile_to_run['keyword'],
-                                current_search_date,
-                                profile_to_run['max_naver_search_pages_per_day']
-                            )
-                            for article in daily_articles:
-                                article_data_for_db = {
-                                    "제목": article["제목"],
-                                    "링크": article["링크"],
-                                    "날짜": article["날짜"].strftime('%Y-%m-%d'),
-                                    "내용": article["내용"] # 오타 수정: '내andung' -> '내용'
-                                }
-                                database_manager.insert_article(article_data_for_db)
-                                all_collected_news_metadata.append(article)
+                        # 누락/오래된 날짜만 동시에 크롤링하여 DB에 저장하고, 나머지 날짜는 저장된 기사 사용
+                        # 기사가 파싱되는 대로 받아 묶음 단위로 키워드를 미리 추출하여, 형태소 분석이 네트워크 대기와 겹쳐 실행되도록 함
+                        all_collected_news_metadata = []
+                        for article in trend_analyzer.iter_annotated_articles(news_crawler.stream_naver_news_incremental(
+                            profile_to_run['keyword'],
+                            search_start_date,
+                            profile_to_run['total_search_days'],
+                            profile_to_run['max_naver_search_pages_per_day']
+                        )):
+                            all_collected_news_metadata.append(article)
+                        all_collected_news_metadata.sort(key=lambda article: article["날짜"])
                         
                         # 2. 키워드 트렌드 분석
-                        trending_keywords_data = trend_analyzer.analyze_keyword_trends(
-                            all_collected_news_metadata,
+                        # 새로 수집한 기사의 키워드 빈도만 날짜별 집계에 더한 뒤, 집계 테이블의 기간 합계로 분석
+                        trend_analyzer.record_daily_keyword_counts(profile_to_run['keyword'], all_collected_news_metadata)
+                        trending_keywords_data = trend_analyzer.analyze_keyword_trends_from_counts(
+                            profile_to_run['keyword'],
                             recent_days_period=profile_to_run['recent_trend_days'],
-                            total_days_period=profile_to_run['total_search_days']
+                            total_days_period=profile_to_run['total_search_days'],
+                            detection_mode=REPORT_TREND_DETECTION_MODE
                         )
 
                         relevant_keywords_from_ai_raw = ai_service.get_relevant_keywords(
@@ -204,33 +209,34 @@ def report_automation_page():
                         top_3_relevant_keywords = filtered_trending_keywords[:3]
 
                         # 3. 트렌드 기사 본문 요약
-                        recent_trending_articles_candidates = [
-                            article for article in all_collected_news_metadata
-                            if article.get("날짜") and today_date_for_crawl - timedelta(days=profile_to_run['recent_trend_days']) <= article["날짜"]
-                        ]
-
-                        # 오타 수정: '내andung' -> '내용'
-                        articles_for_ai_summary = []
+                        # 최근 기간 기사 중 선별된 트렌드 키워드를 포함한 기사를 역색인에서 찾음 (포함한 트렌드 키워드가 많은 기사부터)
+                        articles_for_ai_summary = trend_analyzer.find_trend_articles(
+                            profile_to_run['keyword'],
+                            all_collected_news_metadata,
+                            [trend_kw['keyword'] for trend_kw in top_3_relevant_keywords],
+                            since_date=today_date_for_crawl - timedelta(days=profile_to_run['recent_trend_days'])
+                        )
                         processed_links = set()
-                        for article in recent_trending_articles_candidates:
-                            text_for_trend_check = article["제목"] + " " + article.get("내용", "")
-                            article_keywords_for_trend = trend_analyzer.extract_keywords_from_text(text_for_trend_check)
-                            if any(trend_kw['keyword'] in article_keywords_for_trend for trend_kw in top_3_relevant_keywords):
-                                articles_for_ai_summary.append(article)
 
-                        temp_collected_articles = []
+                        # 요약 대상 기사의 원문 본문을 동시에 수집 (캐시된 링크는 다시 요청하지 않음)
+                        article_bodies = {}
+                        if article_fetcher.FETCH_ARTICLE_BODIES:
+                            article_bodies = article_fetcher.fetch_article_bodies([article["링크"] for article in articles_for_ai_summary])
+
+                        articles_to_summarize = []
                         for article in articles_for_ai_summary:
-                            if article["링크"] in processed_links:
-                                continue
-                            article_date_str = article["날짜"].strftime('%Y-%m-%d')
-                            ai_processed_content = ai_service.get_article_summary(
-                                article["제목"], article["링크"], article_date_str, article["내용"], POTENS_API_KEY
-                            )
+                            if article["링크"] not in processed_links:
+                                processed_links.add(article["링크"])
+                                articles_to_summarize.append(article)
+
+                        # 기사 요약을 동시에 요청 (동시 요청 수와 분당 요청 수는 ai_service 설정으로 제한)
+                        ai_processed_contents = ai_service.summarize_articles(articles_to_summarize, POTENS_API_KEY, article_bodies=article_bodies)
+                        temp_collected_articles = []
+                        for article, ai_processed_content in zip(articles_to_summarize, ai_processed_contents):
                             final_content = ai_service.clean_ai_response_text(ai_processed_content)
                             temp_collected_articles.append({
-                                "제목": article["제목"], "링크": article["링크"], "날짜": article_date_str, "내용": final_content
+                                "제목": article["제목"], "링크": article["링크"], "날짜": article["날짜"].strftime('%Y-%m-%d'), "내용": final_content
                             })
-                            processed_links.add(article["링크"])
 
                         # 4. AI가 트렌드 요약 및 보험 상품 개발 인사이트 도출
                         articles_for_ai_insight_generation = temp_collected_articles
@@ -256,7 +262,9 @@ def report_automation_page():
                                     f"- **키워드**: {kw_data['keyword']}\n"
                                     f"  - 최근 언급량: {kw_data['recent_freq']}회\n"
                                     f"  - 이전 언급량: {kw_data['past_freq']}회\n"
-                                    f"  - 증가율: {surge_ratio_display}\n\n"
+                                    f"  - 증가율: {surge_ratio_display}\n"
+                                    + (f"  - 급증 정도(z 점수): {kw_data['burst_zscore']:.2f}\n" if 'burst_zscore' in kw_data else "")
+                                    + "\n"
                                 )
                         else:
                             final_prettified_report += "키워드 산출 근거 데이터가 없습니다.\n\n"
@@ -16,6 +16,7 @@ import altair as alt # Altair 임포트
 from modules import ai_service
 from modules import database_manager
 from modules import news_crawler
+from modules import article_fetcher
 from modules import trend_analyzer
 from modules import data_exporter
 from modules import email_sender
@@ -33,6 +34,13 @@ def trend_analysis_page():
         st.title("📰 뉴스 트렌드 분석기")
         st.markdown("원하는 키워드로 네이버 뉴스 트렌드를 감지하고, AI가 요약한 기사 내용을 확인하세요.")
 
+        # 형태소 분석기(JVM)를 백그라운드에서 미리 준비 (뉴스를 수집하는 동안 준비되어 첫 분석이 기다리지 않도록)
+        trend_analyzer.warm_up_analyzer()
+        analyzer_status = trend_analyzer.get_analyzer_status()
+        if analyzer_status["status"] == trend_analyzer.ANALYZER_FAILED:
+            st.error(f"🚨 Konlpy (Okt) 초기화 실패: {analyzer_status['error']}. 한국어 형태소 분석 없이 키워드를 추출합니다.")
+            st.info("💡 Konlpy를 사용하려면 Java Development Kit (JDK) 1.8 이상이 설치되어 있어야 합니다.")
+
         # --- 네비게이션 ---
         col_home_button, col_endorsement_button, col_trend_button = st.columns([0.2, 0.2, 0.6])
         with col_home_button:
@@ -295,49 +303,38 @@ def trend_analysis_page():
                     st.stop() # 더 이상 진행하지 않음
 
 
-                all_collected_news_metadata = []
-
                 today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
                 search_start_date = today_date - timedelta(days=total_search_days - 1)
 
-                total_expected_articles = total_search_days * max_naver_search_pages_per_day * 10
-                processed_article_count = 0
-
-
-                for i in range(total_search_days):
-                    current_search_date = search_start_date + timedelta(days=i)
+                def update_crawl_progress(completed_pages, total_pages, current_search_date):
                     formatted_search_date = current_search_date.strftime('%Y-%m-%d')
+                    my_bar.progress(min(completed_pages / total_pages, 1.0), text=f"뉴스 메타데이터 수집 중... ({formatted_search_date}, {completed_pages}/{total_pages} 페이지 처리 완료)")
 
-                    daily_articles = news_crawler.crawl_naver_news_metadata(
-                        keyword,
-                        current_search_date,
-                        max_naver_search_pages_per_day
-                    )
-
-                    for article in daily_articles:
-                        processed_article_count += 1
-                        progress_percentage = processed_article_count / total_expected_articles
-                        my_bar.progress(min(progress_percentage, 1.0), text=f"뉴스 메타데이터 수집 중... ({formatted_search_date}, {processed_article_count}개 기사 처리 완료)")
-
-
-                        article_data_for_db = {
-                            "제목": article["제목"],
-                            "링크": article["링크"],
-                            "날짜": article["날짜"].strftime('%Y-%m-%d'),
-                            "내용": article["내용"]
-                        }
-                        database_manager.insert_article(article_data_for_db)
-
-                        all_collected_news_metadata.append(article)
+                # 누락/오래된 날짜만 동시에 크롤링하여 DB에 저장하고, 나머지 날짜는 저장된 기사 사용
+                # 기사가 파싱되는 대로 받아 묶음 단위로 키워드를 미리 추출하여, 형태소 분석이 네트워크 대기와 겹쳐 실행되도록 함
+                all_collected_news_metadata = []
+                crawl_dedup_stats = {} # 중복 제거 통계 (크롤링이 끝나면 채워짐)
+                for article in trend_analyzer.iter_annotated_articles(news_crawler.stream_naver_news_incremental(
+                    keyword,
+                    search_start_date,
+                    total_search_days,
+                    max_naver_search_pages_per_day,
+                    progress_callback=update_crawl_progress,
+                    dedup_stats=crawl_dedup_stats
+                )):
+                    all_collected_news_metadata.append(article)
+                all_collected_news_metadata.sort(key=lambda article: article["날짜"]) # 날짜 순서로 정렬 (같은 날짜 안에서는 페이지 순서 유지)
 
                 my_bar.empty()
-                status_message_placeholder.success(f"총 {len(all_collected_news_metadata)}개의 뉴스 메타데이터를 수집했습니다.")
+                status_message_placeholder.success(f"총 {len(all_collected_news_metadata)}개의 뉴스 메타데이터를 수집했습니다. (중복 기사 {crawl_dedup_stats.get('dropped', 0)}건 제외)")
 
                 # --- 2. 키워드 트렌드 분석 실행 ---
                 status_message_placeholder.info("키워드 트렌드 분석 중...")
                 with st.spinner("키워드 트렌드 분석 중..."):
-                    trending_keywords_data = trend_analyzer.analyze_keyword_trends(
-                        all_collected_news_metadata,
+                    # 새로 수집한 기사의 키워드 빈도만 날짜별 집계에 더한 뒤, 집계 테이블의 기간 합계로 분석
+                    trend_analyzer.record_daily_keyword_counts(keyword, all_collected_news_metadata)
+                    trending_keywords_data = trend_analyzer.analyze_keyword_trends_from_counts(
+                        keyword,
                         recent_days_period=recent_trend_days,
                         total_days_period=total_search_days
                     )
@@ -378,63 +375,73 @@ def trend_analysis_page():
                     # --- 3. 트렌드 기사 본문 요약 (Potens.dev AI 활용) ---
                     status_message_placeholder.info("트렌드 기사 본문 요약 중 (Potens.dev AI 호출)...")
 
-                    recent_trending_articles_candidates = [
-                        article for article in all_collected_news_metadata
-                        if article.get("날짜") and today_date - timedelta(days=recent_trend_days) <= article["날짜"]
-                    ]
-
                     processed_links = set()
 
-                    articles_for_ai_summary = []
-                    for article in recent_trending_articles_candidates:
-                        text_for_trend_check = article["제목"] + " " + article.get("내용", "")
-                        article_keywords_for_trend = trend_analyzer.extract_keywords_from_text(text_for_trend_check)
-
-                        if any(trend_kw['keyword'] in article_keywords_for_trend for trend_kw in top_3_relevant_keywords):
-                            articles_for_ai_summary.append(article)
+                    # 최근 기간 기사 중 선별된 트렌드 키워드를 포함한 기사를 역색인에서 찾음 (포함한 트렌드 키워드가 많은 기사부터)
+                    articles_for_ai_summary = trend_analyzer.find_trend_articles(
+                        keyword,
+                        all_collected_news_metadata,
+                        [trend_kw['keyword'] for trend_kw in top_3_relevant_keywords],
+                        since_date=today_date - timedelta(days=recent_trend_days)
+                    )
 
                     total_ai_articles_to_process = len(articles_for_ai_summary)
 
                     if total_ai_articles_to_process == 0:
                         status_message_placeholder.info("선별된 트렌드 키워드를 포함하는 최근 기사가 없거나, AI 요약 대상 기사가 없습니다.")
                     else:
-                        ai_progress_bar = st.progress(0, text=f"AI가 트렌드 기사를 요약 중... (0/{total_ai_articles_to_process} 완료)")
-                        ai_processed_count = 0
+                        # 요약 대상 기사의 원문 본문을 동시에 수집 (캐시된 링크는 다시 요청하지 않음)
+                        article_bodies = {}
+                        if article_fetcher.FETCH_ARTICLE_BODIES:
+                            body_progress_bar = st.progress(0, text="기사 본문 수집 중...")
 
-                        temp_collected_articles = []
-                        for article in articles_for_ai_summary:
-                            if article["링크"] in processed_links:
-                                continue
-
-                            article_date_str = article["날짜"].strftime('%Y-%m-%d')
-
-                            ai_processed_content = ai_service.get_article_summary(
-                                article["제목"],
-                                article["링크"],
-                                article_date_str,
-                                article["내용"],
-                                POTENS_API_KEY,
-                                max_attempts=2
+                            def update_body_progress(completed_count, total_count, link):
+                                body_progress_bar.progress(min(completed_count / total_count, 1.0), text=f"기사 본문 수집 중... ({completed_count}/{total_count} 완료)")
+
+                            article_bodies = article_fetcher.fetch_article_bodies(
+                                [article["링크"] for article in articles_for_ai_summary],
+                                progress_callback=update_body_progress
                             )
+                            body_progress_bar.empty()
 
+                        articles_to_summarize = []
+                        for article in articles_for_ai_summary:
+                            if article["링크"] not in processed_links:
+                                processed_links.add(article["링크"])
+                                articles_to_summarize.append(article)
+
+                        ai_progress_bar = st.progress(0, text=f"AI가 트렌드 기사를 요약 중... (0/{len(articles_to_summarize)} 완료)")
+
+                        def update_summary_progress(completed_count, total_count, article, ai_processed_content):
+                            if ai_processed_content.startswith("Potens.dev AI 호출 최종 실패") or \
+                               ai_processed_content.startswith("Potens.dev AI 호출에서 유효한 응답을 받지 못했습니다."):
+                                status_message_placeholder.error(f"AI 요약 실패: 본문 요약 실패 (AI 오류): {ai_processed_content}")
+                            ai_progress_bar.progress(completed_count / total_count, text=f"AI가 트렌드 기사를 요약 중... ({completed_count}/{total_count} 완료)")
+
+                        # 기사 요약을 동시에 요청 (동시 요청 수와 분당 요청 수는 ai_service 설정으로 제한)
+                        ai_processed_contents = ai_service.summarize_articles(
+                            articles_to_summarize,
+                            POTENS_API_KEY,
+                            article_bodies=article_bodies,
+                            progress_callback=update_summary_progress,
+                            max_attempts=2
+                        )
+
+                        temp_collected_articles = []
+                        for article, ai_processed_content in zip(articles_to_summarize, ai_processed_contents):
                             final_content = ""
                             if ai_processed_content.startswith("Potens.dev AI 호출 최종 실패") or \
                                ai_processed_content.startswith("Potens.dev AI 호출에서 유효한 응답을 받지 못했습니다."):
                                 final_content = f"본문 요약 실패 (AI 오류): {ai_processed_content}"
-                                status_message_placeholder.error(f"AI 요약 실패: {final_content}")
                             else:
                                 final_content = ai_service.clean_ai_response_text(ai_processed_content)
 
                             temp_collected_articles.append({
                                 "제목": article["제목"],
                                 "링크": article["링크"],
-                                "날짜": article_date_str,
+                                "날짜": article["날짜"].strftime('%Y-%m-%d'),
                                 "내용": final_content
                             })
-                            processed_links.add(article["링크"])
-                            ai_processed_count += 1
-                            ai_progress_bar.progress(ai_processed_count / total_ai_articles_to_process, text=f"AI가 트렌드 기사를 요약 중... ({ai_processed_count}/{total_ai_articles_to_process} 완료)")
-                            time.sleep(0.1)
 
                         ai_progress_bar.empty()
                         st.session_state['final_collected_articles'] = temp_collected_articles
@@ -570,7 +577,6 @@ def trend_analysis_page():
 
                 st.session_state['submitted_flag'] = False
                 st.session_state['analysis_completed'] = True
-                database_manager.clear_intermediate_summaries() # 중간 요약 DB 초기화
                 st.rerun()
 
             # --- 결과가 이미 세션 상태에 있는 경우 표시 ---
@@ -1,34 +1,153 @@
 # modules/trend_analyzer.py
 
 import re
+import os
+import math
+import atexit
+import hashlib
+import threading
+import multiprocessing
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain
+import numpy as np
+import pandas as pd
 import streamlit as st # Streamlit의 st.warning 등을 사용하기 위해 임시로 import.
                         # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
+import konlpy
 from konlpy.tag import Okt # konlpy의 Okt 형태소 분석기 임포트
 
-# Okt 형태소 분석기 초기화 (한 번만 수행)
-# Streamlit 환경에서는 전역 변수로 선언하거나, 함수 내에서 한 번만 초기화되도록 캐싱하는 것이 좋습니다.
-# 여기서는 간단히 전역 변수로 선언하지만, 실제 앱에서는 st.cache_resource 등을 고려할 수 있습니다.
-try:
-    okt = Okt()
-    KONLPY_AVAILABLE = True
-except Exception as e:
-    st.error(f"🚨 Konlpy (Okt) 초기화 실패: {e}. 한국어 형태소 분석 없이 키워드를 추출합니다.")
-    st.info("💡 Konlpy를 사용하려면 Java Development Kit (JDK) 1.8 이상이 설치되어 있어야 합니다.")
-    KONLPY_AVAILABLE = False
-    okt = None # 초기화 실패 시 None으로 설정
+from modules import database_manager # 형태소 분석 결과(키워드 토큰) 캐시 저장/조회
+from modules import keyword_sketch # 대량 기사 스트림의 근사 키워드 빈도 (메모리 일정)
+
+# 키워드 추출 규칙(불용어 목록, 필터 조건 등)을 바꾸면 이 값을 올려 기존 캐시를 무효화
+KEYWORD_RULES_VERSION = 1
+OKT_ANALYZER_VERSION = f"okt-{getattr(konlpy, '__version__', 'unknown')}-r{KEYWORD_RULES_VERSION}"
+SIMPLE_ANALYZER_VERSION = f"simple-r{KEYWORD_RULES_VERSION}" # konlpy 없이 공백 기준으로 토큰화한 경우
+
+# 여러 프로세스로 형태소 분석: Okt는 프로세스당 하나의 JVM(JPype)에서 사실상 직렬로 실행되므로,
+# 분석할 텍스트가 임계값 이상이면 각자 Okt를 가진 워커 프로세스들에 나누어 맡김
+KEYWORD_PROCESS_WORKERS = int(os.getenv("KEYWORD_PROCESS_WORKERS", os.cpu_count() or 1))
+KEYWORD_PROCESS_POOL_THRESHOLD = 500 # 이보다 적으면 프로세스 시작 비용이 더 크므로 현재 프로세스에서 분석
+KEYWORD_PROCESS_CHUNKS_PER_WORKER = 4 # 워커당 나눌 작업 묶음 수 (작업량 편차 완화)
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+# 트렌드 판정 방식
+#   "ratio"  : 최근/과거 빈도 비율이 min_surge_ratio 이상 (과거에 없던 키워드는 비율 무한대로 간주)
+#   "zscore" : 최근 기간 일평균 빈도가 과거 기간 일별 빈도(기준선)보다 몇 표준편차 높은지(z 점수)가 min_burst_zscore 이상
+#              드물게 새로 등장한 키워드는 점수가 낮아 걸러지고, 평소보다 실제로 급증한 키워드만 남음
+TREND_DETECTION_MODES = ("ratio", "zscore")
+DEFAULT_TREND_DETECTION_MODE = os.getenv("TREND_DETECTION_MODE", "ratio")
+DEFAULT_MIN_BURST_ZSCORE = 3.0
+BURST_VARIANCE_FLOOR = 1.0 # 기준선 분산의 최솟값 (과거에 거의 없던 키워드가 작은 빈도로 높은 점수를 받지 않도록)
+
+# 구(n-gram) 트렌드: 형태소 분석된 키워드 목록에서 연속한 키워드 2~PHRASE_MAX_N개를 이어 붙인 구도 함께 집계하고,
+# 분석 기간 전체에서 PMI(점별 상호 정보량)가 높은 구(예: "고령 운전자", "자율 주행 사고")만 단어와 함께 트렌드 후보로 사용
+# 단어와 구 집계 행이 크게 늘어나므로 기본값은 사용 안 함 (1로 설정하면 사용)
+INCLUDE_PHRASE_TRENDS = os.getenv("INCLUDE_PHRASE_TRENDS", "0") == "1"
+PHRASE_SEPARATOR = " " # 형태소 분석된 명사에는 공백이 없으므로 공백이 있으면 구
+PHRASE_MAX_N = 3
+PHRASE_MIN_FREQ = 3 # 분석 기간 전체에서 이 횟수 이상 나온 구만 PMI 계산
+PHRASE_MIN_PMI = 3.0 # log2(구 빈도 x 전체 단어 빈도^(n-1) / 구성 단어 빈도의 곱) 하한 (독립일 때 기대 빈도의 8배 이상)
+
+# 근사 트렌드 분석(analyze_keyword_trends_approx) 설정
+APPROX_CANDIDATES_PER_TOP_K = 10 # 상위 top_k개를 고르기 위해 보관할 후보 배수
+APPROX_TOKENIZE_BATCH_SIZE = 1000 # 한 번에 형태소 분석(캐시 조회)할 기사 수
+STREAM_TOKENIZE_BATCH_SIZE = 50 # 수집 중인 기사 스트림에서 한 번에 형태소 분석(캐시 조회)할 기사 수 (수집과 분석이 겹치도록 작게 유지)
+
+# 프로세스 내 토큰 캐시 (DB 조회도 생략). 크기가 이 값을 넘으면 비움
+TOKEN_MEMORY_CACHE_MAX_SIZE = 50000
+_token_memory_cache = {}
+
+# Okt 형태소 분석기 (프로세스당 하나, 처음 필요할 때 생성)
+# Okt를 만들면 JVM이 시작되어 수 초가 걸리므로, 모듈 임포트 시에는 만들지 않음 (앱 시작/다른 페이지에는 JVM 비용 없음)
+# 트렌드 페이지를 열 때 warm_up_analyzer()로 백그라운드에서 미리 시작해 두면 첫 분석 요청이 기다리지 않음
+ANALYZER_NOT_STARTED, ANALYZER_LOADING, ANALYZER_READY, ANALYZER_FAILED = "not_started", "loading", "ready", "failed"
+ANALYZER_WARM_UP_TEXT = "자동차 보험 형태소 분석기 준비" # JVM 시작 후 첫 호출 지연(클래스 로딩 등)까지 미리 치르기 위한 문장
+_okt = None
+_okt_lock = threading.Lock()
+_okt_state = {"status": ANALYZER_NOT_STARTED, "error": None}
+_warm_up_thread = None
+
+def get_okt():
+    """
+    프로세스에서 공유하는 Okt 형태소 분석기를 반환합니다. (최초 호출 시 생성하며, 생성 중이면 끝날 때까지 기다림)
+    konlpy(Okt)를 사용할 수 없으면 None을 반환합니다.
+    """
+    global _okt
+    if _okt_state["status"] == ANALYZER_READY:
+        return _okt
+    with _okt_lock:
+        if _okt_state["status"] in (ANALYZER_NOT_STARTED, ANALYZER_LOADING):
+            _okt_state["status"] = ANALYZER_LOADING
+            try:
+                _okt = Okt()
+                _okt.nouns(ANALYZER_WARM_UP_TEXT)
+                _okt_state["status"] = ANALYZER_READY
+            except Exception as e:
+                print(f"경고: Konlpy (Okt) 초기화 실패: {e}. 한국어 형태소 분석 없이 키워드를 추출합니다.")
+                _okt = None
+                _okt_state.update(status=ANALYZER_FAILED, error=str(e))
+        return _okt
+
+def warm_up_analyzer(background: bool = True):
+    """
+    Okt(JVM)를 미리 생성합니다. 여러 번 호출해도 한 번만 시작합니다.
+    background가 True이면 백그라운드 스레드에서 시작하고 바로 반환합니다. (진행 상태는 get_analyzer_status()로 확인)
+    """
+    global _warm_up_thread
+    if _okt_state["status"] != ANALYZER_NOT_STARTED:
+        return
+    if not background:
+        get_okt()
+        return
+    with _okt_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=get_okt, name="okt-warm-up", daemon=True)
+            _warm_up_thread.start()
+
+def get_analyzer_status() -> dict:
+    """형태소 분석기 준비 상태 {"status": not_started/loading/ready/failed, "error": 실패 사유}를 반환합니다."""
+    return dict(_okt_state)
+
+def is_analyzer_ready() -> bool:
+    return _okt_state["status"] == ANALYZER_READY
+
+def _konlpy_usable() -> bool:
+    """Okt 초기화에 실패하지 않았으면 True (아직 생성 전이어도 True)."""
+    return _okt_state["status"] != ANALYZER_FAILED
+
+def _current_analyzer_version() -> str:
+    """
+    캐시 조회에 사용할 분석기 버전. JVM을 시작하지 않고 결정하므로 캐시에 있는 텍스트는 Okt 없이 바로 처리됩니다.
+    (Okt 생성에 실패하면 그 뒤로는 단순 토큰화 버전. 생성 전에 얻은 버전과 실제 결과가 다르면 캐시하지 않음)
+    """
+    return OKT_ANALYZER_VERSION if _konlpy_usable() else SIMPLE_ANALYZER_VERSION
+
+def _count_table_version(include_phrases: bool) -> str:
+    """
+    날짜별 집계 테이블(daily_keyword_counts 등)에 사용할 버전. 분석기 버전에 집계한 n-gram 최대 길이를 붙여,
+    구를 집계하기 전에 기록된 기사나 구 집계 여부가 다른 기사가 섞이지 않도록 합니다. (버전이 바뀌면 기사를 다시 집계)
+    """
+    return f"{_current_analyzer_version()}-n{PHRASE_MAX_N if include_phrases else 1}"
 
 def extract_keywords_from_text(text: str) -> list[str]:
     """
     텍스트에서 키워드를 추출합니다.
     konlpy Okt 형태소 분석기를 사용하여 명사를 추출하고, 불용어 제거를 수행합니다.
     """
+    return _extract_keywords_with_version(text)[0]
+
+def _extract_keywords_with_version(text: str) -> tuple[list[str], str]:
+    """extract_keywords_from_text와 같으며, 실제로 사용한 분석기 버전을 함께 반환합니다."""
     if not text:
-        return []
+        return [], SIMPLE_ANALYZER_VERSION
 
     keywords = []
-    if KONLPY_AVAILABLE and okt:
+    okt = get_okt() if _konlpy_usable() else None
+    if okt:
         try:
             # Okt를 사용하여 명사만 추출
             nouns = okt.nouns(text)
@@ -50,6 +169,7 @@ def extract_keywords_from_text(text: str) -> list[str]:
                 word.lower() for word in nouns
                 if len(word) > 1 and word.lower() not in stopwords
             ]
+            return keywords, OKT_ANALYZER_VERSION
         except Exception as e:
             st.warning(f"⚠️ Konlpy 명사 추출 중 오류 발생: {e}. 일반 토큰화로 대체합니다.")
             # 오류 발생 시 기존의 간단한 토큰화 방식으로 대체
@@ -76,25 +196,144 @@ def extract_keywords_from_text(text: str) -> list[str]:
         ]
         keywords = [word for word in tokens if len(word) > 1 and word not in stopwords]
 
-    return keywords
+    return keywords, SIMPLE_ANALYZER_VERSION
+
+def _extract_keywords_chunk(texts: list[str]) -> list[tuple[list[str], str]]:
+    """워커 프로세스에서 실행: 텍스트 묶음의 키워드를 추출합니다. (워커마다 처음 만든 Okt를 계속 사용)"""
+    return [_extract_keywords_with_version(text) for text in texts]
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """형태소 분석용 프로세스 풀을 반환합니다. (최초 호출 시 생성, 이후 재사용하여 워커의 Okt/JVM을 계속 활용)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # JVM이 떠 있는 프로세스를 fork하면 안전하지 않으므로 spawn으로 새 프로세스를 시작
+            _process_pool = ProcessPoolExecutor(max_workers=KEYWORD_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+def shutdown_keyword_process_pool():
+    """형태소 분석용 프로세스 풀을 종료합니다."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+            _process_pool = None
+
+atexit.register(shutdown_keyword_process_pool)
+
+def _extract_keywords_many(texts: list[str]) -> list[tuple[list[str], str]]:
+    """
+    여러 텍스트의 키워드를 (키워드 목록, 분석기 버전)으로 추출합니다.
+    Okt를 사용할 수 있고 텍스트 수가 KEYWORD_PROCESS_POOL_THRESHOLD 이상이면 워커 프로세스들에 나누어 분석하며,
+    프로세스 풀을 사용할 수 없으면 현재 프로세스에서 분석합니다.
+    """
+    if _konlpy_usable() and KEYWORD_PROCESS_WORKERS > 1 and len(texts) >= KEYWORD_PROCESS_POOL_THRESHOLD:
+        chunk_size = -(-len(texts) // (KEYWORD_PROCESS_WORKERS * KEYWORD_PROCESS_CHUNKS_PER_WORKER))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            return [result for chunk_results in _get_process_pool().map(_extract_keywords_chunk, chunks) for result in chunk_results]
+        except Exception as e:
+            print(f"경고: 프로세스 풀 형태소 분석 실패, 현재 프로세스에서 분석합니다. ({e})")
+            shutdown_keyword_process_pool()
+    return _extract_keywords_chunk(texts)
 
-def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: int = 2, total_days_period: int = 15, min_surge_ratio: float = 1.5, min_recent_freq: int = 3) -> list[dict]:
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def extract_keywords_for_texts(texts: list[str]) -> list[list[str]]:
+    """
+    여러 텍스트의 키워드를 추출합니다. 결과는 (텍스트 해시, 분석기 버전) 단위로 DB(keyword_token_cache)에 캐시되므로
+    같은 텍스트는 수명 동안 한 번만 형태소 분석하고, 이후에는 저장된 토큰 목록만 읽습니다.
+    """
+    analyzer_version = _current_analyzer_version()
+    hashes = [_text_hash(text) for text in texts]
+    results = {text_hash: _token_memory_cache[(text_hash, analyzer_version)]
+               for text_hash in hashes if (text_hash, analyzer_version) in _token_memory_cache}
+
+    missing_hashes = [text_hash for text_hash in dict.fromkeys(hashes) if text_hash not in results]
+    if missing_hashes:
+        results.update(database_manager.get_cached_tokens(missing_hashes, analyzer_version))
+
+    # 캐시에 없는 텍스트만 (중복 없이) 분석
+    texts_to_analyze = {text_hash: text for text, text_hash in zip(texts, hashes) if text_hash not in results}
+    new_rows = []
+    for text_hash, (keywords, used_version) in zip(texts_to_analyze, _extract_keywords_many(list(texts_to_analyze.values()))):
+        results[text_hash] = keywords
+        # Okt 오류로 단순 토큰화로 대체된 결과는 캐시하지 않음 (다음 실행에서 다시 분석)
+        if used_version == analyzer_version:
+            new_rows.append((text_hash, keywords))
+    if new_rows:
+        database_manager.save_cached_tokens(new_rows, analyzer_version)
+
+    if len(_token_memory_cache) + len(results) > TOKEN_MEMORY_CACHE_MAX_SIZE:
+        _token_memory_cache.clear()
+    for text_hash, keywords in results.items():
+        _token_memory_cache[(text_hash, analyzer_version)] = keywords
+    return [results[text_hash] for text_hash in hashes]
+
+def _article_text(article: dict) -> str:
+    return article["제목"] + " " + article.get("내용", "") # '내용'은 미리보기 스니펫
+
+def extract_article_keywords(article: dict) -> list[str]:
+    """
+    기사(제목 + 미리보기 스니펫)의 키워드를 반환합니다.
+    스트리밍 수집 중에 미리 추출해 둔 키워드('키워드' 항목)가 있으면 다시 분석하지 않고 그대로 사용합니다.
+    """
+    if "키워드" in article:
+        return article["키워드"]
+    return extract_keywords_for_texts([_article_text(article)])[0]
+
+def annotate_article_keywords(articles: list[dict]):
+    """키워드가 없는 기사들의 키워드를 한 번에(캐시 조회/저장도 한 번에) 추출하여 '키워드' 항목에 채웁니다."""
+    pending_articles = [article for article in articles if "키워드" not in article]
+    if not pending_articles:
+        return
+    for article, keywords in zip(pending_articles, extract_keywords_for_texts([_article_text(article) for article in pending_articles])):
+        article["키워드"] = keywords
+
+def iter_annotated_articles(articles, batch_size: int = STREAM_TOKENIZE_BATCH_SIZE):
+    """
+    기사 스트림을 batch_size개씩 묶어 키워드를 한 번에 추출(annotate_article_keywords)한 뒤, 기사를 받은 순서대로 반환합니다.
+    기사마다 캐시를 따로 조회하지 않으면서도, 수집이 진행되는 동안 묶음 단위로 형태소 분석을 진행합니다.
+    """
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= batch_size:
+            annotate_article_keywords(batch)
+            yield from batch
+            batch = []
+    if batch:
+        annotate_article_keywords(batch)
+        yield from batch
+
+def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: int = 2, total_days_period: int = 15, min_surge_ratio: float = 1.5, min_recent_freq: int = 3,
+                           top_k: int = None, detection_mode: str = None, min_burst_zscore: float = DEFAULT_MIN_BURST_ZSCORE,
+                           include_phrases: bool = None) -> list[dict]:
     """
     기사 메타데이터를 기반으로 키워드 트렌드를 분석합니다.
     recent_days_period: 트렌드를 감지할 최근 기간 (예: 2일)
     total_days_period: 비교할 전체 기간 (예: 15일)
     min_surge_ratio: 최근 기간 빈도 / 과거 기간 빈도 비율이 이 값 이상일 때 트렌드로 간주
     min_recent_freq: 최근 기간에 최소한 이 횟수 이상 언급되어야 트렌드로 간주
+    top_k: 최근 빈도 상위 몇 개만 반환할지 (None이면 조건을 만족하는 키워드 전체)
+    detection_mode: 트렌드 판정 방식 "ratio" 또는 "zscore" (None이면 DEFAULT_TREND_DETECTION_MODE)
+    min_burst_zscore: "zscore" 방식에서 트렌드로 간주할 최소 z 점수 (min_surge_ratio 대신 사용)
+    include_phrases: 연어 조건을 만족하는 구(공백으로 이은 키워드)도 트렌드 후보에 포함할지 (None이면 INCLUDE_PHRASE_TRENDS)
+                     포함하면 빈도가 같고 서로 포함 관계인 단어/구는 가장 긴 것만 반환
     반환 값: [{keyword: str, recent_freq: int, past_freq: int, surge_ratio: float}]
+             "zscore" 방식이면 각 항목에 burst_zscore: float가 추가되고 z 점수 높은 순으로 정렬
     """
+    detection_mode = _resolve_detection_mode(detection_mode)
+    include_phrases = INCLUDE_PHRASE_TRENDS if include_phrases is None else include_phrases
     if not articles_metadata:
         return []
 
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    total_start = today - timedelta(days=total_days_period)
 
-    recent_articles = []
-    past_articles = []
-
+    window_articles = []
+    article_days = []
     for article in articles_metadata:
         article_date = article.get("날짜")
         if not isinstance(article_date, datetime):
@@ -102,50 +341,390 @@ def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: in
             st.warning(f"경고: '{article['제목']}' 기사의 날짜 파싱 실패. 오늘 날짜로 간주하여 분석에 포함합니다.")
             article_date = today
 
-        if today - timedelta(days=recent_days_period) <= article_date:
-            recent_articles.append(article)
-        elif today - timedelta(days=total_days_period) <= article_date < today - timedelta(days=recent_days_period):
-            past_articles.append(article)
-
-    # 각 기간의 키워드 빈도 계산
-    recent_keywords = Counter()
-    for article in recent_articles:
-        # 트렌드 분석 시 제목과 미리보기 스니펫 모두 활용
-        text_for_keywords = article["제목"] + " " + article.get("내용", "") # '내용'이 이제 미리보기 스니펫
-        recent_keywords.update(extract_keywords_from_text(text_for_keywords)) # 함수명 변경 적용
-
-    past_keywords = Counter()
-    for article in past_articles:
-        # 트렌드 분석 시 제목과 미리보기 스니펫 모두 활용
-        text_for_keywords = article["제목"] + " " + article.get("내용", "") # '내용'이 이제 미리보기 스니펫
-        past_keywords.update(extract_keywords_from_text(text_for_keywords)) # 함수명 변경 적용
-
-    trending_keywords_list = [] # 리스트 형태로 변경
-    for keyword, recent_freq in recent_keywords.items():
-        past_freq = past_keywords.get(keyword, 0) # 과거 기간에 없으면 0
-
-        # 최근 기간에 최소 빈도 이상이어야 함
-        if recent_freq < min_recent_freq:
+        if total_start <= article_date:
+            window_articles.append(article)
+            article_days.append(article_date.date())
+    if not window_articles:
+        return []
+
+    # 키워드별 최근/과거 기간 빈도를 키워드 번호 기준 가중 집계로 한 번에 계산 (형태소 분석 결과는 캐시에서 한 번에 조회)
+    # 기간 경계가 모두 자정이므로 날짜 단위로 나누어도 기사 시각으로 비교한 것과 결과가 같음
+    annotate_article_keywords(window_articles)
+    keyword_lists = [article["키워드"] for article in window_articles]
+    if include_phrases:
+        keyword_lists = [keywords + extract_keyword_phrases(keywords) for keywords in keyword_lists]
+    keywords, keyword_codes, day_codes, days = _encode_keyword_days(keyword_lists, np.array(article_days, dtype="datetime64[D]"))
+    is_recent_day = days >= np.datetime64((today - timedelta(days=recent_days_period)).date())
+    recent_freqs = np.bincount(keyword_codes, weights=is_recent_day[day_codes], minlength=len(keywords)).astype(np.int64)
+    past_freqs = np.bincount(keyword_codes, weights=~is_recent_day[day_codes], minlength=len(keywords)).astype(np.int64)
+    if include_phrases:
+        # 단어 전체와 연어 조건을 만족하는 구만 남김
+        window_freqs = recent_freqs + past_freqs
+        is_phrase = _is_phrase_keyword(keywords)
+        keep = _collocation_mask(keywords, window_freqs, int(window_freqs[~is_phrase].sum()))
+    else:
+        keep = np.ones(len(keywords), dtype=bool)
+
+    burst_zscores = None
+    if detection_mode == "zscore":
+        past_sq_freqs = _past_day_square_sums(keyword_codes, day_codes, len(keywords), len(days), is_recent_day)
+        burst_zscores = _burst_zscores(recent_freqs, past_freqs, past_sq_freqs, recent_days_period, total_days_period)[keep]
+    keywords, recent_freqs, past_freqs = keywords[keep], recent_freqs[keep], past_freqs[keep]
+    if include_phrases:
+        # 겹치는 n-gram을 걸러낸 뒤 top_k개를 자르도록 전체를 점수화
+        trending_keywords_list = _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio, min_recent_freq,
+                                                          burst_zscores=burst_zscores, min_burst_zscore=min_burst_zscore)
+        return _drop_overlapping_ngrams(trending_keywords_list)[:top_k]
+    return _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio, min_recent_freq, top_k,
+                                    burst_zscores=burst_zscores, min_burst_zscore=min_burst_zscore)
+
+def extract_keyword_phrases(keywords: list[str], max_n: int = PHRASE_MAX_N) -> list[str]:
+    """
+    키워드 목록(텍스트에 나온 순서)에서 연속한 키워드 2~max_n개를 공백으로 이어 붙인 구(n-gram) 후보를 만듭니다.
+    캐시된 형태소 분석 결과만 사용하므로 텍스트를 다시 분석하지 않습니다. (같은 단어가 반복된 구는 제외)
+    """
+    phrases = []
+    for n in range(2, max_n + 1):
+        for start in range(len(keywords) - n + 1):
+            gram = keywords[start:start + n]
+            if len(set(gram)) == n:
+                phrases.append(PHRASE_SEPARATOR.join(gram))
+    return phrases
+
+def _contains_ngram(tokens: tuple, sub_tokens: tuple) -> bool:
+    """sub_tokens가 tokens 안에 연속으로 들어 있으면 True."""
+    n = len(sub_tokens)
+    return any(tokens[start:start + n] == sub_tokens for start in range(len(tokens) - n + 1))
+
+def _drop_overlapping_ngrams(trending_keywords_list: list[dict]) -> list[dict]:
+    """
+    트렌드 키워드 목록(순위 순)에서, 최근/과거 빈도가 같으면서 서로 포함 관계인 키워드(예: "자율 주행"과 "자율 주행 사고")는
+    가장 긴 것 하나만 남깁니다. 빈도가 같으면 항상 함께 나온 것이므로 짧은 쪽은 같은 내용의 중복입니다.
+    남는 항목은 그 묶음에서 가장 먼저 나온 항목의 순위 자리에 놓입니다.
+    """
+    result = []
+    result_tokens = []
+    indices_by_counts = {} # (최근 빈도, 과거 빈도) -> result 안의 위치 목록
+    for keyword_data in trending_keywords_list:
+        tokens = tuple(keyword_data["keyword"].split(PHRASE_SEPARATOR))
+        same_count_indices = indices_by_counts.setdefault((keyword_data["recent_freq"], keyword_data["past_freq"]), [])
+        if any(_contains_ngram(result_tokens[index], tokens) for index in same_count_indices if result_tokens[index] is not None):
+            continue # 이미 남긴 더 긴(또는 같은) 키워드에 포함됨
+        contained_indices = [index for index in same_count_indices
+                             if result_tokens[index] is not None and _contains_ngram(tokens, result_tokens[index])]
+        if contained_indices:
+            # 이미 남긴 더 짧은 키워드들을 이 키워드로 대체 (첫 자리에 놓고 나머지는 제거 표시)
+            result[contained_indices[0]], result_tokens[contained_indices[0]] = keyword_data, tokens
+            for index in contained_indices[1:]:
+                result[index], result_tokens[index] = None, None
+            continue
+        same_count_indices.append(len(result))
+        result.append(keyword_data)
+        result_tokens.append(tokens)
+    return [keyword_data for keyword_data in result if keyword_data is not None]
+
+def _is_phrase_keyword(keywords) -> np.ndarray:
+    return np.fromiter((PHRASE_SEPARATOR in keyword for keyword in keywords), dtype=bool, count=len(keywords))
+
+def _collocation_mask(keywords, window_freqs, unigram_total: int) -> np.ndarray:
+    """
+    키워드 중 트렌드 후보로 남길 항목을 나타내는 bool 배열을 반환합니다.
+    단어는 모두 남기고, 구는 분석 기간 전체 빈도가 PHRASE_MIN_FREQ 이상이고 PMI가 PHRASE_MIN_PMI 이상인 것만 남깁니다.
+    PMI = log2(구 빈도 x 전체 단어 빈도^(n-1) / 구성 단어 빈도의 곱) (구성 단어들이 서로 독립일 때 기대되는 빈도 대비 몇 배 자주 함께 나오는지)
+    """
+    keywords = np.asarray(keywords, dtype=object)
+    window_freqs = np.asarray(window_freqs, dtype=np.int64)
+    is_phrase = _is_phrase_keyword(keywords)
+    keep = ~is_phrase
+    if unigram_total <= 0:
+        return keep
+    unigram_freqs = dict(zip(keywords[keep].tolist(), window_freqs[keep].tolist()))
+    log_total = math.log2(unigram_total)
+    for index in np.flatnonzero(is_phrase & (window_freqs >= PHRASE_MIN_FREQ)).tolist():
+        part_freqs = [unigram_freqs.get(part, 0) for part in keywords[index].split(PHRASE_SEPARATOR)]
+        if min(part_freqs) <= 0:
             continue
+        pmi = math.log2(window_freqs[index]) + (len(part_freqs) - 1) * log_total - sum(math.log2(freq) for freq in part_freqs)
+        keep[index] = pmi >= PHRASE_MIN_PMI
+    return keep
 
-        surge_ratio = None
-        if past_freq == 0:
-            # 과거에 없었는데 최근에 나타난 키워드는 트렌드로 간주
-            if recent_freq >= min_recent_freq:
-                surge_ratio = float('inf') # 무한대로 표현
-        else:
-            surge_ratio = recent_freq / past_freq
-            if surge_ratio < min_surge_ratio: # 최소 증가율 미달 시 트렌드 아님
-                continue
-
-        trending_keywords_list.append({
-            "keyword": keyword,
-            "recent_freq": recent_freq,
-            "past_freq": past_freq,
-            "surge_ratio": surge_ratio
-        })
-
-    # 빈도 높은 순으로 정렬
-    trending_keywords_list = sorted(trending_keywords_list, key=lambda x: x['recent_freq'], reverse=True)
+def _resolve_detection_mode(detection_mode: str) -> str:
+    detection_mode = detection_mode or DEFAULT_TREND_DETECTION_MODE
+    if detection_mode not in TREND_DETECTION_MODES:
+        raise ValueError(f"알 수 없는 트렌드 판정 방식입니다: {detection_mode} (가능한 값: {', '.join(TREND_DETECTION_MODES)})")
+    return detection_mode
 
+def _burst_zscores(recent_freqs, past_freqs, past_sq_freqs, recent_days_period: int, total_days_period: int) -> np.ndarray:
+    """
+    키워드별 최근 기간 일평균 빈도가 과거 기간의 일별 빈도 분포(기준선)에서 몇 표준편차 떨어져 있는지 계산합니다.
+    기간 합계와 일별 빈도 제곱합만 있으면 되므로, 날짜별 집계 테이블에서도 한 번의 조회로 계산할 수 있습니다.
+    (최근 기간: 오늘 포함 recent_days_period + 1일, 과거 기간: total_days_period - recent_days_period일, 기사가 없는 날은 0)
+    """
+    recent_days = recent_days_period + 1
+    past_days = max(total_days_period - recent_days_period, 1)
+    past_freqs = np.asarray(past_freqs, dtype=np.float64)
+    baseline_mean = past_freqs / past_days
+    baseline_var = np.maximum(np.asarray(past_sq_freqs, dtype=np.float64) / past_days - np.square(baseline_mean), 0.0)
+    recent_mean = np.asarray(recent_freqs, dtype=np.float64) / recent_days
+    return (recent_mean - baseline_mean) / np.sqrt(baseline_var + BURST_VARIANCE_FLOOR)
+
+def _encode_keyword_days(keyword_lists: list[list[str]], article_days: np.ndarray) -> tuple:
+    """
+    기사별 키워드 목록과 기사 날짜를 키워드 하나(출현 하나)당 (키워드 번호, 날짜 번호)로 바꿉니다.
+    반환 값: (키워드 배열(처음 나온 순서), 키워드 번호 배열, 날짜 번호 배열, 날짜 배열(오름차순, datetime64[D]))
+    """
+    keyword_counts_per_article = np.fromiter((len(keywords) for keywords in keyword_lists), dtype=np.int64, count=len(keyword_lists))
+    keyword_codes, keywords = pd.factorize(np.fromiter(chain.from_iterable(keyword_lists), dtype=object,
+                                                       count=int(keyword_counts_per_article.sum())))
+    days, article_day_codes = np.unique(article_days, return_inverse=True)
+    day_codes = np.repeat(article_day_codes, keyword_counts_per_article)
+    return keywords, keyword_codes, day_codes, days
+
+def _past_day_square_sums(keyword_codes: np.ndarray, day_codes: np.ndarray, keyword_count: int, day_count: int,
+                          is_recent_day: np.ndarray) -> np.ndarray:
+    """
+    키워드별로 과거 기간 날짜별 빈도의 제곱합을 계산합니다. (z 점수의 기준선 분산용)
+    키워드 × 날짜 전체 행렬 대신 실제로 나온 (키워드, 날짜) 칸만 집계하므로 메모리 사용량이 출현 수에 비례합니다.
+    """
+    cells, cell_counts = np.unique(keyword_codes.astype(np.int64) * day_count + day_codes, return_counts=True)
+    is_past_cell = ~is_recent_day[cells % day_count]
+    return np.bincount(cells[is_past_cell] // day_count, weights=np.square(cell_counts[is_past_cell]).astype(np.float64),
+                       minlength=keyword_count).astype(np.int64)
+
+def _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio: float, min_recent_freq: int, top_k: int = None,
+                             burst_zscores=None, min_burst_zscore: float = DEFAULT_MIN_BURST_ZSCORE) -> list[dict]:
+    """
+    키워드별 최근/과거 기간 빈도 배열로 증가율과 트렌드 조건을 한 번에 계산하여 트렌드 키워드 목록을 만듭니다. (빈도 높은 순)
+    과거 기간에 없었는데 최근에 나타난 키워드는 증가율을 무한대로 보고 트렌드로 간주합니다.
+    burst_zscores가 주어지면 증가율 대신 z 점수가 min_burst_zscore 이상인 키워드를 z 점수 높은 순으로 반환합니다. (같은 값은 키워드 순)
+    top_k가 주어지면 전체를 정렬하지 않고 상위 top_k개만 골라(부분 선택) 정렬합니다.
+    """
+    keywords = np.asarray(keywords, dtype=object)
+    recent_freqs = np.asarray(recent_freqs, dtype=np.int64)
+    past_freqs = np.asarray(past_freqs, dtype=np.int64)
+
+    surge_ratios = np.divide(recent_freqs, past_freqs, out=np.full(len(recent_freqs), np.inf), where=past_freqs > 0)
+    is_trending = (recent_freqs > 0) & (recent_freqs >= min_recent_freq)
+    if burst_zscores is None:
+        is_trending &= (past_freqs == 0) | (surge_ratios >= min_surge_ratio)
+        rank_scores = recent_freqs
+    else:
+        burst_zscores = np.asarray(burst_zscores, dtype=np.float64)
+        is_trending &= burst_zscores >= min_burst_zscore
+        rank_scores = burst_zscores
+    selected = np.flatnonzero(is_trending)
+
+    if top_k is not None and top_k < len(selected):
+        if top_k <= 0:
+            return []
+        # top_k번째 점수 이상인 키워드만 남김 (경계의 동점 키워드는 모두 남긴 뒤 아래 정렬에서 키워드 순으로 자름)
+        kth_score = rank_scores[selected][np.argpartition(-rank_scores[selected], top_k - 1)[top_k - 1]]
+        selected = selected[rank_scores[selected] >= kth_score]
+    # 빈도(또는 z 점수) 높은 순으로 정렬. 같은 값은 키워드 순으로 정렬하여 입력 순서와 관계없이 항상 같은 순서가 되도록 함
+    selected = selected[np.lexsort((keywords[selected].astype(str), -rank_scores[selected]))][:top_k]
+
+    trending_keywords_list = [
+        {"keyword": keyword, "recent_freq": recent_freq, "past_freq": past_freq, "surge_ratio": surge_ratio}
+        for keyword, recent_freq, past_freq, surge_ratio in zip(
+            keywords[selected].tolist(), recent_freqs[selected].tolist(), past_freqs[selected].tolist(), surge_ratios[selected].tolist()
+        )
+    ]
+    if burst_zscores is not None:
+        for keyword_data, burst_zscore in zip(trending_keywords_list, burst_zscores[selected].tolist()):
+            keyword_data["burst_zscore"] = burst_zscore
     return trending_keywords_list
+
+def record_daily_keyword_counts(search_keyword: str, articles: list[dict], include_phrases: bool = None) -> int:
+    """
+    검색 키워드로 수집한 기사들의 키워드(및 구 후보) 빈도를 날짜별 집계 테이블(daily_keyword_counts)에 더하고,
+    키워드 -> 기사 역색인(keyword_article_index)에 추가합니다.
+    include_phrases가 참이면(None이면 INCLUDE_PHRASE_TRENDS) 구 후보(extract_keyword_phrases)도 PMI와 관계없이 모두 집계하며,
+    연어 여부는 분석할 때 기간 합계로 판단합니다.
+    이미 집계한 기사(같은 검색 키워드, 같은 집계 버전)는 건너뛰므로, 새로 저장된 기사만 증분 반영됩니다.
+    반환 값: 새로 집계한 기사 수
+    """
+    include_phrases = INCLUDE_PHRASE_TRENDS if include_phrases is None else include_phrases
+    analyzer_version = _count_table_version(include_phrases)
+    articles_by_link = {article["링크"]: article for article in articles if article.get("링크")}
+    counted_links = database_manager.get_counted_article_links(search_keyword, analyzer_version, list(articles_by_link))
+    new_articles = [article for link, article in articles_by_link.items() if link not in counted_links]
+    if not new_articles:
+        return 0
+
+    annotate_article_keywords(new_articles)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    article_counts = []
+    for article in new_articles:
+        article_date = article.get("날짜") if isinstance(article.get("날짜"), datetime) else today
+        keywords = article["키워드"] + extract_keyword_phrases(article["키워드"]) if include_phrases else article["키워드"]
+        article_counts.append((article["링크"], article_date.strftime('%Y-%m-%d'), Counter(keywords)))
+    database_manager.add_daily_keyword_counts(search_keyword, analyzer_version, article_counts)
+    return len(new_articles)
+
+def analyze_keyword_trends_from_counts(search_keyword: str, recent_days_period: int = 2, total_days_period: int = 15,
+                                       min_surge_ratio: float = 1.5, min_recent_freq: int = 3, top_k: int = None,
+                                       detection_mode: str = None, min_burst_zscore: float = DEFAULT_MIN_BURST_ZSCORE,
+                                       include_phrases: bool = None) -> list[dict]:
+    """
+    날짜별 키워드 집계 테이블에서 기간 합계만 조회하여 키워드 트렌드를 분석합니다.
+    기사 원문을 다시 분석하지 않으므로 기간이나 기준값을 바꿔 다시 실행해도 즉시 결과가 나옵니다.
+    (같은 include_phrases로 record_daily_keyword_counts를 실행해 집계된 기사 기준, 인자와 반환 값은 analyze_keyword_trends와 동일)
+    """
+    detection_mode = _resolve_detection_mode(detection_mode)
+    include_phrases = INCLUDE_PHRASE_TRENDS if include_phrases is None else include_phrases
+    analyzer_version = _count_table_version(include_phrases)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    recent_start = (today - timedelta(days=recent_days_period)).strftime('%Y-%m-%d')
+    total_start = (today - timedelta(days=total_days_period)).strftime('%Y-%m-%d')
+
+    window_counts = database_manager.get_keyword_window_counts(search_keyword, analyzer_version, total_start, recent_start, min_recent_freq)
+    if not window_counts:
+        return []
+    keywords, recent_freqs, past_freqs, past_sq_freqs = (np.asarray(column) for column in zip(*window_counts))
+    if include_phrases:
+        # 최근 빈도 조건을 만족하는 구의 구성 단어는 모두 조회 결과에 있으므로(구가 나오면 구성 단어도 나옴) 그 빈도로 PMI 계산
+        keep = _collocation_mask(keywords, recent_freqs + past_freqs,
+                                 database_manager.get_keyword_window_total(search_keyword, analyzer_version, total_start))
+    else:
+        keep = ~_is_phrase_keyword(keywords)
+    keywords, recent_freqs, past_freqs, past_sq_freqs = keywords[keep], recent_freqs[keep], past_freqs[keep], past_sq_freqs[keep]
+
+    burst_zscores = None
+    if detection_mode == "zscore":
+        burst_zscores = _burst_zscores(recent_freqs, past_freqs, past_sq_freqs, recent_days_period, total_days_period)
+    if include_phrases:
+        # 겹치는 n-gram을 걸러낸 뒤 top_k개를 자르도록 전체를 점수화
+        trending_keywords_list = _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio, min_recent_freq,
+                                                          burst_zscores=burst_zscores, min_burst_zscore=min_burst_zscore)
+        return _drop_overlapping_ngrams(trending_keywords_list)[:top_k]
+    return _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio, min_recent_freq, top_k,
+                                    burst_zscores=burst_zscores, min_burst_zscore=min_burst_zscore)
+
+def find_trend_articles(search_keyword: str, articles: list[dict], trend_keywords: list[str], since_date: datetime = None,
+                        include_phrases: bool = None) -> list[dict]:
+    """
+    기사들 중 트렌드 키워드를 하나 이상 포함한 기사를, 포함한 트렌드 키워드 수가 많은 순으로 반환합니다. (같은 수는 원래 순서 유지)
+    키워드 -> 기사 역색인에서 찾으므로 기사를 다시 형태소 분석하지 않습니다. 색인에 없는 기사는 먼저 색인에 추가합니다.
+    since_date가 주어지면 그 날짜 이후의 기사만 찾습니다. (include_phrases는 record_daily_keyword_counts와 같음)
+    """
+    if not articles or not trend_keywords:
+        return []
+    include_phrases = INCLUDE_PHRASE_TRENDS if include_phrases is None else include_phrases
+    record_daily_keyword_counts(search_keyword, articles, include_phrases)
+    analyzer_version = _count_table_version(include_phrases)
+    matched_links = database_manager.get_links_by_keywords(
+        search_keyword, analyzer_version, list(dict.fromkeys(trend_keywords)),
+        since_date.strftime('%Y-%m-%d') if since_date else None
+    )
+    trend_articles = [article for article in articles if article.get("링크") in matched_links]
+    return sorted(trend_articles, key=lambda article: matched_links[article["링크"]], reverse=True)
+
+def _iter_article_keyword_batches(articles, today: datetime):
+    """기사 스트림을 묶음 단위로 형태소 분석(캐시 조회)하여 [(날짜 문자열 YYYY-MM-DD, 키워드 목록)] 묶음을 차례로 반환합니다."""
+    def keyword_batch(batch):
+        texts = [_article_text(article) if "키워드" not in article else None for article in batch]
+        pending = [text for text in texts if text is not None]
+        pending_keywords = iter(extract_keywords_for_texts(pending) if pending else [])
+        batch_keywords = []
+        for article, text in zip(batch, texts):
+            article_date = article.get("날짜")
+            if isinstance(article_date, datetime):
+                date_str = article_date.strftime('%Y-%m-%d')
+            elif isinstance(article_date, str) and article_date:
+                date_str = article_date[:10]
+            else:
+                date_str = today.strftime('%Y-%m-%d') # 날짜가 없으면 오늘 날짜로 간주
+            batch_keywords.append((date_str, article["키워드"] if text is None else next(pending_keywords)))
+        return batch_keywords
+
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= APPROX_TOKENIZE_BATCH_SIZE:
+            yield keyword_batch(batch)
+            batch = []
+    if batch:
+        yield keyword_batch(batch)
+
+def analyze_keyword_trends_approx(articles, recent_days_period: int = 2, total_days_period: int = 15, min_surge_ratio: float = 1.5,
+                                  min_recent_freq: int = 3, top_k: int = 50, verify_articles=None,
+                                  epsilon: float = keyword_sketch.DEFAULT_SKETCH_EPSILON, delta: float = keyword_sketch.DEFAULT_SKETCH_DELTA) -> list[dict]:
+    """
+    기사 스트림을 한 번 훑으면서 일정한 메모리로 키워드 트렌드를 근사 분석합니다. (수개월치 기사 전체 등 대량 분석용, 증가율 방식)
+    키워드별 빈도를 정확히 세는 대신 최근 기간은 Count-Min Sketch + 상위 후보 목록, 과거 기간은 Count-Min Sketch로 추정합니다.
+    트렌드 키워드는 최근 기간 추정 빈도 상위 top_k x APPROX_CANDIDATES_PER_TOP_K개 후보 안에서 고르므로,
+    최근 빈도가 아주 낮은 키워드는 정확한 분석(analyze_keyword_trends)과 달리 결과에 포함되지 않을 수 있습니다.
+
+    Args:
+        articles: 기사 dict의 반복 가능 객체 ('제목', '내용', '날짜'(datetime 또는 YYYY-MM-DD), 선택적으로 '키워드'). 한 번만 순회합니다.
+        recent_days_period, total_days_period, min_surge_ratio, min_recent_freq: analyze_keyword_trends와 동일.
+        top_k (int): 반환할 최대 키워드 수.
+        verify_articles (optional): articles와 같은 기사를 다시 순회하는 반복 가능 객체. 주어지면 한 번 더 훑으면서
+            후보 키워드만 정확히 세어 결과를 확정합니다. (후보 수만큼의 메모리만 사용)
+        epsilon, delta: 스케치 오차 한계 (추정 빈도 <= 실제 빈도 + epsilon x 기간 전체 빈도, 확률 1 - delta)
+    Returns:
+        list[dict]: analyze_keyword_trends와 같은 형식에 빈도 오차 한계(recent_freq_error_bound, past_freq_error_bound)와
+            정확한 빈도로 확정했는지 여부(verified)가 추가됩니다. 확정하지 않은 빈도는 실제보다 클 수 있습니다(오차 한계 이내).
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    recent_start = (today - timedelta(days=recent_days_period)).strftime('%Y-%m-%d')
+    total_start = (today - timedelta(days=total_days_period)).strftime('%Y-%m-%d')
+
+    recent_heavy_hitters = keyword_sketch.HeavyHitters(max(top_k, 1) * APPROX_CANDIDATES_PER_TOP_K, epsilon, delta)
+    past_sketch = keyword_sketch.CountMinSketch(epsilon, delta)
+    for keyword_batch in _iter_article_keyword_batches(articles, today):
+        recent_counts, past_counts = Counter(), Counter()
+        for date_str, keywords in keyword_batch:
+            if date_str >= recent_start:
+                recent_counts.update(keywords)
+            elif date_str >= total_start:
+                past_counts.update(keywords)
+        recent_heavy_hitters.update(recent_counts)
+        if past_counts:
+            past_sketch.add(list(past_counts), list(past_counts.values()))
+
+    candidates = recent_heavy_hitters.top()
+    if not candidates:
+        return []
+    keywords = [keyword for keyword, _ in candidates]
+    recent_freqs = [estimate for _, estimate in candidates]
+    past_freqs = past_sketch.estimate(keywords)
+    recent_error_bound, past_error_bound = recent_heavy_hitters.error_bound(), past_sketch.error_bound()
+
+    verified = verify_articles is not None
+    if verified:
+        # 후보 키워드만 정확히 세어 추정 빈도를 대체
+        candidate_set = set(keywords)
+        exact_recent, exact_past = Counter(), Counter()
+        for keyword_batch in _iter_article_keyword_batches(verify_articles, today):
+            for date_str, article_keywords in keyword_batch:
+                if date_str >= recent_start:
+                    exact_recent.update(keyword for keyword in article_keywords if keyword in candidate_set)
+                elif date_str >= total_start:
+                    exact_past.update(keyword for keyword in article_keywords if keyword in candidate_set)
+        recent_freqs = [exact_recent[keyword] for keyword in keywords]
+        past_freqs = [exact_past[keyword] for keyword in keywords]
+        recent_error_bound = past_error_bound = 0
+
+    trending_keywords_list = _score_trending_keywords(keywords, recent_freqs, past_freqs, min_surge_ratio, min_recent_freq, top_k)
+    for keyword_data in trending_keywords_list:
+        keyword_data.update({"recent_freq_error_bound": recent_error_bound, "past_freq_error_bound": past_error_bound, "verified": verified})
+    return trending_keywords_list
+
+def analyze_archive_keyword_trends(search_keyword: str = None, recent_days_period: int = 2, total_days_period: int = 15,
+                                   min_surge_ratio: float = 1.5, min_recent_freq: int = 3, top_k: int = 50, verify: bool = True) -> list[dict]:
+    """
+    DB에 저장된 기사 전체(또는 search_keyword로 수집된 기사)를 묶음 단위로 읽어 일정한 메모리로 트렌드를 근사 분석합니다.
+    verify가 True이면 기사를 한 번 더 읽어 상위 후보의 빈도를 정확한 값으로 확정합니다. (야간 일괄 분석용)
+    """
+    start_date = (datetime.now() - timedelta(days=total_days_period)).strftime('%Y-%m-%d')
+
+    def archive_articles():
+        for rows in database_manager.iter_articles(search_keyword, start_date):
+            for title, link, date, content in rows:
+                yield {"제목": title, "링크": link, "날짜": date, "내용": content or ""}
+
+    return analyze_keyword_trends_approx(
+        archive_articles(), recent_days_period, total_days_period, min_surge_ratio, min_recent_freq, top_k,
+        verify_articles=archive_articles() if verify else None
+    )
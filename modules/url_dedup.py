@@ -0,0 +1,115 @@
+# modules/url_dedup.py
+# 기사 URL 정규화와 중복 기사 걸러내기.
+# 추적용 파라미터나 언론사/모바일 미러 주소만 다른 같은 기사를 하나의 정규 URL로 모으고,
+# DB에 영구 저장되는 URL 해시 집합(seen_article_urls)으로 이미 수집한 기사를 파싱 직후 걸러냅니다.
+# 정규 URL은 중복 판정 키로만 사용하며, 기사 링크는 검색 결과의 원본 그대로 저장합니다.
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from modules import database_manager
+
+# 기사 내용과 무관한 광고/클릭 추적 파라미터 (언론사가 기사 ID로 쓰기도 하는 cid, ref 등 일반적인 이름은 제외)
+TRACKING_QUERY_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "igshid", "yclid", "mc_cid", "mc_eid"}
+TRACKING_QUERY_PREFIXES = ("utm_",)
+
+# 네이버 뉴스의 여러 기사 주소 형식 (PC, 모바일, 구형 read.naver) -> 언론사 ID(oid), 기사 ID(aid)
+NAVER_NEWS_HOSTS = {"n.news.naver.com", "m.news.naver.com", "news.naver.com", "mnews.naver.com"}
+_NAVER_ARTICLE_PATH = re.compile(r"^/(?:mnews/)?article/(\d+)/(\d+)/?$")
+NAVER_CANONICAL_ARTICLE_URL = "https://n.news.naver.com/mnews/article/{oid}/{aid}"
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    기사 URL을 중복 판정용 키로 정규화합니다. (저장하거나 요청할 URL로 사용하지 않음)
+    - 네이버 뉴스 기사는 주소 형식과 관계없이 https://n.news.naver.com/mnews/article/{oid}/{aid}로 통일
+    - 그 외 URL은 https로 통일하고, 호스트 소문자화, www. 제거, 프래그먼트와 추적용 파라미터 제거, 쿼리 정렬
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query_params = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host in NAVER_NEWS_HOSTS:
+        match = _NAVER_ARTICLE_PATH.match(parts.path)
+        if match:
+            return NAVER_CANONICAL_ARTICLE_URL.format(oid=match.group(1), aid=match.group(2))
+        query_dict = dict(query_params)
+        if parts.path.startswith("/main/read") and query_dict.get("oid") and query_dict.get("aid"):
+            return NAVER_CANONICAL_ARTICLE_URL.format(oid=query_dict["oid"], aid=query_dict["aid"])
+
+    if parts.scheme not in ("http", "https") or not host:
+        return url.strip()
+
+    kept_params = sorted(
+        (key, value) for key, value in query_params
+        if key.lower() not in TRACKING_QUERY_PARAMS and not key.lower().startswith(TRACKING_QUERY_PREFIXES)
+    )
+    netloc = host if parts.port in (None, 80, 443) else f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", netloc, path, urlencode(kept_params), ""))
+
+
+def url_hash(canonical_url: str) -> int:
+    """정규 URL의 64비트 해시 (SQLite INTEGER PRIMARY KEY에 맞도록 부호 있는 정수)."""
+    return int.from_bytes(hashlib.blake2b(canonical_url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+class ArticleDeduplicator:
+    """
+    한 번의 크롤링 실행 동안 키워드 하나의 기사 중복을 걸러냅니다.
+    - 이번 실행에서 이미 나온 정규 URL의 기사는 버립니다. (실행 내 중복)
+    - DB에 이미 저장된 정규 URL의 기사는 다시 저장/분석하지 않고 검색 키워드 태그만 추가한 뒤 버립니다. (이전 실행과의 중복)
+    걸러진 기사는 호출자가 DB에서 저장된 내용으로 채울 수 있습니다.
+    """
+
+    def __init__(self, search_keyword: str = None):
+        self.search_keyword = search_keyword
+        self.seen_links = set() # 이번 실행에서 통과시킨 정규 URL
+        self.kept_count = 0
+        self.in_run_duplicate_count = 0
+        self.stored_duplicate_count = 0
+
+    def filter_new(self, articles: list[dict]) -> list[dict]:
+        """정규 URL 기준으로 처음 보는 기사만 반환합니다. (기사 dict와 원본 링크는 변경하지 않음)"""
+        candidates = {}
+        for article in articles:
+            canonical_link = canonicalize_url(article["링크"])
+            if canonical_link in self.seen_links or canonical_link in candidates:
+                self.in_run_duplicate_count += 1
+                continue
+            candidates[canonical_link] = article
+
+        hashes = {canonical_link: url_hash(canonical_link) for canonical_link in candidates}
+        stored_links = database_manager.get_seen_url_links(list(hashes.values()))
+        stored_duplicates = [canonical_link for canonical_link in candidates if hashes[canonical_link] in stored_links]
+        if stored_duplicates:
+            self.stored_duplicate_count += len(stored_duplicates)
+            if self.search_keyword:
+                # 이미 저장된 기사 행의 링크에 태그 (링크를 기록하기 전에 저장된 기사는 이번 결과의 링크 사용)
+                database_manager.tag_articles_with_keyword(
+                    [stored_links[hashes[canonical_link]] or candidates[canonical_link]["링크"] for canonical_link in stored_duplicates],
+                    self.search_keyword
+                )
+
+        self.seen_links.update(candidates)
+        new_articles = [article for canonical_link, article in candidates.items() if hashes[canonical_link] not in stored_links]
+        self.kept_count += len(new_articles)
+        return new_articles
+
+    def mark_stored(self, articles: list[dict]):
+        """DB에 저장한 기사(filter_new 결과)의 정규 URL 해시와 원본 링크를 영구 URL 집합에 기록합니다."""
+        database_manager.add_seen_urls({url_hash(canonicalize_url(article["링크"])): article["링크"] for article in articles})
+
+    def stats(self) -> dict:
+        """이번 실행의 중복 제거 통계."""
+        return {
+            "kept": self.kept_count,
+            "in_run_duplicates": self.in_run_duplicate_count,
+            "stored_duplicates": self.stored_duplicate_count,
+            "dropped": self.in_run_duplicate_count + self.stored_duplicate_count,
+        }
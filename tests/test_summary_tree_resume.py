@@ -0,0 +1,84 @@
+# tests/test_summary_tree_resume.py
+# 계층적 요약을 다시 실행하면 저장된 중간 요약(intermediate_summaries)을 재사용하고,
+# 실패했던 묶음과 그 위 계층만 다시 API를 호출하는지 확인합니다.
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from modules import ai_service, database_manager
+
+FAILING_MARKER = "실패할 기사"
+
+
+class _FakeResponse:
+    def __init__(self, message: str = None, status_error: Exception = None):
+        self.message = message
+        self.status_error = status_error
+
+    def raise_for_status(self):
+        if self.status_error:
+            raise self.status_error
+
+    def json(self):
+        return {"message": self.message}
+
+
+class SummaryTreeResumeTest(unittest.TestCase):
+    def setUp(self):
+        db_fd, self.db_file = tempfile.mkstemp(suffix=".db")
+        os.close(db_fd)
+        patchers = [
+            mock.patch.object(database_manager, "DB_FILE", self.db_file),
+            mock.patch.object(ai_service, "POTENS_RESPONSE_CACHE_ENABLED", False), # 응답 캐시가 아닌 중간 요약 재사용만 확인
+            mock.patch.object(ai_service, "_summary_tokenizer", None), # 글자 수로 토큰 수를 세어 묶음을 고정
+            mock.patch.object(ai_service, "_summary_tokenizer_loaded", True),
+            mock.patch.object(ai_service.time, "sleep", lambda seconds: None),
+            mock.patch.object(ai_service.rate_limiter, "get_bucket", lambda *args, **kwargs: mock.Mock()),
+            mock.patch.object(ai_service.http_client, "post", side_effect=self._fake_post),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(os.remove, self.db_file)
+        database_manager.init_db()
+
+        self.fail_marked_batches = True
+        self.sent_prompts = []
+        # 묶음마다 텍스트 2개 -> 1차 3묶음, 2차 1묶음
+        self.texts = [f"기사 {i}: " + "내용" * 100 for i in range(6)]
+        self.texts[2] = f"{FAILING_MARKER}: " + "내용" * 100
+
+    def _fake_post(self, url, data=None, **kwargs):
+        prompt = json.loads(data.decode("utf-8"))["prompt"]
+        self.sent_prompts.append(prompt)
+        if self.fail_marked_batches and FAILING_MARKER in prompt:
+            return _FakeResponse(status_error=ai_service.requests.exceptions.HTTPError("500 Server Error"))
+        return _FakeResponse(f"요약 {len(self.sent_prompts)}")
+
+    def _summarize(self):
+        return ai_service.summarize_texts_hierarchically(self.texts, "test-key", token_budget=600, packing="greedy")
+
+    def test_failed_batch_stops_tree_and_rerun_only_redoes_missing_nodes(self):
+        self.assertIsNone(self._summarize()) # 1차 묶음 하나가 실패하면 다음 계층으로 올리지 않음
+        first_run_prompts = list(self.sent_prompts)
+        self.assertFalse(any("요약 " in prompt for prompt in first_run_prompts)) # 2차 요약은 시작하지 않음
+
+        self.fail_marked_batches = False
+        self.sent_prompts.clear()
+        final_summary = self._summarize()
+
+        self.assertIsNotNone(final_summary)
+        self.assertEqual(len(self.sent_prompts), 2) # 실패했던 1차 묶음 하나 + 그 위의 2차 묶음
+        self.assertIn(FAILING_MARKER, self.sent_prompts[0])
+        self.assertNotIn(FAILING_MARKER, self.sent_prompts[1])
+
+        self.sent_prompts.clear()
+        self.assertEqual(self._summarize(), final_summary) # 모두 완료된 트리는 API를 호출하지 않음
+        self.assertEqual(self.sent_prompts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()